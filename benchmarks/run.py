@@ -0,0 +1,213 @@
+"""
+Benchmark suite for the scraper, parsers, storage handlers and analyzers.
+
+Run from the repository root:
+
+    python -m benchmarks.run                      # everything, analyzers up to 1M jobs
+    python -m benchmarks.run --only scrape parse  # selected benchmarks
+    python -m benchmarks.run --sizes 1000 10000 --output bench.json
+
+Results are written as JSON (by default to benchmarks/results/<timestamp>.json)
+together with the Python version, platform and git commit, so runs can be
+compared over time.
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from src.scraper.analysis import SalaryAnalyzer
+from src.scraper.config import REFERENCE_JOB
+from src.scraper.metrics import metrics, peak_rss_bytes
+from src.scraper.parsers import get_parser
+from src.scraper.scraper import JobScraper
+from src.scraper.similarity import SimilarityAnalyzer, SimilarityIndex
+from src.scraper.storage import CSVStorage, ExcelStorage, JSONLStorage, ParquetStorage, SQLiteStorage, pa
+from src.scraper.table import JobTable
+
+from .server import ReplayServer
+from .synthetic import detail_page, profiles, results_page, synthetic_jobs
+
+BENCHMARKS = ("scrape", "parse", "storage", "analysis")
+RESULTS_DIR = os.path.join("benchmarks", "results")
+
+
+def _timed(function: Callable, *args, **kwargs) -> float:
+    """Return the seconds a call takes."""
+    started = time.perf_counter()
+    function(*args, **kwargs)
+    return time.perf_counter() - started
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def bench_scrape(jobs: int, workers: List[int], latency: float, error_rate: float, retry_delay: float,
+                 compress: bool = False) -> List[dict]:
+    """
+    Scrape a synthetic board from the local server end to end.
+
+    The delay between results pages is removed and the rate limit is lifted,
+    so the results show what the pipeline itself sustains at the given
+    server latency.
+    """
+    results = []
+    with ReplayServer(total_jobs=jobs, latency=latency, error_rate=error_rate, compress=compress) as server:
+        for worker_count in workers:
+            scraper = JobScraper(
+                base_url=server.url, max_jobs=jobs, max_concurrent_requests=worker_count, requests_per_second=1e6
+            )
+            scraper.logger.setLevel(logging.WARNING)
+            scraper.page_delay = lambda: 0.0
+            scraper.client.retry_delay = retry_delay
+            metrics.reset()
+            started = time.perf_counter()
+            with scraper:
+                scraped = sum(1 for _ in scraper.iter_jobs())
+            seconds = time.perf_counter() - started
+            latencies = metrics.histogram("http_request_seconds")
+            results.append({
+                "workers": worker_count,
+                "latency": latency,
+                "error_rate": error_rate,
+                "compress": compress,
+                "jobs": scraped,
+                "seconds": seconds,
+                "jobs_per_second": scraped / seconds,
+                "pages_per_second": (metrics.counter("pages_total", kind="results")
+                                     + metrics.counter("pages_total", kind="detail")) / seconds,
+                "bytes_downloaded": metrics.counter("http_response_bytes_total"),
+                "wire_bytes": metrics.counter("http_wire_bytes_total"),
+                "retries": metrics.counter("http_retries_total"),
+                "request_p50": latencies.quantile(0.5) if latencies else None,
+                "request_p90": latencies.quantile(0.9) if latencies else None,
+            })
+    return results
+
+
+def bench_parse(pages: int) -> Dict[str, dict]:
+    """Measure the parse cost of a results page and a detail page for each parser backend."""
+    listing = results_page(0, 20)
+    detail = detail_page(0)
+    results = {}
+    for name in ("lxml", "bs4"):
+        parser = get_parser(name)
+        listing_seconds = _timed(lambda: [parser.parse_listing_page(listing) for _ in range(pages)])
+        detail_seconds = _timed(lambda: [parser.parse_detail_page(detail) for _ in range(pages)])
+        results[name] = {
+            "results_page_ms": listing_seconds / pages * 1000,
+            "detail_page_ms": detail_seconds / pages * 1000,
+            "results_page_bytes": len(listing),
+            "detail_page_bytes": len(detail),
+        }
+    return results
+
+
+def bench_storage(jobs: int) -> Dict[str, dict]:
+    """Measure the write speed of every storage backend."""
+    listings = list(synthetic_jobs(jobs))
+    backends = {
+        "jsonl": (JSONLStorage, "uzt_adds.jsonl"),
+        "csv": (CSVStorage, "uzt_adds.csv"),
+        "excel": (ExcelStorage, "uzt_adds.xlsx"),
+        "sqlite": (SQLiteStorage, "uzt_adds.sqlite"),
+    }
+    if pa is not None:
+        backends["parquet"] = (ParquetStorage, "parquet")
+    results = {}
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for name, (storage_class, filename) in backends.items():
+            path = os.path.join(tmpdir, filename)
+            storage = storage_class(path)
+            seconds = _timed(storage.save, listings)
+            results[name] = {"jobs": jobs, "seconds": seconds, "jobs_per_second": jobs / seconds}
+    return results
+
+
+def bench_analysis(sizes: List[int], similarity_max: int) -> List[dict]:
+    """Measure SalaryAnalyzer and SimilarityAnalyzer/SimilarityIndex on growing numbers of jobs."""
+    results = []
+    for size in sizes:
+        result = {"jobs": size}
+        started = time.perf_counter()
+        table = JobTable.from_jobs(synthetic_jobs(size))
+        result["table_build_seconds"] = time.perf_counter() - started
+
+        analyzer = SalaryAnalyzer(table)
+        result["salary_statistics_seconds"] = _timed(analyzer.get_statistics)
+        result["salary_group_by_seconds"] = _timed(analyzer.group_by, ["location", "week"])
+
+        index = SimilarityIndex(directory=None)
+        result["similarity_fit_seconds"] = _timed(index.fit, table)
+        result["similarity_top_k_seconds"] = _timed(index.top_k, REFERENCE_JOB, 10)
+        result["similarity_rank_100_profiles_seconds"] = _timed(index.rank_profiles, profiles(100), 10)
+        if size <= similarity_max:
+            result["similarity_compute_seconds"] = _timed(SimilarityAnalyzer().compute_similarity, REFERENCE_JOB, table)
+        result["peak_rss_bytes"] = peak_rss_bytes()
+        results.append(result)
+        print(f"analysis: {size} jobs done", file=sys.stderr)
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> dict:
+    """Run the selected benchmarks and write the results file."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--only", nargs="+", choices=BENCHMARKS, default=list(BENCHMARKS), help="benchmarks to run")
+    parser.add_argument("--scrape-jobs", type=int, default=500, help="jobs on the synthetic board")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 16], help="detail requests in flight")
+    parser.add_argument("--latency", type=float, default=0.02, help="seconds added to every server response")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="probability of a 503 response")
+    parser.add_argument("--compress", action="store_true", help="gzip the server's pages")
+    parser.add_argument("--retry-delay", type=float, default=0.05, help="first retry delay of the scraper's client")
+    parser.add_argument("--parse-pages", type=int, default=200, help="pages parsed per parser and page type")
+    parser.add_argument("--storage-jobs", type=int, default=10_000, help="jobs written per storage backend")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000, 1_000_000],
+                        help="job counts for the analyzer scaling benchmark")
+    parser.add_argument("--similarity-max", type=int, default=100_000,
+                        help="largest job count for SimilarityAnalyzer.compute_similarity, which refits per call")
+    parser.add_argument("--output", help="results file (default: benchmarks/results/<timestamp>.json)")
+    args = parser.parse_args(argv)
+
+    report = {
+        "started": datetime.now().isoformat(timespec="seconds"),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "arguments": vars(args),
+        "results": {},
+    }
+    if "scrape" in args.only:
+        report["results"]["scrape"] = bench_scrape(
+            args.scrape_jobs, args.workers, args.latency, args.error_rate, args.retry_delay, args.compress
+        )
+    if "parse" in args.only:
+        report["results"]["parse"] = bench_parse(args.parse_pages)
+    if "storage" in args.only:
+        report["results"]["storage"] = bench_storage(args.storage_jobs)
+    if "analysis" in args.only:
+        report["results"]["analysis"] = bench_analysis(args.sizes, args.similarity_max)
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"✅ Išsaugota į: {output}")
+    return report
+
+
+if __name__ == "__main__":
+    main()
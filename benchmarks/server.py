@@ -0,0 +1,129 @@
+"""
+Local HTTP stand-in for uzt.lt serving synthetic results and job detail pages.
+"""
+import gzip
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+from src.scraper.config import JOB_URL_PREFIX
+
+from .synthetic import detail_page, results_page
+
+RESULTS_PATH = re.compile(re.escape(JOB_URL_PREFIX) + r"(?:/p(\d+))?$")
+DETAIL_PATH = re.compile(r"/laisvos-darbo-vietos/436/job/(\d+)$")
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: "_Server"
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; without this, delayed ACKs add ~40 ms per response
+    disable_nagle_algorithm = True
+
+    def do_GET(self) -> None:
+        config = self.server.config
+        if config.latency:
+            time.sleep(config.latency)
+        if config.error_rate and config.random() < config.error_rate:
+            self._send(503, b"Service Unavailable", {"Retry-After": "0"})
+            return
+        match = RESULTS_PATH.match(self.path)
+        if match:
+            start = int(match.group(1) or 0)
+            if start >= config.total_jobs:
+                self._send(404, b"Not Found")
+            else:
+                self._send(200, results_page(start, config.total_jobs, config.seed))
+            return
+        match = DETAIL_PATH.match(self.path)
+        if match and int(match.group(1)) < config.total_jobs:
+            self._send(200, detail_page(int(match.group(1)), config.seed))
+            return
+        self._send(404, b"Not Found")
+
+    def _send(self, status: int, body: bytes, headers: Optional[dict] = None) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        if self.server.config.compress and "gzip" in self.headers.get("Accept-Encoding", ""):
+            body = gzip.compress(body, compresslevel=6)
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    config: "ReplayServer"
+
+
+class ReplayServer:
+    """
+    Serves a synthetic job board on localhost from a background thread.
+
+    Results pages are at JOB_URL_PREFIX[/p<offset>] and answer 404 past the
+    last job, like the site; detail pages are at /laisvos-darbo-vietos/436/job/<id>.
+    Every request waits `latency` seconds and fails with 503 with probability
+    `error_rate`. With `compress`, pages are gzipped for clients accepting it.
+    """
+
+    def __init__(self, total_jobs: int = 1000, latency: float = 0.0, error_rate: float = 0.0, seed: int = 0,
+                 compress: bool = False) -> None:
+        """
+        Initialize the ReplayServer.
+
+        Args:
+            total_jobs (int): Number of jobs on the board.
+            latency (float): Seconds added to every response.
+            error_rate (float): Probability of answering 503.
+            seed (int): Seed of the generated pages and errors.
+            compress (bool): Gzip pages for clients sending Accept-Encoding: gzip.
+        """
+        self.total_jobs = total_jobs
+        self.latency = latency
+        self.error_rate = error_rate
+        self.seed = seed
+        self.compress = compress
+        self._random = random.Random(seed)
+        self._random_lock = threading.Lock()
+        self._server: Optional[_Server] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def random(self) -> float:
+        with self._random_lock:
+            return self._random.random()
+
+    @property
+    def url(self) -> str:
+        """Base URL of the running server, to pass as JobScraper(base_url=...)."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "ReplayServer":
+        """Start serving on a free port."""
+        self._server = _Server(("127.0.0.1", 0), _Handler)
+        self._server.config = self
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop the server."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "ReplayServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
@@ -0,0 +1,188 @@
+"""
+Synthetic UZT results pages, job detail pages and job listings for benchmarks.
+
+Pages follow the markup the parsers read (see test/test_parsers.py) and are
+padded with navigation and script boilerplate to the size of real pages.
+Everything is derived from a job's id and a seed, so runs are repeatable.
+"""
+import html
+import random
+from datetime import date, timedelta
+from typing import Iterator
+
+import numpy as np
+
+from src.scraper.config import BASE_URL, JOB_URL_PREFIX
+from src.scraper.models import JobListing
+
+# Path of a job's detail page on the stand-in server
+JOB_PATH = "/laisvos-darbo-vietos/436/job/{id}"
+# Jobs per results page, as on the site
+PAGE_SIZE = 20
+
+TITLES = [
+    "Teisininkas (-ė)", "Vairuotojas (-a)", "Buhalteris (-ė)", "Programuotojas (-a)", "Pardavėjas (-a)",
+    "Sandėlininkas (-ė)", "Slaugytojas (-a)", "Mokytojas (-a)", "Virėjas (-a)", "Projektų vadovas (-ė)",
+    "Elektrikas (-ė)", "Suvirintojas (-a)", "Klientų aptarnavimo specialistas (-ė)", "Valytojas (-a)",
+    "Duomenų analitikas (-ė)", "Statybininkas (-ė)", "Vadybininkas (-ė)", "Administratorius (-ė)",
+]
+COMPANIES = [f'UAB "{name}"' for name in (
+    "Žalgiris", "Baltijos logistika", "Nemuno statyba", "Vilniaus duona", "Kauno technika", "Šiaurės IT",
+    "Medienos gaminiai", "Jūros transportas", "Aukštaitijos pienas", "Sveikatos centras", "Ateities sprendimai",
+)] + [f"Įmonė Nr. {i}" for i in range(200)]
+LOCATIONS = [
+    "Vilniaus m.", "Kauno m.", "Klaipėdos m.", "Šiaulių m.", "Panevėžio m.", "Alytaus m.", "Marijampolės sav.",
+    "Utenos r.", "Vilniaus r.", "Kauno r.", "Telšių r.", "Tauragės r.", "Mažeikių r.", "Jonavos r.",
+]
+WORDS = (
+    "darbas klientai dokumentai sutartys projektai komanda atsakomybė patirtis įgūdžiai kompiuteris "
+    "sandėlis prekės transportas kokybė saugumas planavimas ataskaitos pardavimai paslaugos gamyba "
+    "įrengimai priežiūra mokymai tobulėjimas bendravimas užsienio kalba vairuotojo pažymėjimas "
+    "lankstus grafikas pilnas etatas pamainos premijos draudimas atlyginimas galimybės"
+).split()
+EXPERIENCE = ["Nereikia", "Iki 1 metų", "1-2 metai", "3-5 metai", "Daugiau nei 5 metai"]
+# Navigation and script boilerplate of real pages, parsed but never extracted
+BOILERPLATE = (
+    '<nav class="menu">' + "".join(f'<a href="/meniu/{i}">Meniu punktas {i}</a>' for i in range(120)) + "</nav>"
+    + "<script>" + "var config = {'key': 'value', 'items': [1, 2, 3]};" * 200 + "</script>"
+)
+
+
+def _salary(rng: random.Random) -> str:
+    low = rng.randrange(900, 4000, 50)
+    kind = rng.random()
+    if kind < 0.5:
+        return f"{low:,} - {low + rng.randrange(100, 1500, 50):,} €".replace(",", " ")
+    if kind < 0.7:
+        return f"Nuo {low} €"
+    if kind < 0.8:
+        return f"Iki {low} €"
+    if kind < 0.9:
+        return f"{low} €"
+    return "Sutartinis"
+
+
+def job_fields(job_id: int, seed: int = 0) -> dict:
+    """
+    Return the fields of a synthetic job.
+
+    Args:
+        job_id (int): The job's id.
+        seed (int): Seed varying the generated data.
+
+    Returns:
+        dict: title, company, location, posted_date, salary, experience and description.
+    """
+    rng = random.Random(job_id * 1_000_003 + seed)
+    return {
+        "title": rng.choice(TITLES),
+        "company": rng.choice(COMPANIES),
+        "location": rng.choice(LOCATIONS),
+        "posted_date": (date(2024, 1, 1) + timedelta(days=rng.randrange(180))).isoformat(),
+        "salary": _salary(rng),
+        "experience": rng.choice(EXPERIENCE),
+        "description": " ".join(rng.choice(WORDS) for _ in range(rng.randrange(20, 60))),
+    }
+
+
+def results_page(start: int, total_jobs: int, seed: int = 0) -> bytes:
+    """
+    Render the results page listing jobs start to start + PAGE_SIZE.
+
+    Args:
+        start (int): Offset of the first job on the page.
+        total_jobs (int): Number of jobs on the site.
+        seed (int): Seed varying the generated data.
+
+    Returns:
+        bytes: The UTF-8 page body.
+    """
+    items = []
+    for job_id in range(start, min(start + PAGE_SIZE, total_jobs)):
+        job = job_fields(job_id, seed)
+        items.append(
+            f'<a href="{JOB_PATH.format(id=job_id)}" class="item">'
+            f'<div class="title"><strong>{html.escape(job["title"])}</strong></div>'
+            f'<div class="company">{html.escape(job["company"])}</div>'
+            f'<div class="location">{job["location"]}</div>'
+            f'<div class="created-date">Įkelta: {job["posted_date"]}</div>'
+            f'<div class="salary">{job["salary"]}</div></a>'
+        )
+    return (
+        '<!DOCTYPE html><html lang="lt"><head><meta charset="utf-8"><title>Laisvos darbo vietos</title></head>'
+        f'<body>{BOILERPLATE}<main><div class="list">{"".join(items)}</div>'
+        f'<div class="pagination"><a href="{JOB_URL_PREFIX}/p{start + PAGE_SIZE}">Kitas</a></div>'
+        "</main></body></html>"
+    ).encode("utf-8")
+
+
+def detail_page(job_id: int, seed: int = 0) -> bytes:
+    """
+    Render a job's detail page.
+
+    Args:
+        job_id (int): The job's id.
+        seed (int): Seed varying the generated data.
+
+    Returns:
+        bytes: The UTF-8 page body.
+    """
+    job = job_fields(job_id, seed)
+    return (
+        '<!DOCTYPE html><html lang="lt"><head><meta charset="utf-8"></head>'
+        f'<body>{BOILERPLATE}<main><div class="job meta__list"><div>'
+        f'<h4><strong>Darbo aprašymas:</strong></h4><p>{job["description"]}</p>'
+        "<ul><li>Sutarčių peržiūra</li><li>Konsultacijos</li></ul>"
+        f'<h4><strong>Turima patirtis:</strong></h4><p>{job["experience"]}</p>'
+        '</div><div><h4><strong>Darbo laikas</strong></h4><p>Pilnas etatas</p>'
+        "</div></div></main></body></html>"
+    ).encode("utf-8")
+
+
+def synthetic_jobs(count: int, seed: int = 0, pool_size: int = 10_000) -> Iterator[JobListing]:
+    """
+    Yield synthetic job listings with details, as the scraper would produce them.
+
+    Each listing combines the fields of pool_size generated jobs at random, so
+    millions of listings are produced in seconds; the first pool_size
+    listings match the server's pages.
+
+    Args:
+        count (int): Number of jobs.
+        seed (int): Seed varying the generated data.
+        pool_size (int): Number of distinct jobs fields are drawn from.
+
+    Yields:
+        JobListing: One listing per job id.
+    """
+    pool = [job_fields(job_id, seed) for job_id in range(min(count, pool_size))]
+    rng = np.random.default_rng(seed)
+    choices = {
+        name: rng.integers(0, len(pool), count).tolist()
+        for name in ("title", "company", "location", "posted_date", "salary", "experience", "description")
+    }
+    for job_id in range(count):
+        if job_id < len(pool):
+            job = pool[job_id]
+        else:
+            job = {name: pool[indices[job_id]][name] for name, indices in choices.items()}
+        yield JobListing(
+            job["title"], job["company"], job["location"], job["posted_date"], job["salary"],
+            BASE_URL + JOB_PATH.format(id=job_id),
+            {"Darbo aprašymas": job["description"], "Turima patirtis": job["experience"]}
+        )
+
+
+def profiles(count: int, seed: int = 0) -> dict:
+    """Return reference profiles laid out like REFERENCE_JOB, keyed by name."""
+    result = {}
+    for i in range(count):
+        job = job_fields(-1 - i, seed)
+        result[f"profile_{i}"] = {
+            "Darbo pobūdis": job["title"],
+            "Darbo vieta (miestas)": job["location"],
+            "Pageidaujamas atlyginimas": job["salary"],
+            "Turima patirtis": job["experience"],
+            "Darbo aprašymas": job["description"],
+        }
+    return result
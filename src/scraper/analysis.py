@@ -2,10 +2,172 @@
 Analysis module for processing and analyzing job data.
 """
 import numpy as np
-from typing import List, Dict, Optional
+import pandas as pd
+from typing import Iterable, List, Dict, Optional, Tuple, Union
 from .models import JobListing
+from .table import JobTable
+from .config import PARQUET_DIR
+from .metrics import metrics
+from .stats import SalaryAccumulator
 import re
 from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+# A salary is one amount, a range ("1000-2000", en/em dash, "nuo 1000 iki 2000"),
+# a lower bound ("nuo 1000") or an upper bound ("iki 2000"). It is matched after
+# lowercasing, removing spaces inside numbers and turning decimal commas into points.
+SALARY_PATTERN = (
+    r'(?:(?:nuo\s*)?(?P<low>\d+(?:\.\d+)?)\s*(?:(?:[-–—]|iki)\s*(?P<high>\d+(?:\.\d+)?))?)'
+    r'|(?:iki\s*(?P<upto>\d+(?:\.\d+)?))'
+)
+_SALARY_RE = re.compile(SALARY_PATTERN)
+_DIGIT_SPACE_RE = re.compile(r'(?<=\d)[\s\u00a0\u202f]+(?=\d)')
+_DECIMAL_COMMA_RE = re.compile(r'(?<=\d),(?=\d)')
+
+def parse_salary_range(salary_str: str) -> Tuple[Optional[float], Optional[float]]:
+    """
+    Parse salary string into its lower and upper bound.
+    
+    Args:
+        salary_str (str): Salary string to parse
+        
+    Returns:
+        Tuple[Optional[float], Optional[float]]: Lower and upper bound, None where not given
+    """
+    if not salary_str:
+        return None, None
+    text = _DECIMAL_COMMA_RE.sub('.', _DIGIT_SPACE_RE.sub('', salary_str.lower()))
+    match = _SALARY_RE.search(text)
+    if match is None:
+        return None, None
+    low, high, upto = match.group('low', 'high', 'upto')
+    high = high or upto
+    return (float(low) if low else None), (float(high) if high else None)
+
+def parse_salary(salary_str: str) -> Optional[float]:
+    """
+    Parse salary string into a numeric value.
+    
+    Ranges are reduced to their midpoint and open ranges to their only bound.
+    
+    Args:
+        salary_str (str): Salary string to parse
+        
+    Returns:
+        Optional[float]: Parsed salary value or None if invalid
+    """
+    low, high = parse_salary_range(salary_str)
+    if low is not None and high is not None:
+        return (low + high) / 2
+    return low if low is not None else high
+
+def parse_salaries(salaries: Iterable[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Parse a column of salary strings in one pass.
+    
+    The column is factorized first, so each distinct salary string is parsed
+    once and the results are scattered back with array indexing.
+    
+    Args:
+        salaries (Iterable[str]): Salary strings to parse
+        
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: Aligned min, max and mid salary
+        arrays, NaN where no salary was found
+    """
+    codes, uniques = pd.factorize(np.asarray(list(salaries), dtype=object))
+    bounds = np.array([parse_salary_range(value) for value in uniques], dtype=float).reshape(-1, 2)
+    # Code -1 marks missing values; map it to an extra all-NaN row
+    bounds = np.vstack([bounds, [np.nan, np.nan]])
+    low = bounds[codes, 0]
+    high = bounds[codes, 1]
+    mid = np.where(np.isnan(low), high, np.where(np.isnan(high), low, (low + high) / 2))
+    return low, high, mid
+
+def parse_posted_date(posted_date: str) -> Optional[str]:
+    """
+    Parse a posting date into ISO format.
+
+    Args:
+        posted_date (str): The date as shown on the results page.
+
+    Returns:
+        Optional[str]: The date as YYYY-MM-DD, or None if it could not be parsed.
+    """
+    for fmt in ('%Y-%m-%d', '%Y.%m.%d', '%d.%m.%Y'):
+        try:
+            return datetime.strptime(posted_date.strip(), fmt).date().isoformat()
+        except (ValueError, AttributeError):
+            continue
+    return None
+
+def posting_week(posted_date: str) -> Optional[str]:
+    """
+    Get the Monday of the week a job was posted in.
+    
+    Args:
+        posted_date (str): The date as shown on the results page
+        
+    Returns:
+        Optional[str]: The week's Monday as YYYY-MM-DD, or None if the date could not be parsed
+    """
+    posted_on = parse_posted_date(posted_date)
+    if posted_on is None:
+        return None
+    day = datetime.strptime(posted_on, '%Y-%m-%d')
+    return (day - timedelta(days=day.weekday())).date().isoformat()
+
+# Nominative names of cities whose genitive does not follow _GENITIVE_ENDINGS
+CITY_NAMES = {
+    'Vilniaus': 'Vilnius', 'Kauno': 'Kaunas', 'Klaipėdos': 'Klaipėda', 'Šiaulių': 'Šiauliai',
+    'Panevėžio': 'Panevėžys', 'Alytaus': 'Alytus', 'Marijampolės': 'Marijampolė', 'Mažeikių': 'Mažeikiai',
+    'Jonavos': 'Jonava', 'Utenos': 'Utena', 'Kėdainių': 'Kėdainiai', 'Telšių': 'Telšiai', 'Tauragės': 'Tauragė',
+    'Ukmergės': 'Ukmergė', 'Visagino': 'Visaginas', 'Palangos': 'Palanga', 'Druskininkų': 'Druskininkai',
+    'Elektrėnų': 'Elektrėnai', 'Birštono': 'Birštonas', 'Neringos': 'Neringa'
+}
+# Genitive endings of Lithuanian place names and their nominative, longest first
+_GENITIVE_ENDINGS = (('ių', 'iai'), ('ų', 'ai'), ('aus', 'us'), ('io', 'is'), ('ės', 'ė'), ('os', 'a'), ('o', 'as'))
+# "Vilniaus m.", "Vilniaus m. sav.", "Vilniaus miesto sav.", "Marijampolės sav."
+_CITY_RE = re.compile(r'^(?P<name>\w+)\s+(?:(?:m\.|miesto)(?:\s+sav\.?)?|sav\.?)$')
+# "Vilniaus r.", "Vilniaus r. sav.", "Vilniaus rajono sav."
+_DISTRICT_RE = re.compile(r'^(?P<name>\w+)\s+(?:r\.|rajono)(?:\s+sav\.?)?$')
+
+def normalize_location(location: Optional[str]) -> Optional[str]:
+    """
+    Normalize a location to one spelling per place.
+    
+    City municipalities ("Vilniaus m.", "Vilniaus m. sav.") become the city's
+    name ("Vilnius"), and district municipalities become "<name> r."
+    ("Vilniaus r."), which stays apart from the city. Other values are kept
+    with their whitespace collapsed.
+    
+    Args:
+        location (Optional[str]): Location as shown on the results page
+        
+    Returns:
+        Optional[str]: The normalized location, None if it was None
+    """
+    if location is None:
+        return None
+    location = ' '.join(location.split())
+    match = _DISTRICT_RE.match(location)
+    if match:
+        return f"{match.group('name')} r."
+    match = _CITY_RE.match(location)
+    if match is None:
+        return location
+    name = match.group('name')
+    if name in CITY_NAMES:
+        return CITY_NAMES[name]
+    for ending, nominative in _GENITIVE_ENDINGS:
+        if name.endswith(ending):
+            return name[:-len(ending)] + nominative
+    return name
+
+# Key columns and aggregates supported by SalaryAnalyzer.group_by
+GROUP_KEYS = ('location', 'company', 'title', 'week')
+AGGREGATIONS = ('count', 'mean', 'median', 'p90')
+_QUANTILES = {'median': 0.5, 'p90': 0.9}
 
 @dataclass
 class SalaryStats:
@@ -19,18 +181,72 @@ class SalaryStats:
     valid_salaries_count: int
     total_jobs: int
 
+    @classmethod
+    def from_accumulator(cls, accumulator: SalaryAccumulator) -> 'SalaryStats':
+        """
+        Create salary statistics from a streaming accumulator.
+        
+        Mean, standard deviation, minimum and maximum are exact; median and
+        quartiles are within the accumulator's relative accuracy.
+        
+        Args:
+            accumulator (SalaryAccumulator): Accumulator updated with all salaries
+            
+        Returns:
+            SalaryStats: Object containing salary statistics
+        """
+        if accumulator.count == 0:
+            return cls(0.0, 0.0, 0.0, 0.0, 0.0, np.array([0.0, 0.0, 0.0]), 0, accumulator.total)
+        quartiles = np.array([accumulator.quantile(q) for q in (0.25, 0.5, 0.75)])
+        return cls(
+            mean=accumulator.mean,
+            median=quartiles[1],
+            std=accumulator.std,
+            min=accumulator.min,
+            max=accumulator.max,
+            quartiles=quartiles,
+            valid_salaries_count=accumulator.count,
+            total_jobs=accumulator.total
+        )
+
 class SalaryAnalyzer:
     """Class for analyzing salary data from job listings."""
     
-    def __init__(self, jobs: List[JobListing]):
+    def __init__(self, jobs: Union[List[JobListing], JobTable], features: Optional[Dict[str, np.ndarray]] = None):
         """
         Initialize the SalaryAnalyzer with a list of job listings.
         
+        A JobTable is read column by column: each distinct salary string and
+        key value is handled once, without creating a JobListing per row.
+        With features precomputed by a FeatureStore, salaries, locations and
+        posting dates are read from them instead of being parsed.
+        
         Args:
-            jobs (List[JobListing]): List of job listings to analyze
+            jobs (Union[List[JobListing], JobTable]): Job listings to analyze
+            features (Optional[Dict[str, np.ndarray]]): Feature columns aligned with the jobs,
+                as returned by FeatureStore.load
         """
         self.jobs = jobs
+        self.features = features
         self._salary_array: Optional[np.ndarray] = None
+        self._salary_columns: Optional[Dict[str, np.ndarray]] = None
+        self._key_codes: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+
+    @classmethod
+    def from_parquet(cls, directory: str = PARQUET_DIR) -> 'SalaryAnalyzer':
+        """
+        Create a SalaryAnalyzer from a Parquet dataset written by ParquetStorage.
+        
+        Only the salary and the group-by key columns are read, into a JobTable.
+        
+        Args:
+            directory (str): The dataset directory
+            
+        Returns:
+            SalaryAnalyzer: Analyzer over every stored job listing
+        """
+        from .storage import ParquetStorage
+        return cls(ParquetStorage.load_table(directory, ['title', 'company', 'location', 'posted_date', 'salary']))
     
     def _parse_salary(self, salary_str: str) -> Optional[float]:
         """
@@ -42,22 +258,27 @@ class SalaryAnalyzer:
         Returns:
             Optional[float]: Parsed salary value or None if invalid
         """
-        if not salary_str or salary_str == '–':
-            return None
-            
-        # Remove currency symbols, whitespace, and "per mėn."
-        salary_str = salary_str.strip().replace('€', '').replace(' ', '').replace('/permėn.', '')
+        return parse_salary(salary_str)
+
+    @metrics.timed("analysis_seconds", stage="parse_salaries")
+    def get_salary_columns(self) -> Dict[str, np.ndarray]:
+        """
+        Parse every job's salary once into columns aligned with the jobs.
         
-        # Try to extract numeric value
-        try:
-            # Handle ranges (e.g., "1000-2000")
-            if '-' in salary_str:
-                min_salary, max_salary = map(float, salary_str.split('-'))
-                return (min_salary + max_salary) / 2
-            # Handle single values
-            return float(salary_str)
-        except (ValueError, TypeError):
-            return None
+        Returns:
+            Dict[str, np.ndarray]: 'min', 'max' and 'mid' salary arrays, NaN where missing
+        """
+        if self._salary_columns is None:
+            if self.features is not None:
+                columns = [self.features[name] for name in ('salary_min', 'salary_max', 'salary_mid')]
+            elif isinstance(self.jobs, JobTable):
+                codes, categories = self.jobs.factorize('salary')
+                # Parse the distinct salaries; missing ones (code -1) pick the trailing NaN
+                columns = [np.append(column, np.nan)[codes] for column in parse_salaries(categories)]
+            else:
+                columns = parse_salaries([job.salary for job in self.jobs])
+            self._salary_columns = dict(zip(('min', 'max', 'mid'), columns))
+        return self._salary_columns
     
     def _prepare_salary_data(self) -> np.ndarray:
         """
@@ -67,11 +288,11 @@ class SalaryAnalyzer:
             np.ndarray: Array of valid salary values
         """
         if self._salary_array is None:
-            # Parse all salaries and filter out None values
-            salaries = [self._parse_salary(job.salary) for job in self.jobs]
-            self._salary_array = np.array([s for s in salaries if s is not None])
+            mid = self.get_salary_columns()['mid']
+            self._salary_array = mid[~np.isnan(mid)]
         return self._salary_array
     
+    @metrics.timed("analysis_seconds", stage="statistics")
     def get_statistics(self) -> SalaryStats:
         """
         Calculate salary statistics.
@@ -104,6 +325,25 @@ class SalaryAnalyzer:
             total_jobs=len(self.jobs)
         )
     
+    @metrics.timed("analysis_seconds", stage="accumulate")
+    def accumulate(self, accumulator: Optional[SalaryAccumulator] = None) -> SalaryAccumulator:
+        """
+        Add this analyzer's salaries to a streaming accumulator.
+        
+        Accumulators from separate chunks or shards can be merged and
+        serialized, and turned into SalaryStats with SalaryStats.from_accumulator.
+        
+        Args:
+            accumulator (Optional[SalaryAccumulator]): Accumulator to update; a new one by default
+            
+        Returns:
+            SalaryAccumulator: The updated accumulator
+        """
+        accumulator = accumulator or SalaryAccumulator()
+        accumulator.update(self.get_salary_columns()['mid'])
+        return accumulator
+    
+    @metrics.timed("analysis_seconds", stage="distribution")
     def get_salary_distribution(self, bins: int = 10) -> Dict[str, np.ndarray]:
         """
         Calculate salary distribution.
@@ -128,6 +368,118 @@ class SalaryAnalyzer:
             'bin_edges': bin_edges
         }
     
+    def _factorize_key(self, key: str) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Encode a key column as integer codes, once per analyzer.
+        
+        Args:
+            key (str): One of GROUP_KEYS
+            
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Codes aligned with the jobs (-1 where the key
+            is unknown) and the distinct key values in order of first appearance
+        """
+        if key not in self._key_codes:
+            if key not in GROUP_KEYS:
+                raise ValueError(f"Unknown group key: {key} (expected one of {', '.join(GROUP_KEYS)})")
+            if self.features is not None and key in ('location', 'week'):
+                codes, uniques = pd.factorize(self.features['location' if key == 'location' else 'posted_on'])
+            else:
+                attribute = 'posted_date' if key == 'week' else key
+                if isinstance(self.jobs, JobTable):
+                    codes, uniques = self.jobs.factorize(attribute)
+                else:
+                    codes, uniques = pd.factorize(
+                        np.array([getattr(job, attribute) for job in self.jobs], dtype=object)
+                    )
+            if key == 'week':
+                # Map each distinct date once, then factorize the weeks they fall in
+                if self.features is not None:
+                    weeks = [(day - timedelta(days=day.weekday())).isoformat() for day in uniques]
+                else:
+                    weeks = [posting_week(value) for value in uniques]
+                week_codes, uniques = pd.factorize(np.array(weeks, dtype=object))
+                codes = np.append(week_codes, -1)[codes]
+            elif key == 'location' and self.features is None:
+                # Normalize each distinct location once, so spellings of one place are one group
+                location_codes, uniques = pd.factorize(
+                    np.array([normalize_location(value) for value in uniques], dtype=object)
+                )
+                codes = np.append(location_codes, -1)[codes]
+            self._key_codes[key] = (codes, np.asarray(uniques, dtype=object))
+        return self._key_codes[key]
+    
+    @metrics.timed("analysis_seconds", stage="group_by")
+    def group_by(self, keys: Iterable[str] = ('location',), aggregations: Iterable[str] = AGGREGATIONS) -> pd.DataFrame:
+        """
+        Aggregate salaries by one or more key columns.
+        
+        Keys are factorized into integer codes once and combined into a single
+        group id. Counts and means are computed with np.bincount, and median
+        and p90 with one sort by (group, salary) followed by indexing into each
+        group's segment, interpolating like np.percentile. Jobs without a
+        salary or with an unknown key are left out.
+        
+        Args:
+            keys (Iterable[str]): Key columns from GROUP_KEYS ('location', 'company', 'title', 'week')
+            aggregations (Iterable[str]): Aggregates from AGGREGATIONS ('count', 'mean', 'median', 'p90')
+            
+        Returns:
+            pd.DataFrame: One row per group, indexed by the key values, one column per aggregate
+        """
+        keys = list(keys)
+        aggregations = list(aggregations)
+        for aggregation in aggregations:
+            if aggregation not in AGGREGATIONS:
+                raise ValueError(f"Unknown aggregation: {aggregation} (expected one of {', '.join(AGGREGATIONS)})")
+        mid = self.get_salary_columns()['mid']
+        valid = ~np.isnan(mid)
+        combined = np.zeros(len(mid), dtype=np.int64)
+        key_values = []
+        for key in keys:
+            codes, uniques = self._factorize_key(key)
+            valid &= codes >= 0
+            combined = combined * max(len(uniques), 1) + codes
+            key_values.append(uniques)
+
+        group_ids, groups = pd.factorize(combined[valid])
+        salaries = mid[valid]
+        counts = np.bincount(group_ids, minlength=len(groups))
+        # Recover each group's key codes from the combined id, last key first
+        index_codes = []
+        remainder = groups.astype(np.int64)
+        for uniques in reversed(key_values):
+            size = max(len(uniques), 1)
+            index_codes.append(remainder % size)
+            remainder = remainder // size
+        index_codes.reverse()
+        index = pd.MultiIndex.from_arrays(
+            [uniques[codes] for uniques, codes in zip(key_values, index_codes)],
+            names=keys
+        )
+
+        result = {}
+        if 'count' in aggregations:
+            result['count'] = counts
+        if 'mean' in aggregations:
+            result['mean'] = np.bincount(group_ids, weights=salaries, minlength=len(groups)) / np.maximum(counts, 1)
+        quantiles = [aggregation for aggregation in aggregations if aggregation in _QUANTILES]
+        if quantiles and len(groups):
+            order = np.lexsort((salaries, group_ids))
+            ordered = salaries[order]
+            starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+            for aggregation in quantiles:
+                position = _QUANTILES[aggregation] * (counts - 1)
+                lower = np.floor(position).astype(np.int64)
+                upper = np.minimum(lower + 1, counts - 1)
+                low_values = ordered[starts + lower]
+                result[aggregation] = low_values + (position - lower) * (ordered[starts + upper] - low_values)
+        elif quantiles:
+            for aggregation in quantiles:
+                result[aggregation] = np.array([], dtype=float)
+        frame = pd.DataFrame(result, index=index)
+        return frame[[aggregation for aggregation in aggregations]]
+    
     def get_salary_by_location(self) -> Dict[str, float]:
         """
         Calculate average salary by location.
@@ -135,17 +487,5 @@ class SalaryAnalyzer:
         Returns:
             Dict[str, float]: Dictionary mapping locations to average salaries
         """
-        location_salaries = {}
-        
-        for job in self.jobs:
-            salary = self._parse_salary(job.salary)
-            if salary is not None:
-                if job.location not in location_salaries:
-                    location_salaries[job.location] = []
-                location_salaries[job.location].append(salary)
-        
-        return {
-            location: np.mean(salaries)
-            for location, salaries in location_salaries.items()
-            if len(salaries) > 0
-        } 
\ No newline at end of file
+        means = self.group_by(['location'], ['mean'])['mean']
+        return {location: float(mean) for location, mean in zip(means.index.get_level_values(0), means.to_numpy())}
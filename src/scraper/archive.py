@@ -0,0 +1,299 @@
+"""
+Append-only compressed archive of fetched pages, with replay for offline re-parsing.
+"""
+import mmap
+import re
+import threading
+import zlib
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple
+from urllib.parse import urljoin
+
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers, requote_uri
+
+from .config import ARCHIVE_DIR, ARCHIVE_SEGMENT_BYTES, JOB_URL_PREFIX
+from .parallel import ParsePool
+
+INDEX_FILENAME = "index.tsv"
+
+
+@dataclass
+class ArchivedPage:
+    """A page body stored in the archive, under the URL it was requested by."""
+    url: str
+    body: bytes
+    content_type: str
+    fetched_at: str
+    # URL the page was served from after redirects
+    final_url: str = ""
+
+    def __post_init__(self) -> None:
+        self.final_url = self.final_url or self.url
+
+
+@dataclass
+class _IndexEntry:
+    segment: int
+    offset: int
+    length: int
+
+
+class PageArchive:
+    """
+    Append-only archive of page bodies.
+
+    Each page is written as its own gzip member holding a WARC-style record, so
+    records can be decompressed individually. Segments are rolled over at
+    segment_bytes, and an index file maps every URL to the segment, offset and
+    length of its latest record. Reads go through a memory map of the segment.
+    Only one process should write to an archive at a time.
+    """
+
+    def __init__(self, directory: str = ARCHIVE_DIR, segment_bytes: int = ARCHIVE_SEGMENT_BYTES) -> None:
+        """
+        Initialize the PageArchive.
+
+        Args:
+            directory (str): Directory holding the segments and the index.
+            segment_bytes (int): Size after which a new segment is started.
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.segment_bytes = segment_bytes
+        self._lock = threading.Lock()
+        self._index: Dict[str, _IndexEntry] = {}
+        # Redirect targets not fetched yet, mapped to the URL originally requested
+        self._redirects: Dict[str, str] = {}
+        self._maps: Dict[int, mmap.mmap] = {}
+        self._files = {}
+        index_path = self.directory / INDEX_FILENAME
+        if index_path.exists():
+            with open(index_path, encoding="utf-8") as f:
+                for line in f:
+                    url, segment, offset, length = line.rstrip("\n").split("\t")
+                    self._index[url] = _IndexEntry(int(segment), int(offset), int(length))
+        segments = sorted(self.directory.glob("segment-*.warc.gz"))
+        self._segment = int(segments[-1].name[8:13]) if segments else 0
+        self._writer = open(self._segment_path(self._segment), "ab")
+        self._index_writer = open(index_path, "a", encoding="utf-8")
+
+    def _segment_path(self, segment: int) -> Path:
+        return self.directory / f"segment-{segment:05d}.warc.gz"
+
+    def append(self, url: str, body: bytes, content_type: str = "text/html; charset=utf-8",
+               final_url: Optional[str] = None) -> None:
+        """
+        Write a page body to the archive.
+
+        Args:
+            url (str): The URL the page was requested by, which it is replayed for.
+            body (bytes): The decoded page body.
+            content_type (str): The Content-Type the page was served with.
+            final_url (Optional[str]): The URL the page was served from after redirects, if different.
+        """
+        fetched_at = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        redirect = f"Final-URI: {final_url}\r\n" if final_url and final_url != url else ""
+        header = (
+            "WARC/1.0\r\n"
+            "WARC-Type: response\r\n"
+            f"WARC-Target-URI: {url}\r\n"
+            f"{redirect}"
+            f"WARC-Date: {fetched_at}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(body)}\r\n\r\n"
+        ).encode("utf-8")
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        record = compressor.compress(header + body + b"\r\n\r\n") + compressor.flush()
+        with self._lock:
+            offset = self._writer.tell()
+            if offset and offset + len(record) > self.segment_bytes:
+                self._writer.close()
+                self._segment += 1
+                self._writer = open(self._segment_path(self._segment), "ab")
+                offset = 0
+            self._writer.write(record)
+            self._writer.flush()
+            self._index[url] = _IndexEntry(self._segment, offset, len(record))
+            self._index_writer.write(f"{url}\t{self._segment}\t{offset}\t{len(record)}\n")
+            self._index_writer.flush()
+
+    def record_response(self, response: requests.Response, *args, **kwargs) -> None:
+        """
+        Archive a successful live response. Usable as a requests response hook.
+
+        The hook also sees every redirect response before the page it leads
+        to, so a redirected page is archived under the URL first requested,
+        which is the URL it is replayed for, with the URL it came from kept as
+        its final_url.
+        """
+        if response.is_redirect:
+            target = requote_uri(urljoin(response.url, response.headers["Location"]))
+            with self._lock:
+                self._redirects[target] = self._redirects.pop(response.url, response.url)
+            return
+        with self._lock:
+            requested = self._redirects.pop(response.url, response.url)
+        if response.status_code != 200 or getattr(response, "from_cache", False) is True:
+            return
+        self.append(requested, response.content, response.headers.get("Content-Type", "text/html"), response.url)
+
+    def get(self, url: str) -> Optional[ArchivedPage]:
+        """
+        Read the latest archived copy of a page.
+
+        Args:
+            url (str): The page URL.
+
+        Returns:
+            Optional[ArchivedPage]: The archived page, or None if it was never archived.
+        """
+        entry = self._index.get(url)
+        if entry is None:
+            return None
+        return self._read(url, entry)
+
+    def _read(self, url: str, entry: _IndexEntry) -> ArchivedPage:
+        """Decompress a single record from a memory-mapped segment."""
+        with self._lock:
+            data = self._maps.get(entry.segment)
+            if data is None or len(data) < entry.offset + entry.length:
+                if data is not None:
+                    data.close()
+                    self._files.pop(entry.segment).close()
+                f = open(self._segment_path(entry.segment), "rb")
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                self._files[entry.segment] = f
+                self._maps[entry.segment] = data
+            chunk = data[entry.offset:entry.offset + entry.length]
+        record = zlib.decompress(chunk, 16 + zlib.MAX_WBITS)
+        head, _, rest = record.partition(b"\r\n\r\n")
+        fields = dict(line.split(": ", 1) for line in head.decode("utf-8").split("\r\n")[1:])
+        return ArchivedPage(
+            url=url,
+            body=rest[:int(fields["Content-Length"])],
+            content_type=fields.get("Content-Type", "text/html"),
+            fetched_at=fields.get("WARC-Date", ""),
+            final_url=fields.get("Final-URI", url)
+        )
+
+    def iter_pages(self, pattern: Optional[str] = None) -> Iterator[ArchivedPage]:
+        """
+        Yield the latest copy of every archived page in on-disk order.
+
+        Args:
+            pattern (Optional[str]): Only yield pages whose URL matches this regex.
+
+        Yields:
+            ArchivedPage: The archived pages.
+        """
+        regex = re.compile(pattern) if pattern else None
+        entries = sorted(
+            ((url, entry) for url, entry in self._index.items() if regex is None or regex.search(url)),
+            key=lambda item: (item[1].segment, item[1].offset)
+        )
+        for url, entry in entries:
+            yield self._read(url, entry)
+
+    def reparse_details(
+        self,
+        pool: Optional[ParsePool] = None,
+        pattern: Optional[str] = None
+    ) -> Iterator[Tuple[str, Dict[str, str]]]:
+        """
+        Re-parse archived job detail pages without touching the network.
+
+        Args:
+            pool (Optional[ParsePool]): The parse stage to use. Defaults to a pool
+                configured by PARSE_WORKERS.
+            pattern (Optional[str]): Only re-parse pages whose URL matches this regex.
+                Defaults to every page that is not a results page.
+
+        Yields:
+            Tuple[str, Dict[str, str]]: Each page URL with its parsed details.
+        """
+        # transport imports this module for ReplayAdapter
+        from .transport import content_type_charset
+
+        regex = re.compile(pattern) if pattern else None
+        results_prefix = re.escape(JOB_URL_PREFIX)
+        urls = deque()
+
+        def bodies() -> Iterator[Tuple[bytes, str]]:
+            for page in self.iter_pages():
+                if regex is not None and not regex.search(page.url):
+                    continue
+                if regex is None and re.search(f"{results_prefix}(/p\\d+)?$", page.url):
+                    continue
+                urls.append(page.url)
+                # Decoded in the charset the page was served with, as on the live path
+                yield page.body, content_type_charset(page.content_type)
+
+        own_pool = pool is None
+        pool = pool or ParsePool()
+        try:
+            for details in pool.parse_detail_bodies(bodies()):
+                yield urls.popleft(), details
+        finally:
+            if own_pool:
+                pool.close()
+
+    def __contains__(self, url: str) -> bool:
+        return url in self._index
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def close(self) -> None:
+        """Close the segment writer and all memory maps."""
+        with self._lock:
+            self._writer.close()
+            self._index_writer.close()
+            for data in self._maps.values():
+                data.close()
+            for f in self._files.values():
+                f.close()
+            self._maps.clear()
+            self._files.clear()
+
+
+class ReplayAdapter(BaseAdapter):
+    """Transport adapter answering GET requests from a PageArchive instead of the network."""
+
+    def __init__(self, archive: PageArchive) -> None:
+        """
+        Initialize the ReplayAdapter.
+
+        Args:
+            archive (PageArchive): The archive to serve pages from.
+        """
+        super().__init__()
+        self.archive = archive
+
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        """Serve an archived page, or a 404 response when the URL was never archived."""
+        page = self.archive.get(request.url)
+        response = requests.Response()
+        response.url = request.url if page is None else page.final_url
+        response.request = request
+        response.connection = self
+        response.from_archive = True
+        if page is None:
+            response.status_code = 404
+            response.reason = "Not Archived"
+            response._content = b""
+            return response
+        response.status_code = 200
+        response.reason = "OK"
+        response.headers = CaseInsensitiveDict({"Content-Type": page.content_type})
+        response.encoding = get_encoding_from_headers(response.headers)
+        response._content = page.body
+        return response
+
+    def close(self) -> None:
+        pass
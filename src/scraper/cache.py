@@ -0,0 +1,252 @@
+"""
+Persistent HTTP response cache with conditional revalidation.
+"""
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from .config import CACHE_DIR, CACHE_MAX_BYTES, CACHE_TTL, CACHE_DEFAULT_TTL
+
+# Response headers kept with a cached body. The body is stored decoded, so
+# transfer headers such as Content-Encoding and Content-Length are dropped.
+STORED_HEADERS = ("Content-Type", "ETag", "Last-Modified")
+
+
+@dataclass
+class CacheEntry:
+    """A cached response body with its validators."""
+    url: str
+    path: Path
+    headers: Dict[str, str]
+    size: int
+    stored_at: float
+
+    @property
+    def etag(self) -> Optional[str]:
+        return self.headers.get("ETag")
+
+    @property
+    def last_modified(self) -> Optional[str]:
+        return self.headers.get("Last-Modified")
+
+
+class HTTPCache:
+    """On-disk response cache with per-URL-pattern TTLs and size-bounded LRU eviction."""
+
+    def __init__(
+        self,
+        directory: str = CACHE_DIR,
+        max_bytes: int = CACHE_MAX_BYTES,
+        ttl_rules: List[Tuple[str, float]] = CACHE_TTL,
+        default_ttl: float = CACHE_DEFAULT_TTL
+    ) -> None:
+        """
+        Initialize the HTTPCache.
+
+        Args:
+            directory (str): Directory holding the response bodies and the index.
+            max_bytes (int): Maximum total size of the cached bodies.
+            ttl_rules (List[Tuple[str, float]]): (URL regex, seconds) pairs; the first
+                pattern found in a URL decides how long its response is served
+                without revalidation.
+            default_ttl (float): TTL for URLs matching none of the rules.
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.ttl_rules = [(re.compile(pattern), ttl) for pattern, ttl in ttl_rules]
+        self.default_ttl = default_ttl
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.directory / "index.sqlite", timeout=30, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "url TEXT PRIMARY KEY, filename TEXT NOT NULL, headers TEXT NOT NULL, "
+            "size INTEGER NOT NULL, stored_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS entries_accessed_at ON entries (accessed_at)")
+        self._db.commit()
+
+    def ttl_for(self, url: str) -> float:
+        """Return the TTL in seconds that applies to a URL."""
+        for pattern, ttl in self.ttl_rules:
+            if pattern.search(url):
+                return ttl
+        return self.default_ttl
+
+    def is_fresh(self, entry: CacheEntry) -> bool:
+        """Check whether an entry can be served without revalidation."""
+        return time.time() - entry.stored_at < self.ttl_for(entry.url)
+
+    def has_fresh(self, url: str) -> bool:
+        """Check whether a URL can be answered from the cache without a request."""
+        with self._lock:
+            row = self._db.execute("SELECT stored_at FROM entries WHERE url = ?", (url,)).fetchone()
+        return row is not None and time.time() - row[0] < self.ttl_for(url)
+
+    def get(self, url: str) -> Optional[CacheEntry]:
+        """
+        Look up a URL and mark its entry as recently used.
+
+        Args:
+            url (str): The request URL.
+
+        Returns:
+            Optional[CacheEntry]: The cached entry, or None on a miss.
+        """
+        with self._lock:
+            row = self._db.execute(
+                "SELECT filename, headers, size, stored_at FROM entries WHERE url = ?", (url,)
+            ).fetchone()
+            if row is None:
+                return None
+            path = self.directory / row[0]
+            if not path.exists():
+                self._db.execute("DELETE FROM entries WHERE url = ?", (url,))
+                self._db.commit()
+                return None
+            self._db.execute("UPDATE entries SET accessed_at = ? WHERE url = ?", (time.time(), url))
+            self._db.commit()
+        return CacheEntry(url=url, path=path, headers=json.loads(row[1]), size=row[2], stored_at=row[3])
+
+    def read(self, entry: CacheEntry) -> bytes:
+        """Read the body of a cached entry."""
+        return entry.path.read_bytes()
+
+    def put(self, url: str, headers: Dict[str, str], body: bytes) -> None:
+        """
+        Store a response body and evict least recently used entries over the size limit.
+
+        Args:
+            url (str): The request URL.
+            headers (Dict[str, str]): The response headers.
+            body (bytes): The decoded response body.
+        """
+        filename = hashlib.sha1(url.encode("utf-8")).hexdigest() + ".bin"
+        path = self.directory / filename
+        tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp_path.write_bytes(body)
+        os.replace(tmp_path, path)
+        kept = {name: headers[name] for name in STORED_HEADERS if name in headers}
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries (url, filename, headers, size, stored_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (url, filename, json.dumps(kept), len(body), now, now)
+            )
+            self._db.commit()
+            self._evict()
+
+    def refresh(self, entry: CacheEntry, headers: Dict[str, str]) -> None:
+        """
+        Restart an entry's TTL after a 304 Not Modified response.
+
+        Args:
+            entry (CacheEntry): The revalidated entry.
+            headers (Dict[str, str]): The 304 response headers, which may carry new validators.
+        """
+        for name in STORED_HEADERS:
+            if name in headers:
+                entry.headers[name] = headers[name]
+        entry.stored_at = time.time()
+        with self._lock:
+            self._db.execute(
+                "UPDATE entries SET headers = ?, stored_at = ?, accessed_at = ? WHERE url = ?",
+                (json.dumps(entry.headers), entry.stored_at, entry.stored_at, entry.url)
+            )
+            self._db.commit()
+
+    def total_size(self) -> int:
+        """Return the total size of the cached bodies in bytes."""
+        with self._lock:
+            return self._db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+    def _evict(self) -> None:
+        """Delete least recently used entries until the cache fits in max_bytes. Caller holds the lock."""
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self._db.execute("SELECT url, filename, size FROM entries ORDER BY accessed_at")
+        evicted = []
+        for url, filename, size in rows:
+            if total <= self.max_bytes:
+                break
+            evicted.append((url, filename))
+            total -= size
+        for url, filename in evicted:
+            self._db.execute("DELETE FROM entries WHERE url = ?", (url,))
+            try:
+                os.remove(self.directory / filename)
+            except FileNotFoundError:
+                pass
+        self._db.commit()
+
+    def close(self) -> None:
+        """Close the cache index."""
+        with self._lock:
+            self._db.close()
+
+
+class CachingAdapter(HTTPAdapter):
+    """Transport adapter serving GET requests from an HTTPCache with conditional revalidation."""
+
+    def __init__(self, cache: HTTPCache, **kwargs) -> None:
+        """
+        Initialize the CachingAdapter.
+
+        Args:
+            cache (HTTPCache): The cache to read from and write to.
+            **kwargs: Passed on to HTTPAdapter (pool sizes, retries).
+        """
+        super().__init__(**kwargs)
+        self.cache = cache
+
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        """Send a request, answering from the cache when the stored copy is fresh or unchanged."""
+        if request.method != "GET":
+            return super().send(request, **kwargs)
+
+        entry = self.cache.get(request.url)
+        if entry is not None and self.cache.is_fresh(entry):
+            return self._cached_response(request, entry)
+        if entry is not None:
+            if entry.etag:
+                request.headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                request.headers["If-Modified-Since"] = entry.last_modified
+
+        response = super().send(request, **kwargs)
+        if response.status_code == 304 and entry is not None:
+            response.close()
+            self.cache.refresh(entry, response.headers)
+            return self._cached_response(request, entry)
+        if response.status_code == 200 and not kwargs.get("stream"):
+            self.cache.put(request.url, response.headers, response.content)
+        return response
+
+    def _cached_response(self, request: requests.PreparedRequest, entry: CacheEntry) -> requests.Response:
+        """Build a 200 response from a cache entry."""
+        response = requests.Response()
+        response.status_code = 200
+        response.reason = "OK"
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        response.headers = CaseInsensitiveDict(entry.headers)
+        response.encoding = get_encoding_from_headers(response.headers)
+        response._content = self.cache.read(entry)
+        response.from_cache = True
+        return response
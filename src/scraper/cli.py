@@ -0,0 +1,330 @@
+"""
+Command line interface with scrape, analyze, rank and export commands.
+
+Only argparse and the configuration are imported up front. Each command
+imports the modules it needs when it runs, so `--help`, and a `rank` on an
+already built similarity index, start without loading the scraping and
+analysis stack. Only `scrape` touches the network; the other commands read
+stored datasets.
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+from contextlib import ExitStack
+from typing import List, Optional
+
+from .config import (
+    FEATURES_ENABLED,
+    MAX_JOBS,
+    METRICS_PROMETHEUS_FILE,
+    METRICS_REPORT_FILE,
+    QUEUE_ENABLED,
+    REFERENCE_JOB,
+    REFERENCE_PROFILES_FILE,
+    SIMILARITY_INDEX_DIR,
+    SIMILARITY_TOP_K
+)
+
+OUTPUT_DIR = "output"
+# Dataset written by scrape and read by analyze and rank by default
+DATASET_FILENAME = "uzt_adds.jsonl"
+COMMANDS = ("all", "scrape", "analyze", "rank", "export")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser with one subparser per command."""
+    parser = argparse.ArgumentParser(
+        prog="main.py",
+        description="UZT job scraper. Without a command, runs scrape, analyze and rank in sequence."
+    )
+    commands = parser.add_subparsers(dest="command", metavar="command")
+
+    output_parser = argparse.ArgumentParser(add_help=False)
+    output_parser.add_argument("--output-dir", default=OUTPUT_DIR,
+                               help=f"directory for output files (default: {OUTPUT_DIR})")
+    scrape_parser = argparse.ArgumentParser(add_help=False)
+    scrape_parser.add_argument("--max-jobs", type=int, default=MAX_JOBS, help=f"jobs to scrape (default: {MAX_JOBS})")
+    scrape_parser.add_argument("--queue", action="store_true", default=QUEUE_ENABLED,
+                               help="crawl through the durable work queue with worker processes")
+    input_parser = argparse.ArgumentParser(add_help=False)
+    input_parser.add_argument("--input", help="stored dataset: .jsonl, .csv or .sqlite file or Parquet directory "
+                                              f"(default: <output-dir>/{DATASET_FILENAME})")
+    rank_parser = argparse.ArgumentParser(add_help=False)
+    rank_parser.add_argument("--profiles", default=REFERENCE_PROFILES_FILE,
+                             help="JSON file of reference profiles by name (default: REFERENCE_JOB)")
+    rank_parser.add_argument("--top-k", type=int, default=SIMILARITY_TOP_K,
+                             help=f"jobs listed per profile (default: {SIMILARITY_TOP_K})")
+    rank_parser.add_argument("--index", default=SIMILARITY_INDEX_DIR,
+                             help=f"similarity index directory (default: {SIMILARITY_INDEX_DIR})")
+    rank_parser.add_argument("--refit", action="store_true",
+                             help="relearn the index's vocabulary from every indexed job before ranking")
+    rank_parser.add_argument("--all-indexed", action="store_true",
+                             help="rank every indexed job, not only those of the input dataset")
+
+    commands.add_parser("all", parents=[output_parser, scrape_parser, rank_parser],
+                        help="scrape, analyze and rank (default)")
+    commands.add_parser("scrape", parents=[output_parser, scrape_parser],
+                        help="scrape job listings and save them as Excel, CSV and JSON Lines")
+    commands.add_parser("analyze", parents=[output_parser, input_parser], help="salary analysis of a stored dataset")
+    commands.add_parser("rank", parents=[output_parser, input_parser, rank_parser],
+                        help="add a stored dataset to the similarity index (with --input) and rank the profiles")
+    export_parser = commands.add_parser("export", parents=[output_parser],
+                                        help="convert a stored dataset to another format")
+    export_parser.add_argument("input", help="stored dataset: .jsonl, .csv or .sqlite file or Parquet directory")
+    export_parser.add_argument("output", help=".xlsx, .csv, .jsonl or .sqlite file, or a directory for Parquet")
+    return parser
+
+
+def _load_unique_jobs(path: str, logger: logging.Logger):
+    """
+    Read a stored dataset and drop reposted listings, so they are not counted twice.
+
+    Reposts are found at ingest and read from the dataset's features; only
+    with FEATURES_ENABLED off are they detected here, over the table's columns.
+
+    Returns:
+        Tuple[JobTable, Optional[Dict[str, np.ndarray]]]: The unique jobs and their features (see _load_features).
+    """
+    import numpy as np
+    from .storage import load_table
+    jobs = load_table(path)
+    features = _load_features(path, jobs)
+    if features is not None:
+        duplicate = features['duplicate']
+    else:
+        from .dedup import duplicate_mask
+        duplicate = duplicate_mask(jobs)
+    if duplicate.any():
+        keep = np.flatnonzero(~duplicate)
+        jobs = jobs.take(keep)
+        if features is not None:
+            features = {name: column[keep] for name, column in features.items()}
+    logger.info(f"Near-duplicate listings removed: {int(duplicate.sum())}")
+    return jobs, features
+
+
+def _load_features(path: str, jobs):
+    """
+    Read the features of a dataset's jobs, or None when FEATURES_ENABLED is off.
+
+    Features, including the duplicate flags, are written at scrape time. They
+    are computed here only for a dataset that lacks them, was changed since or
+    was derived by an older parser version, and then once for all its jobs.
+    """
+    if not FEATURES_ENABLED:
+        return None
+    from .features import FeatureStore, features_path
+    store = FeatureStore(features_path(path))
+    if store.stale(jobs):
+        store.save(jobs)
+    return store.load(jobs.column('url'))
+
+
+def scrape(args: argparse.Namespace, logger: logging.Logger) -> str:
+    """
+    Scrape jobs and save them to Excel, CSV and JSON Lines in the output directory.
+
+    Each listing is enriched as soon as its results page is loaded and
+    written right away, along with its derived features. With the work
+    queue, worker processes crawl first and an interrupted crawl resumes on
+    the next run; the jobs are then read back from the queue.
+
+    Returns:
+        str: Path of the JSON Lines dataset.
+    """
+    from .metrics import metrics
+    from .storage import CSVStorage, ExcelStorage, JSONLStorage
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    jsonl_path = os.path.join(args.output_dir, DATASET_FILENAME)
+    count = 0
+    storages = [
+        ExcelStorage(os.path.join(args.output_dir, 'uzt_adds.xlsx')),
+        CSVStorage(os.path.join(args.output_dir, 'uzt_adds.csv')),
+        JSONLStorage(jsonl_path)
+    ]
+    if FEATURES_ENABLED:
+        from .features import FeatureStore, features_path
+        storages.append(FeatureStore(features_path(jsonl_path)))
+    with ExitStack() as stack:
+        if args.queue:
+            from .workqueue import crawl
+            jobs = crawl(max_jobs=args.max_jobs, output_dir=args.output_dir).iter_jobs()
+        else:
+            from .scraper import JobScraper
+            jobs = stack.enter_context(JobScraper(max_jobs=args.max_jobs)).iter_jobs()
+        for storage in storages:
+            stack.enter_context(storage)
+        for job in jobs:
+            for storage in storages:
+                storage.append(job)
+            count += 1
+    metrics.set("jobs_scraped", count)
+    return jsonl_path
+
+
+def analyze(args: argparse.Namespace, logger: logging.Logger) -> None:
+    """Run the salary analysis of a stored dataset and save it to salary_analysis.json."""
+    from .analysis import SalaryAnalyzer
+    from .metrics import metrics
+
+    with metrics.timer("load_seconds"):
+        unique_jobs, features = _load_unique_jobs(args.input, logger)
+    metrics.set("jobs_unique", len(unique_jobs))
+
+    # Perform salary analysis on the precomputed salaries, locations and posting dates
+    analyzer = SalaryAnalyzer(unique_jobs, features)
+    stats = analyzer.get_statistics()
+
+    # Log salary statistics and salary by location as one record each
+    logger.info(
+        "\nSalary Statistics:\n"
+        f"Total jobs analyzed: {stats.total_jobs}\n"
+        f"Jobs with valid salary: {stats.valid_salaries_count}\n"
+        f"Mean salary: €{stats.mean:.2f}\n"
+        f"Median salary: €{stats.median:.2f}\n"
+        f"Standard deviation: €{stats.std:.2f}\n"
+        f"Salary range: €{stats.min:.2f} - €{stats.max:.2f}\n"
+        f"Quartiles: €{stats.quartiles[0]:.2f}, €{stats.quartiles[1]:.2f}, €{stats.quartiles[2]:.2f}"
+    )
+    location_salaries = analyzer.get_salary_by_location()
+    logger.info("\nAverage Salary by Location:\n" + "\n".join(
+        f"{location}: €{salary:.2f}" for location, salary in location_salaries.items()
+    ))
+
+    # Save analysis results
+    os.makedirs(args.output_dir, exist_ok=True)
+    analysis_path = os.path.join(args.output_dir, 'salary_analysis.json')
+    analysis_results = {
+        'statistics': {
+            'mean': float(stats.mean),
+            'median': float(stats.median),
+            'std': float(stats.std),
+            'min': float(stats.min),
+            'max': float(stats.max),
+            'quartiles': stats.quartiles.tolist(),
+            'valid_salaries_count': stats.valid_salaries_count,
+            'total_jobs': stats.total_jobs
+        },
+        'location_salaries': {
+            location: float(salary)
+            for location, salary in location_salaries.items()
+        },
+        # Count, mean, median and p90 per company and per posting week
+        'breakdowns': {
+            key: [
+                {key: group, **{name: float(value) for name, value in row.items()}}
+                for group, row in zip(frame.index.get_level_values(0), frame.to_dict('records'))
+            ]
+            for key, frame in ((key, analyzer.group_by([key])) for key in ('company', 'week'))
+        },
+        # Mergeable state for combining this run with other runs or shards
+        'accumulator': analyzer.accumulate().to_dict()
+    }
+
+    with open(analysis_path, 'w', encoding='utf-8') as f:
+        json.dump(analysis_results, f, ensure_ascii=False, indent=2)
+    logger.info(f"✅ Analysis results saved to: {analysis_path}")
+
+
+def rank(args: argparse.Namespace, logger: logging.Logger) -> None:
+    """
+    Rank the jobs of the persisted similarity index against the reference profiles.
+
+    With --input, the dataset's jobs not indexed yet are added first, and only
+    the dataset's jobs are ranked unless --all-indexed is given. Without it,
+    every indexed job is ranked. With --refit, the vocabulary and IDF weights
+    are relearned from every indexed job before ranking.
+    """
+    from .similarity import SimilarityIndex, save_rankings
+
+    similarity_index = SimilarityIndex(args.index)
+    urls = None
+    if args.input:
+        unique_jobs, features = _load_unique_jobs(args.input, logger)
+        similarity_index.add(unique_jobs, features)
+        if not args.all_indexed:
+            urls = unique_jobs.column('url')
+    if args.refit and similarity_index.documents:
+        similarity_index.refit()
+    if args.input or args.refit:
+        similarity_index.save()
+    if not len(similarity_index):
+        logger.warning(f"Panašumo indeksas tuščias: {args.index}")
+    if args.profiles:
+        with open(args.profiles, encoding='utf-8') as f:
+            profiles = json.load(f)
+    else:
+        profiles = {'REFERENCE_JOB': REFERENCE_JOB}
+    rankings = similarity_index.rank_profiles(profiles, args.top_k, urls=urls)
+
+    for profile, similarity_results in rankings.items():
+        logger.info(f"\nJob Offers Listed by Similarity ({profile}):\n" + "\n".join(
+            f"Job: {job.title} - Similarity: {score:.4f}" for job, score in similarity_results
+        ))
+
+    # Save the rankings of all profiles to one CSV
+    os.makedirs(args.output_dir, exist_ok=True)
+    similarity_csv_path = os.path.join(args.output_dir, 'similarity_rankings.csv')
+    save_rankings(similarity_csv_path, rankings)
+    logger.info(f"✅ Similarity rankings saved to: {similarity_csv_path}")
+
+
+def export(args: argparse.Namespace, logger: logging.Logger) -> None:
+    """Convert a stored dataset to the format given by the output path."""
+    from .storage import load_table, storage_for
+    storage_for(args.output).save(load_table(args.input))
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Run a command.
+
+    Args:
+        argv (Optional[List[str]]): Command line arguments. Defaults to sys.argv[1:].
+
+    Returns:
+        int: The exit status.
+    """
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if not argv or (argv[0] not in COMMANDS and argv[0] not in ("-h", "--help")):
+        argv = ["all"] + argv
+    args = build_parser().parse_args(argv)
+
+    from .logger import setup_logger
+    from .metrics import metrics
+    logger = setup_logger()
+    if args.command == "analyze" and args.input is None:
+        args.input = os.path.join(args.output_dir, DATASET_FILENAME)
+    try:
+        if args.command == "all":
+            args.input = scrape(args, logger)
+            analyze(args, logger)
+            rank(args, logger)
+        elif args.command == "scrape":
+            scrape(args, logger)
+        elif args.command == "analyze":
+            analyze(args, logger)
+        elif args.command == "rank":
+            rank(args, logger)
+        else:
+            export(args, logger)
+    except (ImportError, OSError, ValueError) as e:
+        # A missing optional dependency is reported like a missing file
+        logger.error(f"Klaida: {e}")
+        return 1
+
+    # Save the run report: stage timings, request latencies, bytes downloaded, peak RSS and errors.
+    # A format conversion has nothing to report and must not overwrite the report of the last run.
+    if args.command == "export":
+        return 0
+    if METRICS_REPORT_FILE:
+        report_path = os.path.join(args.output_dir, os.path.basename(METRICS_REPORT_FILE))
+        metrics.write_json(report_path)
+        logger.info(f"✅ Run report saved to: {report_path}")
+    if METRICS_PROMETHEUS_FILE:
+        metrics.write_prometheus(METRICS_PROMETHEUS_FILE)
+        logger.info(f"✅ Prometheus metrics saved to: {METRICS_PROMETHEUS_FILE}")
+    return 0
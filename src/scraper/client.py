@@ -0,0 +1,180 @@
+"""
+HTTP client with retries, backoff and adaptive throttling.
+"""
+import logging
+import random
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+
+import requests
+
+from .config import (
+    MAX_RETRIES,
+    MAX_RANDOM_DELAY,
+    MIN_RANDOM_DELAY,
+    PROXIES,
+    RANDOM_DELAY,
+    REQUEST_TIMEOUT,
+    RETRY_DELAY,
+    RETRY_MAX_DELAY,
+    RETRY_STATUSES,
+    USE_PROXY
+)
+from .logger import event
+from .metrics import metrics
+from .throttle import AdaptiveRateLimiter, TokenBucket
+from .transport import wire_bytes
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header.
+
+    Args:
+        value (Optional[str]): Seconds to wait, or an HTTP date
+
+    Returns:
+        Optional[float]: Seconds to wait, or None if the header is missing or invalid
+    """
+    if not isinstance(value, str):
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class HttpClient:
+    """
+    Sends GET requests through a session, retrying transient failures.
+
+    Timeouts, connection errors and RETRY_STATUSES responses are retried up to
+    max_retries times. The delay before retry n is retry_delay * 2**n, capped
+    at RETRY_MAX_DELAY, plus a random jitter of MIN_RANDOM_DELAY to
+    MAX_RANDOM_DELAY seconds when RANDOM_DELAY is set; a Retry-After header
+    replaces the computed delay. Every network response is reported to the
+    rate limiter, which adapts its rate when it is an AdaptiveRateLimiter.
+    """
+
+    def __init__(
+        self,
+        session: requests.Session,
+        rate_limiter: TokenBucket,
+        max_retries: int = MAX_RETRIES,
+        retry_delay: float = RETRY_DELAY,
+        timeout: float = REQUEST_TIMEOUT,
+        logger: Optional[logging.Logger] = None
+    ) -> None:
+        """
+        Initialize the HttpClient.
+
+        Args:
+            session (requests.Session): The session requests are sent with.
+            rate_limiter (TokenBucket): Limiter acquired before throttled requests.
+            max_retries (int): The number of retries after the first attempt.
+            retry_delay (float): Delay in seconds before the first retry.
+            timeout (float): Request timeout in seconds.
+            logger (Optional[logging.Logger]): Logger for retries.
+        """
+        self.session = session
+        self.rate_limiter = rate_limiter
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.timeout = timeout
+        self.logger = logger or logging.getLogger(__name__)
+        if USE_PROXY:
+            self.session.proxies.update({scheme: proxy for scheme, proxy in PROXIES.items() if proxy})
+
+    def backoff(self, attempt: int) -> float:
+        """
+        Return the delay before a retry.
+
+        Args:
+            attempt (int): The number of the failed attempt, starting at 0.
+
+        Returns:
+            float: Seconds to wait.
+        """
+        delay = min(RETRY_MAX_DELAY, self.retry_delay * 2 ** attempt)
+        if RANDOM_DELAY:
+            delay += random.uniform(MIN_RANDOM_DELAY, MAX_RANDOM_DELAY)
+        return delay
+
+    def _record_success(self, response: requests.Response, latency: float) -> None:
+        if isinstance(self.rate_limiter, AdaptiveRateLimiter) and getattr(response, "from_cache", False) is not True:
+            self.rate_limiter.record_success(latency)
+
+    def _record_failure(self) -> None:
+        if isinstance(self.rate_limiter, AdaptiveRateLimiter):
+            self.rate_limiter.record_failure()
+
+    @staticmethod
+    def _record_metrics(response: requests.Response, latency: float) -> None:
+        if getattr(response, "from_cache", False) is True:
+            metrics.inc("http_cache_hits_total")
+            return
+        metrics.inc("http_requests_total")
+        metrics.observe("http_request_seconds", latency)
+        metrics.inc("http_response_bytes_total", len(response.content or b""))
+        downloaded = wire_bytes(response)
+        if downloaded is not None:
+            metrics.inc("http_wire_bytes_total", downloaded)
+
+    def get(self, url: str, headers: Optional[Dict[str, str]] = None, throttle: bool = True) -> requests.Response:
+        """
+        Send a GET request, retrying transient failures.
+
+        Args:
+            url (str): The URL to fetch.
+            headers (Optional[Dict[str, str]]): Request headers.
+            throttle (bool): Acquire the rate limiter before every attempt.
+
+        Returns:
+            requests.Response: The response; after the last retry this can still
+            be a RETRY_STATUSES response, for the caller's raise_for_status.
+
+        Raises:
+            requests.RequestException: If the last attempt timed out or could not connect.
+        """
+        attempt = 0
+        while True:
+            if throttle:
+                self.rate_limiter.acquire()
+            started = time.monotonic()
+            try:
+                response = self.session.get(url, headers=headers, timeout=self.timeout)
+            except (requests.Timeout, requests.ConnectionError) as e:
+                metrics.inc("http_errors_total", reason=type(e).__name__)
+                self._record_failure()
+                if attempt >= self.max_retries:
+                    raise
+                delay = self.backoff(attempt)
+                self.logger.warning(f"Klaida ({e}), bandoma dar kartą po {delay:.1f} s: {url}",
+                                    extra=event("http", url=url, attempt=attempt + 1, delay=delay))
+            else:
+                latency = time.monotonic() - started
+                self._record_metrics(response, latency)
+                if response.status_code not in RETRY_STATUSES:
+                    self._record_success(response, latency)
+                    return response
+                metrics.inc("http_errors_total", reason=str(response.status_code))
+                self._record_failure()
+                if attempt >= self.max_retries:
+                    return response
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                delay = retry_after if retry_after is not None else self.backoff(attempt)
+                response.close()
+                self.logger.warning(f"Atsakymas {response.status_code}, bandoma dar kartą po {delay:.1f} s: {url}",
+                                    extra=event("http", url=url, status=response.status_code, attempt=attempt + 1,
+                                                delay=delay))
+            metrics.inc("http_retries_total")
+            time.sleep(delay)
+            attempt += 1
@@ -19,6 +19,12 @@ HEADERS = {
     "Accept-Language": "lt-LT,lt;q=0.9,en-US;q=0.8,en;q=0.7"
 }
 
+# Transport settings
+POOL_CONNECTIONS = 4  # Hosts with a pool of kept-alive connections
+POOL_BLOCK = True  # Wait for a free pooled connection instead of opening one that is thrown away
+HTTP2 = False  # Send requests over HTTP/2 through httpx (pip install -r requirements-optional.txt)
+DEFAULT_ENCODING = "utf-8"  # Charset of pages whose Content-Type does not declare one
+
 # Delay settings (in seconds)
 DELAY_BETWEEN_JOBS = 1  # Delay between scraping individual jobs
 DELAY_BETWEEN_PAGES = 2  # Delay between scraping pages
@@ -26,10 +32,71 @@ RANDOM_DELAY = True  # Add random delay to avoid detection
 MIN_RANDOM_DELAY = 0.5  # Minimum random delay in seconds
 MAX_RANDOM_DELAY = 2.0  # Maximum random delay in seconds
 
+# Concurrency settings
+MAX_CONCURRENT_REQUESTS = 1  # Number of job detail requests in flight
+REQUESTS_PER_SECOND = 1 / DELAY_BETWEEN_JOBS  # Token bucket refill rate for job detail requests
+RATE_LIMIT_BURST = 1  # Token bucket capacity (requests allowed back to back)
+
+# Parser backend for results and job detail pages: "lxml" (fast) or "bs4" (BeautifulSoup reference)
+PARSER = "lxml"
+PARSE_WORKERS = 1  # Worker processes for parsing job detail pages (1 parses in the scraper process)
+PARSE_BATCH_SIZE = 64  # Pages sent to a parse worker at a time, while scraping and when re-parsing in bulk
+
 # Request settings
 REQUEST_TIMEOUT = 10  # Request timeout in seconds
 MAX_RETRIES = 3  # Maximum number of retries for failed requests
-RETRY_DELAY = 5  # Delay between retries in seconds
+RETRY_DELAY = 5  # Delay between retries in seconds, doubled on every further retry
+RETRY_MAX_DELAY = 60  # Upper bound of the backoff between retries (Retry-After is honored as sent)
+RETRY_STATUSES = (429, 500, 502, 503, 504)  # Responses retried like timeouts and connection errors
+
+# Adaptive throttling (AIMD): the request rate grows while the site answers quickly
+# and is cut on timeouts, retried responses or slow answers
+ADAPTIVE_THROTTLING = True
+MIN_REQUESTS_PER_SECOND = 0.2  # Lowest rate adaptive throttling backs off to
+MAX_REQUESTS_PER_SECOND = 2  # Highest rate adaptive throttling speeds up to
+RATE_INCREASE = 0.05  # Requests per second added after each fast, successful response
+RATE_DECREASE = 0.5  # Rate multiplier after an error or slow response
+LATENCY_TARGET = 2.0  # Average response time in seconds above which the rate is lowered
+
+# HTTP cache settings
+CACHE_ENABLED = False  # Serve unchanged pages from an on-disk cache with conditional revalidation
+CACHE_DIR = "cache/http"  # Directory for cached response bodies and their index
+CACHE_MAX_BYTES = 200 * 1024 * 1024  # Least recently used pages are evicted above this size
+CACHE_TTL = [
+    (r"/results(/p\d+)?$", 15 * 60),  # Results pages change as postings come and go
+]
+CACHE_DEFAULT_TTL = 24 * 60 * 60  # Job detail pages rarely change once posted
+
+# Page archive settings
+ARCHIVE_ENABLED = False  # Keep every fetched page body for offline re-parsing
+ARCHIVE_DIR = "archive"  # Directory for compressed archive segments and their URL index
+ARCHIVE_SEGMENT_BYTES = 256 * 1024 * 1024  # A new segment is started above this size
+
+# Incremental scraping settings
+INCREMENTAL = False  # Only fetch details for listings that are new or whose summary changed
+SEEN_INDEX_PATH = "cache/seen.sqlite"  # Index of listings scraped in earlier runs
+INCREMENTAL_STOP_AFTER = 20  # Stop paging after this many known, unchanged listings in a row
+
+# Logging settings
+LOG_DIR = "logs"  # Directory for the text log and the JSON-lines event log
+LOG_LEVEL = "INFO"  # Lowest level written to the console and the log files
+LOG_JSON = True  # Also write every record as a structured JSON-lines event
+LOG_BUFFER_RECORDS = 200  # Log files are written in batches of this many records
+LOG_FLUSH_SECONDS = 2.0  # Buffered records are written at least this often; warnings and errors at once
+LOG_SAMPLE_EVERY = {"job": 25, "detail": 25}  # Only every Nth record of these per-item stages is logged
+LOG_RATE_LIMITS = {"results": 5.0}  # Maximum records per second of these stages
+
+# Run metrics
+METRICS_ENABLED = True  # Record per-stage timings, request counts and bytes downloaded
+METRICS_REPORT_FILE = "output/run_report.json"  # JSON run report written at the end of a run
+METRICS_PROMETHEUS_FILE = None  # Optional Prometheus text-format file, e.g. "output/metrics.prom"
+
+# Work queue settings for crash-safe, multi-process crawls
+QUEUE_ENABLED = False  # Crawl through a durable task queue that later runs resume
+QUEUE_PATH = "cache/queue.sqlite"  # SQLite database holding the page and detail tasks
+QUEUE_WORKERS = 2  # Worker processes claiming tasks; REQUESTS_PER_SECOND is shared between them
+QUEUE_LEASE_SECONDS = 120  # A claimed task is handed to another worker if not finished in time
+QUEUE_MAX_ATTEMPTS = 3  # Attempts per task before it is marked as failed
 
 # Proxy settings (optional)
 USE_PROXY = False
@@ -40,10 +107,31 @@ PROXIES = {
 
 # Output file settings
 OUTPUT_FILENAME = "uzt_adds.xlsx"
+STORAGE_BATCH_SIZE = 100  # Jobs buffered by storage writers between writes
+PARQUET_DIR = "output/parquet"  # Parquet dataset partitioned by scrape date and run
+FEATURES_ENABLED = True  # Derive normalized location, salary range, posting date and similarity tokens at ingest
+FEATURES_FILENAME = "features.sqlite"  # Feature store kept next to the stored dataset
 
 # Request timeout (in seconds)
 REQUEST_TIMEOUT = 10 
 
+# Relative error bound of streamed salary median and quartiles
+SKETCH_RELATIVE_ACCURACY = 0.01
+
+# Near-duplicate detection settings
+DEDUP_THRESHOLD = 0.8  # Estimated Jaccard similarity above which two listings are the same job
+DEDUP_NUM_PERM = 128  # MinHash signature length
+DEDUP_BANDS = 16  # LSH bands; DEDUP_NUM_PERM must be divisible by it
+DEDUP_SHINGLE_SIZE = 3  # Words per shingle
+
+# Similarity index settings
+SIMILARITY_INDEX_DIR = "output/similarity_index"  # Persisted TF-IDF index of all scraped jobs
+SIMILARITY_TOP_K = 100  # Number of most similar jobs listed and saved per profile
+SIMILARITY_CHUNK_CELLS = 4_000_000  # Profile x job scores computed at once when ranking many profiles
+SIMILARITY_REFIT_NEW_TERMS = 0  # Refit the index when added jobs bring this many terms missing from its vocabulary (0: never; terms are ignored until the next refit)
+SIMILARITY_REFIT_FRACTION = 0.25  # Refit the index once this fraction of its jobs was added since the last fit (0: never)
+REFERENCE_PROFILES_FILE = None  # Optional JSON file with profiles (name -> REFERENCE_JOB-like dict) to rank instead of REFERENCE_JOB
+
 # Reference job description for similarity comparison
 REFERENCE_JOB = {
     'Darbo pobūdis': 'Teisininkas',
@@ -0,0 +1,222 @@
+"""
+Near-duplicate detection for reposted job listings.
+"""
+import re
+import zlib
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from .analysis import normalize_location
+from .config import DEDUP_BANDS, DEDUP_NUM_PERM, DEDUP_SHINGLE_SIZE, DEDUP_THRESHOLD
+from .models import JobListing
+from .table import JobTable
+
+WORD_PATTERN = re.compile(r'\w+')
+
+# Mersenne prime 2**61 - 1 used for the universal hash family
+_PRIME = (1 << 61) - 1
+_MAX_HASH = np.uint64(0xFFFFFFFF)
+
+
+def listing_text(title: Optional[str], company: Optional[str], description: Optional[str]) -> str:
+    """Join the fields a listing is compared on: title, company and description."""
+    return ' '.join((title or '', company or '', description or ''))
+
+
+def job_shingles(job: JobListing, size: int = DEDUP_SHINGLE_SIZE) -> np.ndarray:
+    """
+    Hash the word shingles of a job's title, company and description.
+
+    Args:
+        job (JobListing): The job listing
+        size (int): Words per shingle
+
+    Returns:
+        np.ndarray: Distinct 32-bit shingle hashes, empty if the job has no words
+    """
+    return text_shingles(listing_text(job.title, job.company, job.details.get('Darbo aprašymas')), size)
+
+
+def text_shingles(text: str, size: int = DEDUP_SHINGLE_SIZE) -> np.ndarray:
+    """
+    Hash the word shingles of a text.
+
+    Args:
+        text (str): The text, e.g. built with listing_text
+        size (int): Words per shingle
+
+    Returns:
+        np.ndarray: Distinct 32-bit shingle hashes, empty if the text has no words
+    """
+    words = WORD_PATTERN.findall(text.lower())
+    if len(words) <= size:
+        shingles = [' '.join(words)] if words else []
+    else:
+        shingles = [' '.join(words[i:i + size]) for i in range(len(words) - size + 1)]
+    return np.unique(np.array([zlib.crc32(shingle.encode('utf-8')) for shingle in shingles], dtype=np.uint64))
+
+
+class DuplicateDetector:
+    """
+    Finds near-duplicate job listings with MinHash signatures and LSH banding.
+
+    Every listing gets a MinHash signature of its word shingles. The signature
+    is split into bands and each band is hashed into a bucket, so listings
+    only become candidates when they share a bucket; candidates are confirmed
+    when their signatures agree on at least `threshold` of the positions (the
+    estimated Jaccard similarity). Confirmed pairs are merged with union-find,
+    so detecting duplicates takes roughly linear time in the number of
+    listings instead of comparing every pair.
+
+    Buckets are kept per normalized location, so the same role posted by a
+    company in several cities is kept once per city rather than collapsed
+    into one listing.
+    """
+
+    def __init__(self, threshold: float = DEDUP_THRESHOLD, num_perm: int = DEDUP_NUM_PERM,
+                 bands: int = DEDUP_BANDS, seed: int = 1) -> None:
+        """
+        Initialize the DuplicateDetector.
+
+        Args:
+            threshold (float): Estimated Jaccard similarity from which listings are duplicates
+            num_perm (int): MinHash signature length
+            bands (int): Number of LSH bands, must divide num_perm
+            seed (int): Seed of the hash functions
+        """
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, 1 << 32, num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, 1 << 32, num_perm, dtype=np.uint64)
+        self._buckets: List[Dict[Tuple[str, bytes], List[int]]] = [{} for _ in range(bands)]
+        self._signatures: List[np.ndarray] = []
+        self._parents: List[int] = []
+
+    def __len__(self) -> int:
+        return len(self._parents)
+
+    def signature(self, shingles: np.ndarray) -> np.ndarray:
+        """
+        Compute the MinHash signature of a set of shingle hashes.
+
+        Args:
+            shingles (np.ndarray): Distinct 32-bit shingle hashes
+
+        Returns:
+            np.ndarray: The minimum of each hash function over the shingles
+        """
+        # a and the shingles are below 2**32, so a * x + b fits in 64 bits
+        hashes = (np.outer(shingles, self._a) + self._b) % np.uint64(_PRIME) & _MAX_HASH
+        return hashes.min(axis=0)
+
+    def _find(self, item: int) -> int:
+        while self._parents[item] != item:
+            self._parents[item] = self._parents[self._parents[item]]
+            item = self._parents[item]
+        return item
+
+    def add(self, job: JobListing) -> Optional[int]:
+        """
+        Add a listing to the index.
+
+        Args:
+            job (JobListing): The job listing
+
+        Returns:
+            Optional[int]: The position of the earliest added listing it duplicates, or None if it is new
+        """
+        return self.add_text(listing_text(job.title, job.company, job.details.get('Darbo aprašymas')), job.location)
+
+    def add_text(self, text: str, location: Optional[str]) -> Optional[int]:
+        """
+        Add a listing given by its text and location, e.g. read from a stored row or a JobTable.
+
+        Args:
+            text (str): The listing's title, company and description, joined with listing_text
+            location (Optional[str]): The listing's location as scraped
+
+        Returns:
+            Optional[int]: The position of the earliest added listing it duplicates, or None if it is new
+        """
+        item = len(self._parents)
+        self._parents.append(item)
+        shingles = text_shingles(text)
+        if len(shingles) == 0:
+            # Nothing to compare: never treat empty listings as duplicates of each other
+            self._signatures.append(None)
+            return None
+        signature = self.signature(shingles)
+        self._signatures.append(signature)
+        location = normalize_location(location)
+        checked = set()
+        for band, buckets in enumerate(self._buckets):
+            key = (location, signature[band * self.rows:(band + 1) * self.rows].tobytes())
+            bucket = buckets.setdefault(key, [])
+            for other in bucket:
+                if other in checked:
+                    continue
+                checked.add(other)
+                if np.mean(self._signatures[other] == signature) >= self.threshold:
+                    root, other_root = self._find(item), self._find(other)
+                    # The earliest listing stays the root of its cluster
+                    self._parents[max(root, other_root)] = min(root, other_root)
+            bucket.append(item)
+        root = self._find(item)
+        return root if root != item else None
+
+    def clusters(self) -> List[List[int]]:
+        """
+        Group the added listings into clusters of near-duplicates.
+
+        Returns:
+            List[List[int]]: Positions of the listings in each cluster with more than one listing,
+            ordered by their first listing
+        """
+        groups: Dict[int, List[int]] = {}
+        for item in range(len(self._parents)):
+            groups.setdefault(self._find(item), []).append(item)
+        return [group for group in groups.values() if len(group) > 1]
+
+
+def deduplicate(jobs: Iterable[JobListing], detector: Optional[DuplicateDetector] = None) -> Iterator[JobListing]:
+    """
+    Yield the listings that are not near-duplicates of an earlier one.
+
+    Args:
+        jobs (Iterable[JobListing]): The job listings, first occurrences first
+        detector (Optional[DuplicateDetector]): The detector to use, e.g. to inspect its clusters afterwards
+
+    Yields:
+        JobListing: The first listing of each cluster of near-duplicates
+    """
+    if detector is None:
+        detector = DuplicateDetector()
+    for job in jobs:
+        if detector.add(job) is None:
+            yield job
+
+
+def duplicate_mask(jobs: JobTable, detector: Optional[DuplicateDetector] = None) -> np.ndarray:
+    """
+    Flag the rows of a table that are near-duplicates of an earlier row, reading its columns directly.
+
+    Args:
+        jobs (JobTable): The job listings, first occurrences first
+        detector (Optional[DuplicateDetector]): The detector to use
+
+    Returns:
+        np.ndarray: True for every row that is not the first listing of its cluster
+    """
+    if detector is None:
+        detector = DuplicateDetector()
+    columns = zip(jobs.column('title'), jobs.column('company'), jobs.detail_column('Darbo aprašymas'),
+                  jobs.column('location'))
+    return np.array([
+        detector.add_text(listing_text(title, company, description), location) is not None
+        for title, company, description, location in columns
+    ], dtype=bool)
@@ -0,0 +1,302 @@
+"""
+Derived features of job listings, computed once at ingest and kept next to the stored listings.
+
+Near-duplicate detection runs at ingest too, so reading a dataset only
+filters on the stored duplicate flags.
+"""
+import hashlib
+import os
+import sqlite3
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from .analysis import normalize_location, parse_posted_date, parse_salary_range
+from .config import FEATURES_FILENAME, STORAGE_BATCH_SIZE
+from .dedup import DuplicateDetector, listing_text
+from .metrics import metrics
+from .parsers import PARSER_VERSION
+from .similarity import format_text, tokenize
+from .storage import Storage
+from .table import JobTable
+
+# Bumped whenever the way features are derived changes
+FEATURES_VERSION = 2
+# Version stored with every row; rows of another version are recomputed
+VERSION = f"{PARSER_VERSION}.{FEATURES_VERSION}"
+# Feature columns returned by FeatureStore.load
+COLUMNS = ('location', 'salary_min', 'salary_max', 'salary_mid', 'posted_on', 'tokens', 'duplicate')
+# Raw row keys the features are derived from
+SOURCE_KEYS = ('Pavadinimas', 'Vieta', 'Paskelbta', 'Atlyginimas', 'Turima patirtis', 'Darbo aprašymas')
+# Rows looked up per query, below SQLite's limit on query parameters
+_LOOKUP_CHUNK = 500
+
+
+def source_hash(row: Dict[str, str]) -> str:
+    """
+    Compute a fingerprint of the raw fields features are derived from.
+
+    Args:
+        row (Dict[str, str]): A job in the JobListing.to_dict layout.
+
+    Returns:
+        str: A hex digest that changes whenever one of the SOURCE_KEYS changes.
+    """
+    return _fingerprint(row.get(key) for key in SOURCE_KEYS)
+
+
+def table_hashes(jobs: JobTable) -> List[str]:
+    """
+    Compute source_hash for every row of a table from its columns, without building the rows.
+
+    Args:
+        jobs (JobTable): The job listings.
+
+    Returns:
+        List[str]: One fingerprint per row, equal to source_hash of the row's dict.
+    """
+    columns = [jobs.column(name) for name in ('title', 'location', 'posted_date', 'salary')]
+    columns += [jobs.detail_column(key) for key in SOURCE_KEYS[4:]]
+    return [_fingerprint(values) for values in zip(*columns)]
+
+
+def _fingerprint(values: Iterable) -> str:
+    return hashlib.sha1("\x1f".join(str(value or '') for value in values).encode("utf-8")).hexdigest()
+
+
+def derive_features(row: Dict[str, str]) -> Tuple:
+    """
+    Derive the features of one job.
+
+    Args:
+        row (Dict[str, str]): A job in the JobListing.to_dict layout.
+
+    Returns:
+        Tuple: Normalized location, salary min, max and midpoint (None where
+        missing), posting date as YYYY-MM-DD and the tokenized similarity text.
+    """
+    low, high = parse_salary_range(row.get('Atlyginimas') or '')
+    mid = (low + high) / 2 if low is not None and high is not None else (low if low is not None else high)
+    salary = row.get('Atlyginimas')
+    text = format_text(
+        row.get('Pavadinimas') or '', row.get('Vieta') or '', str(salary) if salary else '',
+        row.get('Turima patirtis') or '', row.get('Darbo aprašymas') or ''
+    )
+    return (
+        normalize_location(row.get('Vieta')), low, high, mid,
+        parse_posted_date(row.get('Paskelbta') or ''), tokenize(text)
+    )
+
+
+def features_path(dataset: str) -> str:
+    """
+    Return where the features of a stored dataset are kept.
+
+    Args:
+        dataset (str): A dataset file or Parquet directory, as read by load_table.
+
+    Returns:
+        str: The dataset itself for SQLite datasets, else FEATURES_FILENAME in the dataset's directory.
+    """
+    if os.path.splitext(dataset)[1].lower() in ('.sqlite', '.db'):
+        return dataset
+    return os.path.join(os.path.dirname(os.path.normpath(dataset)), FEATURES_FILENAME)
+
+
+class FeatureStore(Storage):
+    """
+    SQLite store of derived job features, keyed by URL.
+
+    Used like the other storage handlers, it derives the features of every
+    appended job. Each row keeps the fingerprint of the raw fields it was
+    derived from and the parser and feature version, so listings that did
+    not change are skipped and only new, changed or outdated ones are
+    recomputed. The job_features table can live in its own file or in the
+    database of SQLiteStorage.
+
+    The jobs appended between open and close also pass through a
+    DuplicateDetector in order, and each row keeps the URL of the earlier
+    listing it reposts (duplicate_of), so the duplicates of a dataset are
+    found once when it is written rather than every time it is read.
+    """
+    def __init__(self, filename: str = FEATURES_FILENAME, batch_size: int = STORAGE_BATCH_SIZE):
+        super().__init__(filename, batch_size)
+        self._db: Optional[sqlite3.Connection] = None
+        self._detector: Optional[DuplicateDetector] = None
+        # URLs of the jobs appended since open, by position in the detector
+        self._urls: List[str] = []
+        self.computed = 0
+        self.reused = 0
+
+    @staticmethod
+    def _connect(filename: str) -> sqlite3.Connection:
+        os.makedirs(os.path.dirname(filename) or '.', exist_ok=True)
+        db = sqlite3.connect(filename, timeout=30)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        db.execute("""
+            CREATE TABLE IF NOT EXISTS job_features (
+                url TEXT PRIMARY KEY,
+                version TEXT NOT NULL,
+                source_hash TEXT NOT NULL,
+                location TEXT,
+                salary_min REAL,
+                salary_max REAL,
+                salary_mid REAL,
+                posted_on TEXT,
+                tokens TEXT NOT NULL,
+                duplicate_of TEXT
+            ) WITHOUT ROWID
+        """)
+        # Tables written before duplicate detection moved to ingest; their rows are of an older version
+        if "duplicate_of" not in {column[1] for column in db.execute("PRAGMA table_info(job_features)")}:
+            db.execute("ALTER TABLE job_features ADD COLUMN duplicate_of TEXT")
+        return db
+
+    def _open(self, output_file: str) -> None:
+        self._db = self._connect(output_file)
+        self._detector = DuplicateDetector()
+        self._urls = []
+
+    def _stored_rows(self, urls: List[str]) -> Dict[str, Tuple[str, Optional[str]]]:
+        """Return the source hash and duplicate_of of the given URLs' rows that are of the current version."""
+        stored = {}
+        for start in range(0, len(urls), _LOOKUP_CHUNK):
+            chunk = urls[start:start + _LOOKUP_CHUNK]
+            stored.update(
+                (url, (fingerprint, duplicate_of)) for url, fingerprint, duplicate_of in self._db.execute(
+                    f"SELECT url, source_hash, duplicate_of FROM job_features WHERE version = ? "
+                    f"AND url IN ({', '.join('?' * len(chunk))})",
+                    [VERSION, *chunk]
+                )
+            )
+        return stored
+
+    def _duplicate_of(self, row: Dict[str, str]) -> Optional[str]:
+        """Add a row to the duplicate detector and return the URL of the earlier listing it reposts."""
+        url = row.get('Nuoroda', '')
+        self._urls.append(url)
+        original = self._detector.add_text(
+            listing_text(row.get('Pavadinimas'), row.get('Įmonė'), row.get('Darbo aprašymas')), row.get('Vieta')
+        )
+        # A URL appended twice is not a repost of itself; load flags its later rows instead
+        if original is None or self._urls[original] == url:
+            return None
+        return self._urls[original]
+
+    def _write_rows(self, rows: List[Dict[str, str]]) -> None:
+        stored = self._stored_rows([row.get('Nuoroda', '') for row in rows])
+        changed, moved = [], []
+        for row in rows:
+            url, fingerprint, duplicate_of = row.get('Nuoroda', ''), source_hash(row), self._duplicate_of(row)
+            previous = stored.get(url)
+            if previous is None or previous[0] != fingerprint:
+                changed.append((url, VERSION, fingerprint, *derive_features(row), duplicate_of))
+            elif previous[1] != duplicate_of:
+                # Unchanged listing whose original is different in this dataset
+                moved.append((duplicate_of, url))
+        if changed or moved:
+            with self._db:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO job_features (url, version, source_hash, location, salary_min, "
+                    "salary_max, salary_mid, posted_on, tokens, duplicate_of) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    changed
+                )
+                self._db.executemany("UPDATE job_features SET duplicate_of = ? WHERE url = ?", moved)
+        self.computed += len(changed)
+        self.reused += len(rows) - len(changed)
+        metrics.inc("features_computed_total", len(changed))
+        metrics.inc("features_reused_total", len(rows) - len(changed))
+
+    def _close(self) -> None:
+        self._db.close()
+        self._db = None
+        self._detector = None
+        self._urls = []
+
+    def stale(self, jobs: JobTable) -> bool:
+        """
+        Whether some of a table's jobs lack current features, so the table has to be saved to the store first.
+
+        True for a dataset not written through the store, one changed since,
+        and one written by an older parser or feature version.
+
+        Args:
+            jobs (JobTable): The jobs, in dataset order.
+
+        Returns:
+            bool: True unless every job has features derived from its current fields.
+        """
+        if not os.path.exists(self.filename):
+            return len(jobs) > 0
+        db = self._connect(self.filename)
+        try:
+            stored = dict(db.execute("SELECT url, source_hash FROM job_features WHERE version = ?", (VERSION,)))
+        finally:
+            db.close()
+        return any(stored.get(url) != fingerprint for url, fingerprint in zip(jobs.column('url'), table_hashes(jobs)))
+
+    def load(self, urls: Iterable[str]) -> Dict[str, np.ndarray]:
+        """
+        Read the features of jobs, aligned with their URLs.
+
+        Args:
+            urls (Iterable[str]): The jobs' URLs, e.g. JobTable.column('url').
+
+        Returns:
+            Dict[str, np.ndarray]: One array per name in COLUMNS. Salaries are
+            float arrays with NaN where missing; posted_on holds datetime.date
+            objects; duplicate is True for jobs reposting an earlier listing
+            of the given URLs; the other columns hold strings. Jobs without
+            current features get None (NaN for salaries, False for duplicate).
+        """
+        urls = list(urls)
+        rows: Dict[str, int] = {}
+        for row, url in enumerate(urls):
+            rows.setdefault(url, row)
+        location = np.full(len(urls), None, dtype=object)
+        salaries = np.full((len(urls), 3), np.nan)
+        posted_on = np.full(len(urls), None, dtype=object)
+        tokens = np.full(len(urls), None, dtype=object)
+        duplicate = np.zeros(len(urls), dtype=bool)
+        dates: Dict[str, date] = {}
+        db = self._connect(self.filename)
+        try:
+            cursor = db.execute(
+                "SELECT url, location, salary_min, salary_max, salary_mid, posted_on, tokens, duplicate_of "
+                "FROM job_features WHERE version = ?",
+                (VERSION,)
+            )
+            for url, place, low, high, mid, posted, text, duplicate_of in cursor:
+                row = rows.get(url)
+                if row is None:
+                    continue
+                location[row] = place
+                salaries[row] = (
+                    np.nan if low is None else low, np.nan if high is None else high, np.nan if mid is None else mid
+                )
+                if posted is not None:
+                    if posted not in dates:
+                        dates[posted] = date.fromisoformat(posted)
+                    posted_on[row] = dates[posted]
+                tokens[row] = text
+                # Only an original that is part of the same URLs makes a repost redundant
+                duplicate[row] = duplicate_of is not None and duplicate_of in rows
+        finally:
+            db.close()
+        # Duplicate URLs share the features of their first row
+        if len(rows) < len(urls):
+            first = np.array([rows[url] for url in urls])
+            location, salaries, posted_on, tokens = location[first], salaries[first], posted_on[first], tokens[first]
+            # A URL listed again is a duplicate of its first row
+            duplicate = duplicate[first] | (first != np.arange(len(urls)))
+        return {
+            'location': location,
+            'salary_min': salaries[:, 0],
+            'salary_max': salaries[:, 1],
+            'salary_mid': salaries[:, 2],
+            'posted_on': posted_on,
+            'tokens': tokens,
+            'duplicate': duplicate
+        }
@@ -0,0 +1,101 @@
+"""
+Persistent index of already scraped job listings for incremental runs.
+"""
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+from .config import SEEN_INDEX_PATH
+from .models import JobListing
+
+
+def summary_fingerprint(job: JobListing) -> str:
+    """
+    Compute a fingerprint of the fields shown on the results page.
+
+    Args:
+        job (JobListing): The job listing to fingerprint.
+
+    Returns:
+        str: A hex digest that changes whenever a summary field changes.
+    """
+    fields = (job.title, job.company, job.location, job.posted_date, job.salary, job.url)
+    return hashlib.sha1("\x1f".join(fields).encode("utf-8")).hexdigest()
+
+
+class SeenIndex:
+    """SQLite-backed index of scraped listings keyed by URL."""
+
+    def __init__(self, path: str = SEEN_INDEX_PATH) -> None:
+        """
+        Initialize the SeenIndex.
+
+        Args:
+            path (str): Path to the index database.
+        """
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS listings ("
+            "url TEXT PRIMARY KEY, fingerprint TEXT NOT NULL, details TEXT NOT NULL, "
+            "first_seen REAL NOT NULL, last_seen REAL NOT NULL)"
+        )
+        self._db.commit()
+
+    def is_unchanged(self, job: JobListing) -> bool:
+        """Check whether a listing is already indexed with the same summary."""
+        return self.unchanged_details(job) is not None
+
+    def unchanged_details(self, job: JobListing) -> Optional[Dict[str, str]]:
+        """
+        Return the stored details of a listing whose summary has not changed.
+
+        Args:
+            job (JobListing): The job listing as seen on the results page.
+
+        Returns:
+            Optional[Dict[str, str]]: The details from the last run, or None if the
+            listing is new or its summary changed.
+        """
+        with self._lock:
+            row = self._db.execute(
+                "SELECT fingerprint, details FROM listings WHERE url = ?", (job.url,)
+            ).fetchone()
+        if row is None or row[0] != summary_fingerprint(job):
+            return None
+        return json.loads(row[1])
+
+    def record(self, job: JobListing, details: Dict[str, str]) -> None:
+        """
+        Store a listing's fingerprint and details after they were scraped.
+
+        Args:
+            job (JobListing): The job listing as seen on the results page.
+            details (Dict[str, str]): The scraped details.
+        """
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO listings (url, fingerprint, details, first_seen, last_seen) "
+                "VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(url) DO UPDATE SET fingerprint = excluded.fingerprint, "
+                "details = excluded.details, last_seen = excluded.last_seen",
+                (job.url, summary_fingerprint(job), json.dumps(details, ensure_ascii=False), now, now)
+            )
+            self._db.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM listings").fetchone()[0]
+
+    def close(self) -> None:
+        """Close the index database."""
+        with self._lock:
+            self._db.close()
@@ -1,35 +1,275 @@
 """
 Logging configuration for the scraper.
+
+Records are put on a queue by the calling thread and written to the console
+and the log files by a background listener thread, so logging never waits on
+disk or terminal I/O. The log files are written in batches. Per-item records
+carry a stage (see event) and can be sampled or rate-limited per stage;
+warnings and errors always pass.
 """
+import atexit
+import json
 import logging
+import os
+import queue
+import threading
+import time
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .config import (
+    LOG_BUFFER_RECORDS,
+    LOG_DIR,
+    LOG_FLUSH_SECONDS,
+    LOG_JSON,
+    LOG_LEVEL,
+    LOG_RATE_LIMITS,
+    LOG_SAMPLE_EVERY
+)
+from .metrics import metrics
+
+# Listener and process id of every configured logger, by logger name
+_listeners: Dict[str, Tuple[QueueListener, int]] = {}
+_listeners_lock = threading.Lock()
+
+
+def event(stage: str, **fields) -> dict:
+    """
+    Build the `extra` of a structured log record.
+
+    Example: logger.info(f"Surinkta: {title}", extra=event("job", url=url))
+
+    Args:
+        stage (str): The pipeline stage, used for sampling and rate limiting.
+        **fields: Values added to the record's JSON event.
+
+    Returns:
+        dict: The extra record attributes.
+    """
+    return {"stage": stage, "fields": fields}
+
+
+class StageFilter(logging.Filter):
+    """
+    Drops records of busy stages before they are queued.
+
+    Of the records of a stage in sample_every, only every Nth passes; the
+    records of a stage in rate_limits are limited to that many per second.
+    Records without a stage, and warnings and errors, always pass. The next
+    record to pass carries the number of records dropped before it as
+    `suppressed`.
+    """
+
+    def __init__(self, sample_every: Optional[Dict[str, int]] = None,
+                 rate_limits: Optional[Dict[str, float]] = None) -> None:
+        """
+        Initialize the StageFilter.
+
+        Args:
+            sample_every (Optional[Dict[str, int]]): Sampling interval by stage.
+            rate_limits (Optional[Dict[str, float]]): Maximum records per second by stage.
+        """
+        super().__init__()
+        self.sample_every = sample_every or {}
+        self.rate_limits = rate_limits or {}
+        self._lock = threading.Lock()
+        self._seen: Dict[str, int] = {}
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+        self._suppressed: Dict[str, int] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        stage = getattr(record, "stage", None)
+        if stage is None or record.levelno >= logging.WARNING:
+            return True
+        with self._lock:
+            keep = True
+            every = self.sample_every.get(stage)
+            if every and every > 1:
+                seen = self._seen.get(stage, 0)
+                self._seen[stage] = seen + 1
+                keep = seen % every == 0
+            rate = self.rate_limits.get(stage)
+            if keep and rate:
+                now = time.monotonic()
+                tokens, last = self._buckets.get(stage, (rate, now))
+                tokens = min(rate, tokens + (now - last) * rate)
+                keep = tokens >= 1
+                self._buckets[stage] = (tokens - 1 if keep else tokens, now)
+            if not keep:
+                self._suppressed[stage] = self._suppressed.get(stage, 0) + 1
+            else:
+                record.suppressed = self._suppressed.pop(stage, 0)
+        if not keep:
+            metrics.inc("log_records_suppressed_total", stage=stage)
+        return keep
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats a record as one JSON object: time, level, stage, message and the event's fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            "time": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "stage": getattr(record, "stage", None),
+            "message": record.getMessage()
+        }
+        data.update(getattr(record, "fields", {}))
+        if getattr(record, "suppressed", 0):
+            data["suppressed"] = record.suppressed
+        if record.exc_info:
+            data["exception"] = self.formatException(record.exc_info)
+        return json.dumps(data, ensure_ascii=False, default=str)
+
 
-def setup_logger(name: str = "uzt_scraper") -> logging.Logger:
-    """Set up and configure logger."""
+class BufferedFileHandler(logging.FileHandler):
+    """
+    File handler writing records in batches.
+
+    Formatted records are kept in memory and written together once capacity
+    records are buffered, when a record at flush_level or above arrives, and
+    when the handler is flushed or closed.
+    """
+
+    def __init__(self, filename: str, capacity: int = LOG_BUFFER_RECORDS,
+                 flush_level: int = logging.WARNING) -> None:
+        """
+        Initialize the BufferedFileHandler.
+
+        Args:
+            filename (str): The log file.
+            capacity (int): Records buffered before they are written.
+            flush_level (int): Records at this level or above are written at once.
+        """
+        super().__init__(filename, encoding="utf-8")
+        self.capacity = capacity
+        self.flush_level = flush_level
+        self.buffer: List[str] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            self.buffer.append(self.format(record) + self.terminator)
+        except Exception:
+            self.handleError(record)
+            return
+        if len(self.buffer) >= self.capacity or record.levelno >= self.flush_level:
+            self.flush()
+
+    def flush(self) -> None:
+        self.acquire()
+        try:
+            if self.buffer:
+                if self.stream is None:
+                    self.stream = self._open()
+                self.stream.write("".join(self.buffer))
+                self.buffer.clear()
+            super().flush()
+        finally:
+            self.release()
+
+
+class _Listener(QueueListener):
+    """Queue listener that also flushes its handlers whenever the queue stays empty for flush_interval seconds."""
+
+    def __init__(self, record_queue: queue.Queue, *handlers: logging.Handler, flush_interval: float) -> None:
+        super().__init__(record_queue, *handlers, respect_handler_level=True)
+        self.flush_interval = flush_interval
+
+    def dequeue(self, block: bool) -> logging.LogRecord:
+        while True:
+            try:
+                return self.queue.get(block, self.flush_interval)
+            except queue.Empty:
+                if not block:
+                    raise
+                for handler in self.handlers:
+                    handler.flush()
+
+
+def setup_logger(name: str = "uzt_scraper", log_dir: Optional[str] = None) -> logging.Logger:
+    """
+    Set up and configure logger.
+
+    The first call in a process attaches a queue handler and starts the
+    listener writing to the console, a text log and, with LOG_JSON, a
+    JSON-lines event log in log_dir; later calls return the same logger. A
+    process forked from a configured one gets a listener and log files of
+    its own.
+
+    Args:
+        name (str): The logger's name.
+        log_dir (Optional[str]): Directory for the log files. Defaults to LOG_DIR.
+
+    Returns:
+        logging.Logger: The configured logger.
+    """
     logger = logging.getLogger(name)
-    logger.setLevel(logging.INFO)
+    with _listeners_lock:
+        configured = _listeners.get(name)
+        if configured is not None and configured[1] == os.getpid():
+            return logger
+        # Handlers inherited from the parent process feed a listener that does not run here
+        for handler in [h for h in logger.handlers if isinstance(h, QueueHandler)]:
+            logger.removeHandler(handler)
+        for log_filter in [f for f in logger.filters if isinstance(f, StageFilter)]:
+            logger.removeFilter(log_filter)
+
+        level = getattr(logging, LOG_LEVEL)
+        logger.setLevel(level)
+        logger.propagate = False
+
+        # Create logs directory if it doesn't exist
+        directory = Path(log_dir or LOG_DIR)
+        directory.mkdir(parents=True, exist_ok=True)
+        stem = f"scraper_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        if configured is not None:
+            stem += f"_{os.getpid()}"
+
+        # Create formatter
+        formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+
+        # Console and buffered file handlers, run by the listener thread
+        console_handler = logging.StreamHandler()
+        file_handler = BufferedFileHandler(str(directory / f"{stem}.log"))
+        handlers: List[logging.Handler] = [console_handler, file_handler]
+        if LOG_JSON:
+            json_handler = BufferedFileHandler(str(directory / f"{stem}.jsonl"))
+            json_handler.setFormatter(JsonFormatter())
+            handlers.append(json_handler)
+        for handler in handlers:
+            handler.setLevel(level)
+        console_handler.setFormatter(formatter)
+        file_handler.setFormatter(formatter)
 
-    # Create logs directory if it doesn't exist
-    log_dir = Path("logs")
-    log_dir.mkdir(exist_ok=True)
+        record_queue: queue.Queue = queue.Queue(-1)
+        listener = _Listener(record_queue, *handlers, flush_interval=LOG_FLUSH_SECONDS)
+        listener.start()
+        logger.addFilter(StageFilter(LOG_SAMPLE_EVERY, LOG_RATE_LIMITS))
+        logger.addHandler(QueueHandler(record_queue))
+        _listeners[name] = (listener, os.getpid())
+    return logger
 
-    # File handler
-    log_file = log_dir / f"scraper_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
-    file_handler = logging.FileHandler(log_file, encoding='utf-8')
-    file_handler.setLevel(logging.INFO)
 
-    # Console handler
-    console_handler = logging.StreamHandler()
-    console_handler.setLevel(logging.INFO)
+def shutdown_logging(name: Optional[str] = None) -> None:
+    """
+    Write out every queued and buffered record and stop the listeners of this process.
 
-    # Create formatter
-    formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
-    file_handler.setFormatter(formatter)
-    console_handler.setFormatter(formatter)
+    Args:
+        name (Optional[str]): Only stop this logger's listener. Defaults to all of them.
+    """
+    with _listeners_lock:
+        for logger_name, (listener, pid) in list(_listeners.items()):
+            if pid != os.getpid() or name not in (None, logger_name):
+                continue
+            listener.stop()
+            for handler in listener.handlers:
+                handler.close()
+            logger = logging.getLogger(logger_name)
+            for handler in [h for h in logger.handlers if isinstance(h, QueueHandler)]:
+                logger.removeHandler(handler)
+            del _listeners[logger_name]
 
-    # Add handlers to logger
-    logger.addHandler(file_handler)
-    logger.addHandler(console_handler)
 
-    return logger 
\ No newline at end of file
+atexit.register(shutdown_logging)
@@ -0,0 +1,297 @@
+"""
+Run metrics: counters, gauges and latency histograms, written as a JSON run report or in Prometheus text format.
+"""
+import json
+import math
+import sys
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from datetime import datetime
+from functools import wraps
+from pathlib import Path
+from typing import Callable, Dict, Iterator, Optional, Tuple
+
+from .config import METRICS_ENABLED
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None
+
+# Upper bounds of the histogram buckets in seconds, from 1 ms to 2 minutes
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+# Prefix of the metric names in the Prometheus file
+PROMETHEUS_PREFIX = "uzt_scraper_"
+
+MetricKey = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+
+def _key(name: str, labels: Dict[str, str]) -> MetricKey:
+    return name, tuple(sorted((label, str(value)) for label, value in labels.items()))
+
+
+def _format_key(key: MetricKey, prefix: str = "") -> str:
+    """Format a metric key as name{label="value",...}."""
+    name, labels = key
+    if not labels:
+        return prefix + name
+    return prefix + name + "{" + ",".join(f'{label}="{value}"' for label, value in labels) + "}"
+
+
+def peak_rss_bytes() -> Optional[int]:
+    """Return the peak resident set size of this process, or None where it is not available."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class Histogram:
+    """
+    Distribution of observed values in fixed buckets.
+
+    Observing a value is a binary search and a few additions, so histograms
+    can sit on hot paths. Quantiles are interpolated within their bucket.
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        """
+        Initialize the Histogram.
+
+        Args:
+            buckets (Tuple[float, ...]): Sorted upper bounds of the buckets; values
+                above the last bound fall into an open +Inf bucket.
+        """
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def observe(self, value: float) -> None:
+        """Record one value."""
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estimate a quantile.
+
+        Args:
+            q (float): The quantile, between 0 and 1.
+
+        Returns:
+            Optional[float]: The estimate, or None if nothing was observed.
+        """
+        if not self.count:
+            return None
+        rank = q * self.count
+        cumulative = 0
+        for i, count in enumerate(self.counts):
+            if count and cumulative + count >= rank:
+                lower = self.buckets[i - 1] if i > 0 else self.min
+                upper = self.buckets[i] if i < len(self.buckets) else self.max
+                lower, upper = max(lower, self.min), min(upper, self.max)
+                return lower + (upper - lower) * (rank - cumulative) / count
+            cumulative += count
+        return self.max
+
+    def to_dict(self) -> dict:
+        """Summarize the histogram for the run report."""
+        if not self.count:
+            return {"count": 0, "sum": 0.0}
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "mean": self.sum / self.count,
+            "min": self.min,
+            "max": self.max,
+            "p50": self.quantile(0.5),
+            "p90": self.quantile(0.9),
+            "p99": self.quantile(0.99)
+        }
+
+
+class Metrics:
+    """
+    Thread-safe registry of counters, gauges and histograms for one run.
+
+    Metrics are identified by a name and optional labels, e.g.
+    metrics.inc("pages_total", kind="detail"). When disabled, every call
+    returns at once.
+    """
+
+    def __init__(self, enabled: bool = METRICS_ENABLED) -> None:
+        """
+        Initialize the Metrics.
+
+        Args:
+            enabled (bool): Whether values are recorded.
+        """
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget every recorded value and restart the run clock."""
+        with self._lock:
+            self.counters: Dict[MetricKey, float] = {}
+            self.gauges: Dict[MetricKey, float] = {}
+            self.histograms: Dict[MetricKey, Histogram] = {}
+            self.started = datetime.now()
+            self._started = time.perf_counter()
+
+    def inc(self, name: str, amount: float = 1, **labels: str) -> None:
+        """Add to a counter."""
+        if not self.enabled:
+            return
+        key = _key(name, labels)
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + amount
+
+    def set(self, name: str, value: float, **labels: str) -> None:
+        """Set a gauge."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self.gauges[_key(name, labels)] = value
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        """Record a value in a histogram."""
+        if not self.enabled:
+            return
+        key = _key(name, labels)
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram()
+            histogram.observe(value)
+
+    @contextmanager
+    def timer(self, name: str, **labels: str) -> Iterator[None]:
+        """Record the duration of a with block, in seconds, in a histogram."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started, **labels)
+
+    def timed(self, name: str, **labels: str) -> Callable:
+        """Decorator recording the duration of every call, in seconds, in a histogram."""
+        def decorator(function: Callable) -> Callable:
+            @wraps(function)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return function(*args, **kwargs)
+                started = time.perf_counter()
+                try:
+                    return function(*args, **kwargs)
+                finally:
+                    self.observe(name, time.perf_counter() - started, **labels)
+            return wrapper
+        return decorator
+
+    def counter(self, name: str, **labels: str) -> float:
+        """Return a counter's value."""
+        return self.counters.get(_key(name, labels), 0)
+
+    def histogram(self, name: str, **labels: str) -> Optional[Histogram]:
+        """Return a histogram, or None if nothing was observed in it."""
+        return self.histograms.get(_key(name, labels))
+
+    def _total(self, name: str) -> float:
+        return sum(value for (counter, _), value in self.counters.items() if counter == name)
+
+    def report(self) -> dict:
+        """
+        Build the run report.
+
+        Returns:
+            dict: Run duration, peak RSS, derived rates, and every counter, gauge
+            and histogram summary keyed by name{labels}.
+        """
+        duration = time.perf_counter() - self._started
+        with self._lock:
+            counters = {_format_key(key): value for key, value in sorted(self.counters.items())}
+            gauges = {_format_key(key): value for key, value in sorted(self.gauges.items())}
+            histograms = {_format_key(key): histogram.to_dict() for key, histogram in sorted(self.histograms.items())}
+            pages = self._total("pages_total")
+            downloaded = self._total("http_response_bytes_total")
+        return {
+            "started": self.started.isoformat(timespec="seconds"),
+            "duration_seconds": duration,
+            "peak_rss_bytes": peak_rss_bytes(),
+            "pages_per_second": pages / duration if duration > 0 else 0.0,
+            "bytes_downloaded": downloaded,
+            "counters": counters,
+            "gauges": gauges,
+            "histograms": histograms
+        }
+
+    def write_json(self, path: str) -> None:
+        """
+        Write the run report as JSON.
+
+        Args:
+            path (str): The report file.
+        """
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.report(), f, ensure_ascii=False, indent=2)
+
+    def to_prometheus(self) -> str:
+        """Return the metrics in the Prometheus text exposition format."""
+        report = self.report()
+        lines = []
+        for name, value in (("run_duration_seconds", report["duration_seconds"]),
+                            ("peak_rss_bytes", report["peak_rss_bytes"])):
+            if value is not None:
+                lines += [f"# TYPE {PROMETHEUS_PREFIX}{name} gauge", f"{PROMETHEUS_PREFIX}{name} {value}"]
+        with self._lock:
+            for kind, values in (("counter", self.counters), ("gauge", self.gauges)):
+                typed = set()
+                for key, value in sorted(values.items()):
+                    if key[0] not in typed:
+                        typed.add(key[0])
+                        lines.append(f"# TYPE {PROMETHEUS_PREFIX}{key[0]} {kind}")
+                    lines.append(f"{_format_key(key, PROMETHEUS_PREFIX)} {value}")
+            typed = set()
+            for (name, labels), histogram in sorted(self.histograms.items()):
+                if name not in typed:
+                    typed.add(name)
+                    lines.append(f"# TYPE {PROMETHEUS_PREFIX}{name} histogram")
+                cumulative = 0
+                for bound, count in zip(histogram.buckets + ("+Inf",), histogram.counts):
+                    cumulative += count
+                    key = (name + "_bucket", labels + (("le", str(bound)),))
+                    lines.append(f"{_format_key(key, PROMETHEUS_PREFIX)} {cumulative}")
+                lines.append(f"{_format_key((name + '_sum', labels), PROMETHEUS_PREFIX)} {histogram.sum}")
+                lines.append(f"{_format_key((name + '_count', labels), PROMETHEUS_PREFIX)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str) -> None:
+        """
+        Write the metrics in Prometheus text format, e.g. for node_exporter's textfile collector.
+
+        Args:
+            path (str): The metrics file.
+        """
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        # Written to a temporary file and renamed so a collector never reads half a file
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(self.to_prometheus())
+        Path(tmp_path).replace(path)
+
+
+# Metrics of the current run, shared by the scraper, storage handlers and analyzers
+metrics = Metrics()
@@ -1,19 +1,22 @@
 """
 Data models for the scraper.
 """
+import sys
 from dataclasses import dataclass
-from typing import Dict
+from typing import Dict, Optional
 
-@dataclass
-class JobListing:
-    """Represents a job listing with all its details."""
-    title: str
-    company: str
-    location: str
-    posted_date: str
-    salary: str
-    url: str
-    details: Dict[str, str]
+# Detail values up to this length (e.g. "Pilnas etatas") are interned by CompactJobListing
+INTERN_MAX_LENGTH = 64
+
+def intern_value(value: Optional[str]) -> Optional[str]:
+    """Return the interned copy of a short string, so equal values share one object."""
+    if type(value) is str and len(value) <= INTERN_MAX_LENGTH:
+        return sys.intern(value)
+    return value
+
+class _JobFields:
+    """Dictionary conversion shared by the job listing classes."""
+    __slots__ = ()
 
     @classmethod
     def from_dict(cls, data: dict) -> 'JobListing':
@@ -38,4 +41,53 @@ class JobListing:
             'Atlyginimas': self.salary,
             'Nuoroda': self.url,
             **self.details
-        } 
\ No newline at end of file
+        }
+
+@dataclass
+class JobListing(_JobFields):
+    """Represents a job listing with all its details."""
+    title: str
+    company: str
+    location: str
+    posted_date: str
+    salary: str
+    url: str
+    details: Dict[str, str]
+
+class CompactJobListing(_JobFields):
+    """
+    A JobListing without a per-instance __dict__.
+
+    Company, location, posting date, salary and the detail keys (and short
+    detail values) are interned, so listings that share them share one string
+    object instead of each holding its own copy.
+    """
+    __slots__ = ('title', 'company', 'location', 'posted_date', 'salary', 'url', 'details')
+
+    def __init__(self, title: str, company: str, location: str, posted_date: str,
+                 salary: str, url: str, details: Dict[str, str]) -> None:
+        self.title = title
+        self.company = intern_value(company)
+        self.location = intern_value(location)
+        self.posted_date = intern_value(posted_date)
+        self.salary = intern_value(salary)
+        self.url = url
+        self.details = {sys.intern(key): intern_value(value) for key, value in details.items()}
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, CompactJobListing):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self) -> str:
+        fields = ', '.join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"CompactJobListing({fields})"
+
+    @classmethod
+    def from_listing(cls, job: JobListing) -> 'CompactJobListing':
+        """Create a CompactJobListing from a JobListing."""
+        return cls(job.title, job.company, job.location, job.posted_date, job.salary, job.url, job.details)
+
+    def to_listing(self) -> JobListing:
+        """Convert back to a JobListing."""
+        return JobListing(self.title, self.company, self.location, self.posted_date, self.salary, self.url, dict(self.details)) 
\ No newline at end of file
@@ -0,0 +1,138 @@
+"""
+Process pool stage for CPU-bound HTML parsing.
+"""
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+from .config import BASE_URL, PARSER, PARSE_WORKERS, PARSE_BATCH_SIZE
+from .parsers import PageParser, get_parser
+
+# Parsers created inside worker processes, keyed by (parser name, base URL)
+_worker_parsers: Dict[tuple, PageParser] = {}
+
+
+def _parse_batch(parser_name: str, base_url: str, pages: List[Tuple[bytes, str]]) -> List[Dict[str, str]]:
+    """Parse a batch of job detail pages, each with its charset, in a worker process."""
+    parser = _worker_parsers.get((parser_name, base_url))
+    if parser is None:
+        parser = _worker_parsers[(parser_name, base_url)] = get_parser(parser_name, base_url)
+    return [parser.parse_detail_page(page, encoding) for page, encoding in pages]
+
+
+class ParsePool:
+    """Parses raw job detail page bodies on a pool of worker processes."""
+
+    def __init__(
+        self,
+        workers: int = PARSE_WORKERS,
+        batch_size: int = PARSE_BATCH_SIZE,
+        parser: str = PARSER,
+        base_url: str = BASE_URL
+    ) -> None:
+        """
+        Initialize the ParsePool.
+
+        Args:
+            workers (int): The number of worker processes. With one worker pages
+                are parsed in the calling process.
+            batch_size (int): The number of pages sent to a worker at a time.
+            parser (str): The parser backend used by the workers.
+            base_url (str): The base URL prepended to job links.
+        """
+        self.workers = max(1, workers)
+        self.batch_size = max(1, batch_size)
+        self.parser_name = parser
+        self.base_url = base_url
+        self._executor = ProcessPoolExecutor(max_workers=self.workers) if self.workers > 1 else None
+
+    def parse_details(self, pages: Iterable[bytes], encoding: str = "utf-8") -> Iterator[Dict[str, str]]:
+        """
+        Parse job detail pages, yielding results in input order.
+
+        Args:
+            pages (Iterable[bytes]): The raw page bodies.
+            encoding (str): The charset of the page bodies.
+
+        Yields:
+            Dict[str, str]: The details of each page.
+        """
+        return self._map((page, encoding) for page in pages)
+
+    def parse_detail_bodies(self, bodies: Iterable[Tuple[bytes, str]]) -> Iterator[Dict[str, str]]:
+        """
+        Parse job detail pages in different charsets, yielding results in input order.
+
+        Args:
+            bodies (Iterable[Tuple[bytes, str]]): Each raw page body with its charset.
+
+        Yields:
+            Dict[str, str]: The details of each page.
+        """
+        return self._map(bodies)
+
+    def parse_detail(self, page: bytes, encoding: str = "utf-8") -> Dict[str, str]:
+        """
+        Parse a single job detail page, blocking until a worker returns it.
+
+        Args:
+            page (bytes): The raw page body.
+            encoding (str): The charset of the page body.
+
+        Returns:
+            Dict[str, str]: The details of the page.
+        """
+        return self.submit_details([(page, encoding)]).result()[0]
+
+    def submit_details(self, bodies: List[Tuple[bytes, str]]) -> Future:
+        """
+        Send a batch of job detail pages to a worker.
+
+        Args:
+            bodies (List[Tuple[bytes, str]]): Each raw page body with its charset.
+
+        Returns:
+            Future: Resolves to the details of each page, in input order.
+        """
+        if self._executor is None:
+            future: Future = Future()
+            try:
+                future.set_result(_parse_batch(self.parser_name, self.base_url, bodies))
+            except Exception as e:
+                future.set_exception(e)
+            return future
+        return self._executor.submit(_parse_batch, self.parser_name, self.base_url, bodies)
+
+    def _map(self, pages: Iterable[Tuple[bytes, str]]) -> Iterator[Dict[str, str]]:
+        """Parse pages in batches, keeping at most two batches per worker in flight."""
+        pages = iter(pages)
+        batches = iter(lambda: list(islice(pages, self.batch_size)), [])
+        if self._executor is None:
+            for batch in batches:
+                yield from _parse_batch(self.parser_name, self.base_url, batch)
+            return
+
+        pending = deque()
+        try:
+            for batch in batches:
+                pending.append(self._executor.submit(_parse_batch, self.parser_name, self.base_url, batch))
+                if len(pending) >= self.workers * 2:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def close(self) -> None:
+        """Shut down the worker processes."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def __enter__(self) -> "ParsePool":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,226 @@
+"""
+HTML parsers for results pages and job detail pages.
+"""
+import threading
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional
+
+from bs4 import BeautifulSoup
+from lxml import etree, html
+
+from .config import BASE_URL
+
+
+def _has_class(name: str) -> str:
+    """Build an XPath predicate matching a class token, like the CSS selector `.name`."""
+    return f'contains(concat(" ", normalize-space(@class), " "), " {name} ")'
+
+
+def extract_job_summary(job: BeautifulSoup, base_url: str = BASE_URL) -> Dict[str, str]:
+    """
+    Extract job summary from a job element.
+
+    Args:
+        job (BeautifulSoup): The job element to extract data from.
+        base_url (str): The base URL prepended to the job link.
+
+    Returns:
+        Dict[str, str]: A dictionary containing the job summary.
+    """
+    title = job.select_one(".title strong")
+    company = job.select_one(".company")
+    location = job.select_one(".location")
+    date = job.select_one(".created-date")
+    salary = job.select_one(".salary")
+    link = job.get("href")
+    full_url = base_url + link
+    return {
+        "Pavadinimas": title.text.strip() if title else "–",
+        "Įmonė": company.text.strip() if company else "–",
+        "Vieta": location.text.strip() if location else "–",
+        "Paskelbta": date.text.strip().replace("Įkelta: ", "") if date else "–",
+        "Atlyginimas": salary.text.strip() if salary else "–",
+        "Nuoroda": full_url
+    }
+
+
+def _detail_sections(tree, blocks_xpath, h4_xpath, title_xpath, text_xpath) -> Dict[str, str]:
+    """Collect the h4 sections of the two job detail meta blocks into a dictionary."""
+    results = {}
+    for idx in [1, 2]:
+        blocks = blocks_xpath(tree, idx=idx)
+        if blocks:
+            block = blocks[0]
+            sections = h4_xpath(block)
+            for i, h4 in enumerate(sections):
+                title_el = title_xpath(h4)
+                title = title_el[0].strip().rstrip(":") if title_el else f"Skyrius {i+1}"
+                content = []
+                next_el = h4.getnext()
+                while next_el is not None and next_el.tag != 'h4':
+                    content.extend(t.strip() for t in text_xpath(next_el) if t.strip())
+                    next_el = next_el.getnext()
+                results[title] = '; '.join(content) if content else "–"
+    return results
+
+
+class PageParser(ABC):
+    """Base class for results and job detail page parsers."""
+
+    name = ""
+
+    def __init__(self, base_url: str = BASE_URL) -> None:
+        """
+        Initialize the parser.
+
+        Args:
+            base_url (str): The base URL prepended to job links.
+        """
+        self.base_url = base_url
+
+    @abstractmethod
+    def parse_listing_page(self, content: bytes, encoding: str = "utf-8", limit: Optional[int] = None) -> List[Dict[str, str]]:
+        """
+        Parse the job summaries of a results page.
+
+        Args:
+            content (bytes): The raw page body.
+            encoding (str): The charset of the page body.
+            limit (Optional[int]): The maximum number of summaries to extract.
+
+        Returns:
+            List[Dict[str, str]]: One summary dictionary per job, in page order.
+        """
+
+    @abstractmethod
+    def parse_detail_page(self, content: bytes, encoding: str = "utf-8") -> Dict[str, str]:
+        """
+        Parse the detail sections of a job page.
+
+        Args:
+            content (bytes): The raw page body.
+            encoding (str): The charset of the page body.
+
+        Returns:
+            Dict[str, str]: A dictionary mapping section titles to their text.
+        """
+
+
+class SoupParser(PageParser):
+    """Reference parser using BeautifulSoup's html.parser for results pages."""
+
+    name = "bs4"
+
+    def parse_listing_page(self, content: bytes, encoding: str = "utf-8", limit: Optional[int] = None) -> List[Dict[str, str]]:
+        soup = BeautifulSoup(content.decode(encoding, errors="replace"), "html.parser")
+        job_elements = soup.select("div.list > a")
+        return [extract_job_summary(job, self.base_url) for job in job_elements[:limit]]
+
+    def parse_detail_page(self, content: bytes, encoding: str = "utf-8") -> Dict[str, str]:
+        tree = html.fromstring(content.decode(encoding, errors="replace"))
+        return _detail_sections(
+            tree,
+            lambda node, idx: node.xpath(f'//main//div[contains(@class, "meta__list")]//div[{idx}]'),
+            lambda node: node.xpath('./h4'),
+            lambda node: node.xpath('./strong/text()'),
+            lambda node: node.xpath('.//text()')
+        )
+
+
+class LxmlParser(PageParser):
+    """Fast parser using lxml with precompiled XPath selectors, reading pages as bytes."""
+
+    name = "lxml"
+
+    _job_elements = etree.XPath(f'//div[{_has_class("list")}]/a')
+    _title = etree.XPath(f'(.//*[{_has_class("title")}]//strong)[1]')
+    _company = etree.XPath(f'(.//*[{_has_class("company")}])[1]')
+    _location = etree.XPath(f'(.//*[{_has_class("location")}])[1]')
+    _date = etree.XPath(f'(.//*[{_has_class("created-date")}])[1]')
+    _salary = etree.XPath(f'(.//*[{_has_class("salary")}])[1]')
+    _detail_blocks = etree.XPath('//main//div[contains(@class, "meta__list")]//div[$idx]')
+    _sections = etree.XPath('./h4')
+    _section_title = etree.XPath('./strong/text()')
+    _section_text = etree.XPath('.//text()')
+
+    def __init__(self, base_url: str = BASE_URL) -> None:
+        super().__init__(base_url)
+        # lxml parser objects must not be shared between threads
+        self._local = threading.local()
+
+    def _parse(self, content: bytes, encoding: str):
+        """Parse a page body into a document tree, or return None for an empty page."""
+        parsers = getattr(self._local, "parsers", None)
+        if parsers is None:
+            parsers = self._local.parsers = {}
+        parser = parsers.get(encoding)
+        if parser is None:
+            parser = parsers[encoding] = html.HTMLParser(encoding=encoding)
+        try:
+            return html.document_fromstring(content, parser=parser)
+        except etree.ParserError:
+            return None
+
+    @staticmethod
+    def _text(elements) -> Optional[str]:
+        return elements[0].text_content().strip() if elements else None
+
+    def parse_listing_page(self, content: bytes, encoding: str = "utf-8", limit: Optional[int] = None) -> List[Dict[str, str]]:
+        tree = self._parse(content, encoding)
+        if tree is None:
+            return []
+        summaries = []
+        for job in self._job_elements(tree)[:limit]:
+            title = self._text(self._title(job))
+            company = self._text(self._company(job))
+            location = self._text(self._location(job))
+            date = self._text(self._date(job))
+            salary = self._text(self._salary(job))
+            full_url = self.base_url + job.get("href")
+            summaries.append({
+                "Pavadinimas": title if title is not None else "–",
+                "Įmonė": company if company is not None else "–",
+                "Vieta": location if location is not None else "–",
+                "Paskelbta": date.replace("Įkelta: ", "") if date is not None else "–",
+                "Atlyginimas": salary if salary is not None else "–",
+                "Nuoroda": full_url
+            })
+        return summaries
+
+    def parse_detail_page(self, content: bytes, encoding: str = "utf-8") -> Dict[str, str]:
+        tree = self._parse(content, encoding)
+        if tree is None:
+            return {}
+        return _detail_sections(
+            tree,
+            self._detail_blocks,
+            self._sections,
+            self._section_title,
+            self._section_text
+        )
+
+
+# Bumped whenever a parser change alters the extracted fields, so features derived from them are recomputed
+PARSER_VERSION = 1
+
+PARSERS = {
+    SoupParser.name: SoupParser,
+    LxmlParser.name: LxmlParser
+}
+
+
+def get_parser(name: str, base_url: str = BASE_URL) -> PageParser:
+    """
+    Create a page parser by name.
+
+    Args:
+        name (str): The parser backend, "lxml" or "bs4".
+        base_url (str): The base URL prepended to job links.
+
+    Returns:
+        PageParser: The parser instance.
+    """
+    try:
+        return PARSERS[name](base_url)
+    except KeyError:
+        raise ValueError(f"Unknown parser: {name} (expected one of {', '.join(PARSERS)})")
@@ -3,73 +3,345 @@ Main scraper implementation.
 """
 import requests
 from bs4 import BeautifulSoup
-from lxml import html
 import time
-from typing import List, Dict
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, List, Dict, Iterable, Iterator, Optional, Tuple, Union
 from .config import (
     BASE_URL,
     JOB_URL_PREFIX,
     MAX_JOBS,
     HEADERS,
-    DELAY_BETWEEN_JOBS,
     DELAY_BETWEEN_PAGES,
     OUTPUT_FILENAME,
-    REQUEST_TIMEOUT
+    REQUEST_TIMEOUT,
+    MAX_RETRIES,
+    MAX_CONCURRENT_REQUESTS,
+    REQUESTS_PER_SECOND,
+    RATE_LIMIT_BURST,
+    ADAPTIVE_THROTTLING,
+    MIN_REQUESTS_PER_SECOND,
+    MAX_REQUESTS_PER_SECOND,
+    CACHE_ENABLED,
+    INCREMENTAL,
+    INCREMENTAL_STOP_AFTER,
+    PARSER,
+    PARSE_WORKERS,
+    ARCHIVE_ENABLED,
+    HTTP2
 )
+from .archive import PageArchive
+from .cache import HTTPCache
+from .client import HttpClient
+from .index import SeenIndex
+from .parsers import PageParser, get_parser, extract_job_summary
+from .parallel import ParsePool
 from .models import JobListing
-from .logger import setup_logger
-import pandas as pd
+from .storage import ExcelStorage
+from .logger import event, setup_logger
+from .metrics import metrics
+from .throttle import AdaptiveRateLimiter, TokenBucket
+from .transport import build_session, response_charset
+from .workqueue import DETAIL, PAGE, Task, WorkQueue
 
 class JobScraper:
     """Scraper for collecting job listings from UZT."""
 
-    def __init__(self, base_url: str = BASE_URL, max_jobs: int = MAX_JOBS) -> None:
+    def __init__(
+        self,
+        base_url: str = BASE_URL,
+        max_jobs: int = MAX_JOBS,
+        max_concurrent_requests: int = MAX_CONCURRENT_REQUESTS,
+        requests_per_second: float = REQUESTS_PER_SECOND,
+        cache: Optional[HTTPCache] = None,
+        seen_index: Optional[SeenIndex] = None,
+        incremental_stop_after: int = INCREMENTAL_STOP_AFTER,
+        parser: Union[str, PageParser] = PARSER,
+        parse_pool: Optional[ParsePool] = None,
+        archive: Optional[PageArchive] = None,
+        replay: Optional[PageArchive] = None,
+        http2: bool = HTTP2,
+        rate_share: float = 1.0
+    ) -> None:
         """
         Initialize the JobScraper.
 
         Args:
             base_url (str): The base URL for the job board.
             max_jobs (int): The maximum number of jobs to scrape.
+            max_concurrent_requests (int): The number of job detail requests in flight.
+            requests_per_second (float): The rate limit for job detail requests. With
+                ADAPTIVE_THROTTLING it is the starting rate, adjusted to the site's responses.
+            cache (Optional[HTTPCache]): Response cache for results and detail pages.
+                Defaults to one in CACHE_DIR when CACHE_ENABLED is set.
+            seen_index (Optional[SeenIndex]): Index of listings from earlier runs. When set,
+                only new or changed listings are fetched and paging stops early.
+                Defaults to one at SEEN_INDEX_PATH when INCREMENTAL is set.
+            incremental_stop_after (int): The number of known, unchanged listings in a row
+                after which paging stops.
+            parser (Union[str, PageParser]): The HTML parser backend ("lxml" or "bs4"),
+                or a parser instance.
+            parse_pool (Optional[ParsePool]): Worker processes that parse job detail pages
+                off the fetching threads, in batches. Defaults to one when PARSE_WORKERS is above 1.
+            archive (Optional[PageArchive]): Archive receiving every page fetched from the site.
+                Defaults to one in ARCHIVE_DIR when ARCHIVE_ENABLED is set.
+            replay (Optional[PageArchive]): Archive to read pages from instead of the site.
+                Replayed runs are not throttled.
+            http2 (bool): Send requests over HTTP/2 through httpx.
+            rate_share (float): Share of the request budget this scraper may use, e.g. 1/N for
+                each of N workers of a crawl. requests_per_second and the adaptive throttling
+                bounds (MIN_REQUESTS_PER_SECOND, MAX_REQUESTS_PER_SECOND) are scaled by it.
         """
         self.base_url = base_url
         self.job_url_prefix = JOB_URL_PREFIX
         self.headers = HEADERS
         self.max_jobs = max_jobs
+        self.max_concurrent_requests = max(1, max_concurrent_requests)
         self.jobs: List[JobListing] = []
-        self.session = requests.Session()
+        # Stores and pools created here rather than passed in, closed by close()
+        self._owned: List[Any] = []
+        if cache is None and CACHE_ENABLED:
+            cache = HTTPCache()
+            self._owned.append(cache)
+        self.cache = cache
+        self.replay = replay
+        # One pooled connection per detail request in flight, plus the results page
+        self.session = build_session(max(10, self.max_concurrent_requests + 1), cache=cache, replay=replay, http2=http2)
+        if archive is None and ARCHIVE_ENABLED and replay is None:
+            archive = PageArchive()
+            self._owned.append(archive)
+        self.archive = archive
+        if archive is not None:
+            self.session.hooks["response"].append(archive.record_response)
+        self.requests_per_second = requests_per_second * rate_share
+        if ADAPTIVE_THROTTLING:
+            self.rate_limiter = AdaptiveRateLimiter(
+                self.requests_per_second, RATE_LIMIT_BURST,
+                min_rate=MIN_REQUESTS_PER_SECOND * rate_share, max_rate=MAX_REQUESTS_PER_SECOND * rate_share
+            )
+        else:
+            self.rate_limiter = TokenBucket(self.requests_per_second, RATE_LIMIT_BURST)
+        if seen_index is None and INCREMENTAL:
+            seen_index = SeenIndex()
+            self._owned.append(seen_index)
+        self.seen_index = seen_index
+        self.incremental_stop_after = incremental_stop_after
+        self.parser = get_parser(parser, base_url) if isinstance(parser, str) else parser
+        if parse_pool is None and PARSE_WORKERS > 1:
+            parse_pool = ParsePool(parser=self.parser.name, base_url=base_url)
+            self._owned.append(parse_pool)
+        self.parse_pool = parse_pool
         self.logger = setup_logger()
+        self.client = HttpClient(self.session, self.rate_limiter, timeout=REQUEST_TIMEOUT, logger=self.logger)
 
-    def process_job_elements(self, job_elements: List[BeautifulSoup]) -> None:
-        """Process job elements and add them to the jobs list."""
-        for job in job_elements:
-            if len(self.jobs) >= self.max_jobs:
-                self.logger.info(f"Pasiektas maksimalus skelbimų skaičius ({self.max_jobs})")
-                return
-            job_data = self.extract_job_summary(job)
-            self.jobs.append(JobListing.from_dict(job_data))
-            self.logger.info(f"Surinkta: {job_data['Pavadinimas']}")
-            time.sleep(DELAY_BETWEEN_JOBS)
+    def close(self) -> None:
+        """Close the session and shut down the parse workers, cache, archive and seen index the scraper created."""
+        self.session.close()
+        while self._owned:
+            self._owned.pop().close()
+
+    def __enter__(self) -> 'JobScraper':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
 
     def get_listing_links(self) -> None:
         """Collect exactly MAX_JOBS number of job listings."""
+        self.jobs.extend(self.iter_listings(limit=self.max_jobs - len(self.jobs)))
+
+    def iter_listings(self, limit: Optional[int] = None) -> Iterator[JobListing]:
+        """
+        Yield job summaries as the results pages are loaded.
+
+        Args:
+            limit (Optional[int]): The maximum number of summaries to yield.
+                Defaults to the scraper's max_jobs.
+
+        Listings whose URL was already yielded (e.g. shifted onto the next page
+        while paging) or is already in self.jobs are skipped, so their details
+        are never fetched twice.
+
+        Yields:
+            JobListing: A job listing without details, in results page order.
+        """
+        limit = self.max_jobs if limit is None else limit
+        count = 0
         start = 0
-        while len(self.jobs) < self.max_jobs:
+        unchanged_run = 0
+        failed_pages = 0
+        seen_urls = {job.url for job in self.jobs}
+        while count < limit:
             url = f"{self.base_url}{self.job_url_prefix}" if start == 0 else f"{self.base_url}{self.job_url_prefix}/p{start}"
-            self.logger.info(f"Kraunamas puslapis: {url}")
+            self.logger.info(f"Kraunamas puslapis: {url}", extra=event("results", url=url))
             try:
-                response = self.session.get(url, headers=self.headers, timeout=REQUEST_TIMEOUT)
+                response = self.client.get(url, headers=self.headers, throttle=False)
                 response.raise_for_status()
-                soup = BeautifulSoup(response.text, "html.parser")
-                job_elements = soup.select("div.list > a")
-                if not job_elements:
+                metrics.inc("pages_total", kind="results")
+                with metrics.timer("parse_seconds", page="results"):
+                    summaries = self.parser.parse_listing_page(
+                        response.content, response_charset(response), limit=limit - count
+                    )
+            except requests.RequestException as e:
+                metrics.inc("errors_total", stage="results")
+                if isinstance(e, requests.HTTPError) and getattr(e.response, "status_code", None) == 404:
+                    self.logger.info(f"Puslapis nerastas, puslapiavimas baigiamas: {url}")
                     break
-                self.process_job_elements(job_elements)
+                # Retries are exhausted: skip this page rather than ending the whole run
+                failed_pages += 1
+                self.logger.error(f"Klaida: {e}")
+                if failed_pages > MAX_RETRIES:
+                    self.logger.error(f"Nepavyko įkelti {failed_pages} puslapių iš eilės, puslapiavimas baigiamas")
+                    break
+                start += 20
+                continue
             except Exception as e:
+                metrics.inc("errors_total", stage="results")
                 self.logger.error(f"Klaida: {e}")
                 break
+            failed_pages = 0
+            if not summaries:
+                break
+            new_on_page = 0
+            for job_data in summaries:
+                job = JobListing.from_dict(job_data)
+                if job.url and job.url in seen_urls:
+                    self.logger.info(f"Praleistas pasikartojantis skelbimas: {job.url}", extra=event("job", url=job.url))
+                    continue
+                seen_urls.add(job.url)
+                new_on_page += 1
+                if self.seen_index is not None:
+                    # Checked before yielding: the detail stage records new listings in the index
+                    unchanged_run = unchanged_run + 1 if self.seen_index.is_unchanged(job) else 0
+                count += 1
+                self.logger.info(f"Surinkta: {job_data['Pavadinimas']}", extra=event("job", url=job.url))
+                yield job
+                if unchanged_run >= self.incremental_stop_after:
+                    break
+            if new_on_page == 0:
+                self.logger.info("Puslapyje nėra naujų skelbimų, puslapiavimas baigiamas")
+                break
+            if unchanged_run >= self.incremental_stop_after:
+                self.logger.info(f"Rasta {unchanged_run} jau žinomų skelbimų iš eilės, puslapiavimas baigiamas")
+                break
+            if count >= limit:
+                self.logger.info(f"Pasiektas maksimalus skelbimų skaičius ({limit})")
+                break
             start += 20
-            time.sleep(DELAY_BETWEEN_PAGES)
-        self.logger.info(f"Surinkta iš viso: {len(self.jobs)} skelbimų (tikslinis skaičius: {self.max_jobs})")
+            if self.replay is None and getattr(response, "from_cache", False) is not True:
+                time.sleep(self.page_delay())
+        self.logger.info(f"Surinkta iš viso: {count} skelbimų (tikslinis skaičius: {limit})")
+
+    def page_delay(self) -> float:
+        """
+        Return the pause between results pages.
+
+        DELAY_BETWEEN_PAGES is scaled by how far adaptive throttling has moved
+        the request rate from its starting value.
+
+        Returns:
+            float: Seconds to wait before loading the next results page.
+        """
+        return DELAY_BETWEEN_PAGES * self.requests_per_second / self.rate_limiter.rate
+
+    def iter_jobs(self, max_workers: Optional[int] = None) -> Iterator[JobListing]:
+        """
+        Yield fully enriched job listings while the results pages are still being paged.
+
+        Summaries from iter_listings are fed straight into the detail stage, so
+        detail requests start as soon as the first results page is parsed and
+        only the jobs in flight are held in memory. The yielded jobs are not
+        added to self.jobs.
+
+        Args:
+            max_workers (Optional[int]): The number of detail requests in flight.
+                Defaults to the scraper's max_concurrent_requests.
+
+        Yields:
+            JobListing: A job listing with its details, in results page order.
+        """
+        for job, details in self.fetch_job_details(self.iter_listings(), max_workers):
+            job.details.update(details)
+            yield job
+
+    def work(self, queue: WorkQueue, worker: str = "worker-0", poll_interval: float = 1.0) -> None:
+        """
+        Process tasks from a work queue until the crawl is finished.
+
+        A page task loads one results page, adds a detail task for every new
+        listing and, while fewer than max_jobs listings are queued, the task for
+        the next page. A detail task fetches the job's details and stores them
+        in the queue. Several scrapers, in this or other processes, can work
+        on the same queue; when no task is free but others are still leased,
+        the worker waits for them.
+
+        Args:
+            queue (WorkQueue): The queue to take tasks from.
+            worker (str): This worker's id; a restarted worker with the same id
+                takes back the tasks it held.
+            poll_interval (float): Seconds to wait when no task is free.
+        """
+        while True:
+            task = queue.claim(worker)
+            if task is None:
+                counts = queue.counts()
+                if not counts.get("pending") and not counts.get("leased"):
+                    break
+                time.sleep(poll_interval)
+                continue
+            if task.kind == PAGE:
+                self._work_page(queue, task)
+            else:
+                self._work_detail(queue, task)
+        self.logger.info(f"Darbuotojas {worker} baigė darbą: {queue.counts()}")
+
+    def _work_page(self, queue: WorkQueue, task: Task) -> None:
+        """Load a results page task, queueing its listings and the next page."""
+        start = int(task.key)
+        url = f"{self.base_url}{self.job_url_prefix}" if start == 0 else f"{self.base_url}{self.job_url_prefix}/p{start}"
+        self.logger.info(f"Kraunamas puslapis: {url}", extra=event("results", url=url))
+        try:
+            response = self.client.get(url, headers=self.headers, throttle=self._needs_throttle(url))
+            if response.status_code == 404:
+                self.logger.info(f"Puslapis nerastas, puslapiavimas baigiamas: {url}")
+                queue.complete(task)
+                return
+            response.raise_for_status()
+            metrics.inc("pages_total", kind="results")
+            remaining = self.max_jobs - queue.total(DETAIL)
+            with metrics.timer("parse_seconds", page="results"):
+                summaries = self.parser.parse_listing_page(
+                    response.content, response_charset(response), limit=remaining
+                ) if remaining > 0 else []
+        except Exception as e:
+            metrics.inc("errors_total", stage="results")
+            self.logger.error(f"Klaida: {e}")
+            queue.fail(task, str(e))
+            return
+        new_on_page = 0
+        for job_data in summaries:
+            if queue.add(DETAIL, job_data["Nuoroda"], job_data):
+                new_on_page += 1
+                self.logger.info(f"Surinkta: {job_data['Pavadinimas']}", extra=event("job", url=job_data["Nuoroda"]))
+            else:
+                self.logger.info(f"Praleistas pasikartojantis skelbimas: {job_data['Nuoroda']}",
+                                 extra=event("job", url=job_data["Nuoroda"]))
+        if new_on_page and queue.total(DETAIL) < self.max_jobs:
+            queue.add(PAGE, str(start + 20))
+        elif summaries and not new_on_page:
+            self.logger.info("Puslapyje nėra naujų skelbimų, puslapiavimas baigiamas")
+        queue.complete(task)
+
+    def _work_detail(self, queue: WorkQueue, task: Task) -> None:
+        """Fetch a detail task's job details into the queue."""
+        job = JobListing.from_dict(task.payload)
+        self.logger.info(f"🔍 Tikrinama: {job.url}", extra=event("detail", url=job.url))
+        details = self._fetch_job_details(job)
+        if "Klaida" in details and task.attempts + 1 < queue.max_attempts:
+            queue.fail(task, details["Klaida"])
+        else:
+            # After the last attempt the job is kept with its error, as outside the queue
+            queue.complete(task, details)
 
     def extract_job_summary(self, job: BeautifulSoup) -> Dict[str, str]:
         """
@@ -81,29 +353,156 @@ class JobScraper:
         Returns:
             Dict[str, str]: A dictionary containing the job summary.
         """
-        title = job.select_one(".title strong")
-        company = job.select_one(".company")
-        location = job.select_one(".location")
-        date = job.select_one(".created-date")
-        salary = job.select_one(".salary")
-        link = job.get("href")
-        full_url = self.base_url + link
-        return {
-            "Pavadinimas": title.text.strip() if title else "–",
-            "Įmonė": company.text.strip() if company else "–",
-            "Vieta": location.text.strip() if location else "–",
-            "Paskelbta": date.text.strip().replace("Įkelta: ", "") if date else "–",
-            "Atlyginimas": salary.text.strip() if salary else "–",
-            "Nuoroda": full_url
-        }
-
-    def enrich_job_details(self) -> None:
-        """Enrich job listings with additional details."""
-        for i, job in enumerate(self.jobs):
-            self.logger.info(f"🔍 {i + 1}/{len(self.jobs)} Tikrinama: {job.url}")
-            details = self.scrape_job_details(job.url)
+        return extract_job_summary(job, self.base_url)
+
+    def enrich_job_details(self, max_workers: Optional[int] = None) -> None:
+        """
+        Enrich job listings with additional details.
+
+        Args:
+            max_workers (Optional[int]): The number of detail requests in flight.
+                Defaults to the scraper's max_concurrent_requests.
+        """
+        total = len(self.jobs)
+        for i, (job, details) in enumerate(self.fetch_job_details(self.jobs, max_workers)):
+            self.logger.info(f"🔍 {i + 1}/{total} Tikrinama: {job.url}", extra=event("detail", url=job.url))
             job.details.update(details)
-            time.sleep(DELAY_BETWEEN_JOBS)
+
+    def fetch_job_details(
+        self,
+        jobs: Iterable[JobListing],
+        max_workers: Optional[int] = None
+    ) -> Iterator[Tuple[JobListing, Dict[str, str]]]:
+        """
+        Fetch job details, yielding results in the order of the input jobs.
+
+        Requests go through the scraper's rate limiter. With more than one
+        worker they run on a thread pool sharing the scraper's session, and at
+        most twice as many jobs as workers are taken from the input ahead of
+        the job being yielded. With a parse pool, the fetched pages are parsed
+        in batches of its batch_size on the worker processes while the next
+        pages are fetched; otherwise each page is parsed on the thread that
+        fetched it.
+
+        Args:
+            jobs (Iterable[JobListing]): The jobs to fetch details for.
+            max_workers (Optional[int]): The number of requests in flight.
+                Defaults to the scraper's max_concurrent_requests.
+
+        Yields:
+            Tuple[JobListing, Dict[str, str]]: Each job with its scraped details.
+        """
+        workers = max_workers or self.max_concurrent_requests
+        if self.parse_pool is not None and self.parse_pool.workers > 1:
+            yield from self._parse_in_batches(self._ordered_map(self._fetch_job_page, jobs, workers))
+        else:
+            yield from self._ordered_map(self._fetch_job_details, jobs, workers)
+
+    @staticmethod
+    def _ordered_map(func: Callable[[JobListing], Any], jobs: Iterable[JobListing],
+                     workers: int) -> Iterator[Tuple[JobListing, Any]]:
+        """Apply func to jobs on a thread pool of workers, yielding each job with its result in input order."""
+        if workers <= 1:
+            for job in jobs:
+                yield job, func(job)
+            return
+
+        pending = deque()
+        executor = ThreadPoolExecutor(max_workers=workers)
+        try:
+            for job in jobs:
+                pending.append((job, executor.submit(func, job)))
+                if len(pending) >= workers * 2:
+                    done_job, future = pending.popleft()
+                    yield done_job, future.result()
+            while pending:
+                done_job, future = pending.popleft()
+                yield done_job, future.result()
+        finally:
+            for _, future in pending:
+                future.cancel()
+            executor.shutdown(wait=True)
+
+    def _parse_in_batches(
+        self,
+        fetched: Iterator[Tuple[JobListing, Union[Dict[str, str], Tuple[bytes, str]]]]
+    ) -> Iterator[Tuple[JobListing, Dict[str, str]]]:
+        """Parse fetched pages on the parse pool, one batch per call, keeping at most one batch per worker in flight."""
+        pending: deque = deque()
+        batch: List[Tuple[JobListing, Union[Dict[str, str], Tuple[bytes, str]]]] = []
+        try:
+            for item in fetched:
+                batch.append(item)
+                if len(batch) >= self.parse_pool.batch_size:
+                    pending.append(self._submit_batch(batch))
+                    batch = []
+                    while pending and (len(pending) > self.parse_pool.workers
+                                       or pending[0][1] is None or pending[0][1].done()):
+                        yield from self._finish_batch(*pending.popleft())
+            if batch:
+                pending.append(self._submit_batch(batch))
+            while pending:
+                yield from self._finish_batch(*pending.popleft())
+        finally:
+            for _, future in pending:
+                if future is not None:
+                    future.cancel()
+
+    def _submit_batch(self, batch: list) -> Tuple[list, Optional[Future]]:
+        """Send the pages of a batch to the parse pool; jobs answered without a page need no parsing."""
+        bodies = [fetched for _, fetched in batch if isinstance(fetched, tuple)]
+        return batch, self.parse_pool.submit_details(bodies) if bodies else None
+
+    def _finish_batch(self, batch: list, future: Optional[Future]) -> Iterator[Tuple[JobListing, Dict[str, str]]]:
+        """Yield the jobs of a batch with their details, recording new ones in the seen index."""
+        parsed = None
+        if future is not None:
+            try:
+                parsed = iter(future.result())
+            except Exception as e:
+                # One page that fails to parse fails its batch: parse the batch here, page by page
+                self.logger.warning(f"Nepavyko išanalizuoti puslapių paketo: {e}")
+        for job, fetched in batch:
+            if not isinstance(fetched, tuple):
+                yield job, fetched
+                continue
+            details = next(parsed) if parsed is not None else self._parse_detail_page(job.url, *fetched)
+            if self.seen_index is not None and "Klaida" not in details:
+                self.seen_index.record(job, details)
+            yield job, details
+
+    def _stored_details(self, job: JobListing) -> Optional[Dict[str, str]]:
+        """Return the details of an unchanged listing from the seen index, or None."""
+        if self.seen_index is None:
+            return None
+        stored = self.seen_index.unchanged_details(job)
+        if stored is not None:
+            metrics.inc("seen_index_hits_total")
+        return stored
+
+    def _fetch_job_details(self, job: JobListing) -> Dict[str, str]:
+        """Return a job's details, reusing the seen index for unchanged listings."""
+        stored = self._stored_details(job)
+        if stored is not None:
+            return stored
+        details = self.scrape_job_details(job.url)
+        if self.seen_index is not None and "Klaida" not in details:
+            self.seen_index.record(job, details)
+        return details
+
+    def _fetch_job_page(self, job: JobListing) -> Union[Dict[str, str], Tuple[bytes, str]]:
+        """Return a job's page body and charset to parse, or its details when they are stored or the fetch failed."""
+        stored = self._stored_details(job)
+        if stored is not None:
+            return stored
+        try:
+            return self._get_detail_page(job.url)
+        except Exception as e:
+            return self._detail_error(job.url, e)
+
+    def _needs_throttle(self, url: str) -> bool:
+        """Whether fetching a URL reaches the site, so it must go through the rate limiter."""
+        return self.replay is None and (self.cache is None or not self.cache.has_fresh(url))
 
     def scrape_job_details(self, url: str) -> Dict[str, str]:
         """
@@ -115,29 +514,32 @@ class JobScraper:
         Returns:
             Dict[str, str]: A dictionary containing the job details.
         """
-        results = {}
         try:
-            r = self.session.get(url, headers=self.headers, timeout=REQUEST_TIMEOUT)
-            r.encoding = 'utf-8'
-            tree = html.fromstring(r.text)
-            for idx in [1, 2]:
-                blocks = tree.xpath(f'//main//div[contains(@class, "meta__list")]//div[{idx}]')
-                if blocks:
-                    block = blocks[0]
-                    sections = block.xpath('./h4')
-                    for i, h4 in enumerate(sections):
-                        title_el = h4.xpath('./strong/text()')
-                        title = title_el[0].strip().rstrip(":") if title_el else f"Skyrius {i+1}"
-                        content = []
-                        next_el = h4.getnext()
-                        while next_el is not None and next_el.tag != 'h4':
-                            content.extend(t.strip() for t in next_el.xpath('.//text()') if t.strip())
-                            next_el = next_el.getnext()
-                        results[title] = '; '.join(content) if content else "–"
+            content, encoding = self._get_detail_page(url)
         except Exception as e:
-            self.logger.error(f"Klaida scraping details: {e}")
-            results["Klaida"] = str(e)
-        return results
+            return self._detail_error(url, e)
+        return self._parse_detail_page(url, content, encoding)
+
+    def _get_detail_page(self, url: str) -> Tuple[bytes, str]:
+        """Fetch a job page, returning its body bytes and the charset its response declares."""
+        r = self.client.get(url, headers=self.headers, throttle=self._needs_throttle(url))
+        r.raise_for_status()
+        metrics.inc("pages_total", kind="detail")
+        return r.content, response_charset(r)
+
+    def _parse_detail_page(self, url: str, content: bytes, encoding: str) -> Dict[str, str]:
+        """Parse a job page in this process, straight from its body bytes."""
+        try:
+            with metrics.timer("parse_seconds", page="detail"):
+                return self.parser.parse_detail_page(content, encoding)
+        except Exception as e:
+            return self._detail_error(url, e)
+
+    def _detail_error(self, url: str, error: Exception) -> Dict[str, str]:
+        """Count and log a failed job page, returning the details recorded for it."""
+        metrics.inc("errors_total", stage="detail")
+        self.logger.error(f"Klaida scraping details: {error}", extra=event("detail", url=url))
+        return {"Klaida": str(error)}
 
     def save_to_excel(self, filename: str = OUTPUT_FILENAME) -> None:
         """
@@ -146,6 +548,4 @@ class JobScraper:
         Args:
             filename (str): The name of the Excel file to save to.
         """
-        df = pd.DataFrame(self.jobs)
-        df.to_excel(filename, index=False)
-        print(f"✅ Išsaugota į: {filename}") 
\ No newline at end of file
+        ExcelStorage(filename).save(self.jobs) 
\ No newline at end of file
@@ -1,50 +1,527 @@
+import csv
+import json
+import os
+import re
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
 from .models import JobListing
+from .table import JobTable
+from .config import (
+    PARQUET_DIR,
+    SIMILARITY_CHUNK_CELLS,
+    SIMILARITY_INDEX_DIR,
+    SIMILARITY_REFIT_FRACTION,
+    SIMILARITY_REFIT_NEW_TERMS
+)
+from .metrics import metrics
 import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+from scipy import sparse
+
+# scikit-learn is imported by the methods that fit vectorizers, so querying a
+# saved SimilarityIndex does not pay for importing it.
+
+# Tokens as matched by TfidfVectorizer's default token_pattern on lowercased text
+TOKEN_PATTERN = re.compile(r"(?u)\b\w\w+\b")
+
+
+def job_text(job) -> str:
+    """Convert a reference job dict or a JobListing into a text string for vectorization."""
+    if isinstance(job, dict):
+        # For reference job (dictionary)
+        title = job.get('Darbo pobūdis', '')
+        location = job.get('Darbo vieta (miestas)', '')
+        salary = job.get('Pageidaujamas atlyginimas', '')
+        experience = job.get('Turima patirtis', '')
+        description = job.get('Darbo aprašymas', '')
+    else:
+        # For JobListing objects
+        title = job.title
+        location = job.location
+        salary = str(job.salary) if job.salary else ''
+        experience = job.details.get('Turima patirtis', '')
+        description = job.details.get('Darbo aprašymas', '')
+    return format_text(title, location, salary, experience, description)
+
+
+def format_text(title: str, location: str, salary: str, experience: str, description: str) -> str:
+    """Join the fields used for vectorization into one text string."""
+    # Repeat the title multiple times to give it more weight in TF-IDF
+    # This makes the profession match more important than vague terms
+    return f"{title} {title} {title} {location} {salary} {experience} {description}"
+
+
+def _iter_fields(jobs: Union[Iterable[JobListing], JobTable]) -> Iterator[tuple]:
+    """Yield (title, company, location, posted_date, salary, url, experience, description) per job."""
+    if isinstance(jobs, JobTable):
+        # Read whole columns instead of creating a JobListing per row
+        columns = [jobs.column(name) for name in ('title', 'company', 'location', 'posted_date', 'salary', 'url')]
+        columns += [jobs.detail_column('Turima patirtis'), jobs.detail_column('Darbo aprašymas')]
+        yield from zip(*columns)
+        return
+    for job in jobs:
+        yield (job.title, job.company, job.location, job.posted_date, job.salary, job.url,
+               job.details.get('Turima patirtis', ''), job.details.get('Darbo aprašymas', ''))
+
+
+def tokenize(text: str) -> str:
+    """Return a text's tokens as TfidfVectorizer would find them, lowercased and joined by spaces."""
+    return ' '.join(TOKEN_PATTERN.findall(text.lower()))
+
+
+def count_terms(texts: Iterable[str], vocabulary: Dict[str, int], tokenized: bool = False) -> sparse.csr_matrix:
+    """
+    Count the vocabulary terms of each text, as CountVectorizer(vocabulary=vocabulary).transform would.
+
+    Args:
+        texts (Iterable[str]): The texts
+        vocabulary (Dict[str, int]): Column of every term
+        tokenized (bool): Whether the texts were built with tokenize, so they are split on spaces
+            instead of being matched against TOKEN_PATTERN
+
+    Returns:
+        sparse.csr_matrix: Term counts, one row per text
+    """
+    indptr, indices, data = [0], [], []
+    for text in texts:
+        counts: Dict[int, int] = {}
+        for token in (text.split() if tokenized else TOKEN_PATTERN.findall(text.lower())):
+            column = vocabulary.get(token)
+            if column is not None:
+                counts[column] = counts.get(column, 0) + 1
+        indices.extend(counts)
+        data.extend(counts.values())
+        indptr.append(len(indices))
+    matrix = sparse.csr_matrix(
+        (np.array(data, dtype=np.int64), np.array(indices, dtype=np.int64), np.array(indptr, dtype=np.int64)),
+        shape=(len(indptr) - 1, len(vocabulary))
+    )
+    matrix.sort_indices()
+    return matrix
+
+
+def l2_normalize(matrix: sparse.csr_matrix) -> sparse.csr_matrix:
+    """Scale every row to unit length, leaving empty rows as they are."""
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    norms[norms == 0] = 1
+    return (sparse.diags(1 / norms) @ matrix).tocsr()
+
+
+def top_k_rows(queries: sparse.csr_matrix, documents: sparse.csr_matrix, k: int,
+               chunk_cells: int = SIMILARITY_CHUNK_CELLS) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Find the k most similar documents for every query row.
+
+    Scores are computed as one sparse matrix product per chunk of queries,
+    with as many queries per chunk as fit in chunk_cells dense scores.
+
+    Args:
+        queries (sparse.csr_matrix): L2-normalized query rows
+        documents (sparse.csr_matrix): L2-normalized document rows over the same vocabulary
+        k (int): The number of documents to keep per query
+        chunk_cells (int): Upper bound on the query x document scores held in memory at once
+
+    Yields:
+        Tuple[np.ndarray, np.ndarray]: Document rows and scores for each query, most similar first
+    """
+    k = min(k, documents.shape[0])
+    chunk_rows = max(1, chunk_cells // max(documents.shape[0], 1))
+    transposed = documents.T.tocsr()
+    for start in range(0, queries.shape[0], chunk_rows):
+        chunk = queries[start:start + chunk_rows]
+        if k <= 0:
+            for _ in range(chunk.shape[0]):
+                yield np.array([], dtype=np.int64), np.array([])
+            continue
+        scores = (chunk @ transposed).toarray()
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        order = np.argsort(-top_scores, axis=1, kind='stable')
+        top = np.take_along_axis(top, order, axis=1)
+        top_scores = np.take_along_axis(top_scores, order, axis=1)
+        for rows, row_scores in zip(top, top_scores):
+            yield rows, row_scores
+
+
+def save_rankings(path: str, rankings: Dict[str, List[Tuple[JobListing, float]]]) -> None:
+    """
+    Write the rankings of several profiles to one CSV file.
+
+    Args:
+        path (str): The CSV file to write
+        rankings (Dict[str, List[Tuple[JobListing, float]]]): Ranked jobs and scores per profile name
+    """
+    with open(path, 'w', newline='', encoding='utf-8') as csvfile:
+        writer = csv.writer(csvfile)
+        writer.writerow(['Profile', 'Rank', 'Title', 'Location', 'Salary', 'Similarity'])
+        for profile, ranked in rankings.items():
+            for rank, (job, score) in enumerate(ranked, 1):
+                writer.writerow([profile, rank, job.title, job.location, job.salary, f"{score:.4f}"])
+
 
 class SimilarityAnalyzer:
     """Class for analyzing similarity between job listings."""
 
+    # JobListing fields used by vectorize_job
+    FIELDS = ['title', 'location', 'salary', 'url', 'details']
+
     def __init__(self):
+        from sklearn.feature_extraction.text import TfidfVectorizer
         self.vectorizer = TfidfVectorizer()
 
+    @classmethod
+    def load_jobs(cls, directory: str = PARQUET_DIR):
+        """Load stored job listings from a Parquet dataset, reading only the fields used for similarity."""
+        from .storage import ParquetStorage
+        return ParquetStorage.load_jobs(directory, cls.FIELDS)
+
     def vectorize_job(self, job):
         """Convert job data into a text string for vectorization."""
-        if isinstance(job, dict):
-            # For reference job (dictionary)
-            title = job.get('Darbo pobūdis', '')
-            location = job.get('Darbo vieta (miestas)', '')
-            salary = job.get('Pageidaujamas atlyginimas', '')
-            experience = job.get('Turima patirtis', '')
-            description = job.get('Darbo aprašymas', '')
-        else:
-            # For JobListing objects
-            title = job.title
-            location = job.location
-            salary = str(job.salary) if job.salary else ''
-            experience = job.details.get('Turima patirtis', '')
-            description = job.details.get('Darbo aprašymas', '')
-
-        # Repeat the title multiple times to give it more weight in TF-IDF
-        # This makes the profession match more important than vague terms
-        return f"{title} {title} {title} {location} {salary} {experience} {description}"
+        return job_text(job)
 
+    @metrics.timed("similarity_seconds", stage="compute")
     def compute_similarity(self, reference_job, offered_jobs):
         """Compute similarity between reference job and offered jobs."""
         reference_text = self.vectorize_job(reference_job)
         offered_texts = [self.vectorize_job(job) for job in offered_jobs]
         all_texts = [reference_text] + offered_texts
         tfidf_matrix = self.vectorizer.fit_transform(all_texts)
-        similarity_scores = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:])
-        # Debug print statements
-        print("\nVectorized Reference Job Text:")
-        print(reference_text)
-        print("\nVectorized Offered Job Texts:")
-        for i, text in enumerate(offered_texts):
-            print(f"Job {i+1}: {text}")
-        print("\nSimilarity Scores:")
-        for i, score in enumerate(similarity_scores[0]):
-            print(f"Job {i+1}: {score:.4f}")
+        # Rows are L2-normalized, so the dot product is the cosine similarity
+        similarity_scores = (tfidf_matrix[1:] @ tfidf_matrix[0:1].T).toarray().ravel()
         # Return offered jobs with their similarity scores, sorted by similarity in descending order
-        return sorted([(offered_jobs[i], similarity_scores[0][i]) for i in range(len(offered_jobs))], key=lambda x: x[1], reverse=True) 
\ No newline at end of file
+        order = np.argsort(-similarity_scores, kind='stable')
+        return [(offered_jobs[i], similarity_scores[i]) for i in order]
+
+    @metrics.timed("similarity_seconds", stage="rank_profiles")
+    def rank_profiles(self, profiles: Dict[str, dict], offered_jobs: Sequence[JobListing],
+                      k: int = 10) -> Dict[str, List[Tuple[JobListing, float]]]:
+        """
+        Find the k offered jobs most similar to each of many reference profiles.
+
+        The vectorizer is fitted on the offered jobs once and every profile is
+        transformed with it, so the cost of vectorizing the jobs is shared by
+        all profiles. Unlike compute_similarity, the profiles do not take part
+        in the fit, so scores can differ slightly from it.
+
+        Args:
+            profiles (Dict[str, dict]): Reference profiles by name, laid out like REFERENCE_JOB
+            offered_jobs (Sequence[JobListing]): The jobs to rank
+            k (int): The number of jobs to keep per profile
+
+        Returns:
+            Dict[str, List[Tuple[JobListing, float]]]: Ranked jobs and scores per profile name, most similar first
+        """
+        if not offered_jobs:
+            return {name: [] for name in profiles}
+        documents = self.vectorizer.fit_transform([self.vectorize_job(job) for job in offered_jobs])
+        queries = self.vectorizer.transform([self.vectorize_job(profile) for profile in profiles.values()])
+        return {
+            name: [(offered_jobs[row], float(score)) for row, score in zip(rows, scores)]
+            for name, (rows, scores) in zip(profiles, top_k_rows(queries, documents, k))
+        }
+
+
+class SimilarityIndex:
+    """
+    TF-IDF index of job listings that is fitted once, persisted and queried for the most similar jobs.
+
+    The vocabulary and IDF weights are learned by the first fit. Jobs added
+    later are transformed with them without refitting, and their terms
+    missing from the vocabulary are ignored. add() refits on every indexed
+    document once the jobs added since the last fit reach refit_fraction of
+    the index, or, if refit_new_terms is set, once added jobs bring that many
+    unknown terms; refit() does so on demand. Documents are stored as L2-normalized rows of a sparse
+    matrix, which makes the cosine similarity of a query a single sparse
+    matrix-vector product over the columns of the query's terms.
+
+    On disk the index is a directory with:
+        vocabulary.json: the vocabulary and IDF weights
+        matrix.npz: the document matrix
+        documents.jsonl: one line per document with the job fields and the indexed text
+    """
+
+    def __init__(self, directory: Optional[str] = SIMILARITY_INDEX_DIR,
+                 refit_new_terms: int = SIMILARITY_REFIT_NEW_TERMS,
+                 refit_fraction: float = SIMILARITY_REFIT_FRACTION) -> None:
+        """
+        Initialize the SimilarityIndex, loading it from disk if it was saved before.
+
+        Args:
+            directory (Optional[str]): Directory the index is saved to, or None for an in-memory index
+            refit_new_terms (int): Unknown terms in the added jobs from which add() refits, or 0 to never refit for them
+            refit_fraction (float): Share of the index added since the last fit from which add() refits, or 0
+        """
+        self.directory = directory
+        self.refit_new_terms = refit_new_terms
+        self.refit_fraction = refit_fraction
+        # Number of documents the vocabulary and IDF weights were learned from
+        self.fitted_documents = 0
+        self.vocabulary: Dict[str, int] = {}
+        self.idf = np.zeros(0)
+        self.documents: List[dict] = []
+        self._urls = set()
+        self._blocks: List[sparse.csr_matrix] = []
+        self._matrix: Optional[sparse.csr_matrix] = None
+        self._columns: Optional[sparse.csc_matrix] = None
+        self._saved_documents = 0
+        if directory and os.path.exists(os.path.join(directory, 'vocabulary.json')):
+            self._load()
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    @property
+    def fitted(self) -> bool:
+        """Whether the vocabulary and IDF weights have been learned."""
+        return bool(self.vocabulary)
+
+    @property
+    def matrix(self) -> sparse.csr_matrix:
+        """The L2-normalized document matrix, one row per document."""
+        if self._blocks:
+            blocks = ([self._matrix] if self._matrix is not None else []) + self._blocks
+            self._matrix = sparse.vstack(blocks, format='csr')
+            self._blocks = []
+            self._columns = None
+        if self._matrix is None:
+            self._matrix = sparse.csr_matrix((0, len(self.vocabulary)))
+        return self._matrix
+
+    def _set_vocabulary(self, vocabulary: Dict[str, int], idf: np.ndarray) -> None:
+        self.vocabulary = vocabulary
+        self.idf = np.asarray(idf, dtype=float)
+
+    def transform(self, texts: List[str], tokenized: bool = False) -> sparse.csr_matrix:
+        """
+        Vectorize texts with the fitted vocabulary and IDF weights.
+
+        Args:
+            texts (List[str]): Texts built with job_text
+            tokenized (bool): Whether the texts were already passed through tokenize
+
+        Returns:
+            sparse.csr_matrix: L2-normalized TF-IDF rows, as TfidfVectorizer.transform would produce
+        """
+        return l2_normalize(count_terms(texts, self.vocabulary, tokenized) @ sparse.diags(self.idf))
+
+    @metrics.timed("similarity_seconds", stage="fit")
+    def fit(self, jobs: Union[Iterable[JobListing], JobTable], features: Optional[Dict[str, np.ndarray]] = None) -> None:
+        """
+        Learn the vocabulary and IDF weights from jobs and index them, replacing the current contents.
+
+        Args:
+            jobs (Union[Iterable[JobListing], JobTable]): The jobs to index
+            features (Optional[Dict[str, np.ndarray]]): Feature columns aligned with the jobs, as
+                returned by FeatureStore.load; their tokens are indexed instead of re-tokenizing the jobs
+        """
+        self.documents = []
+        self._urls = set()
+        self._add_documents(jobs, features)
+        self._fit_documents()
+
+    @metrics.timed("similarity_seconds", stage="fit")
+    def refit(self) -> None:
+        """Relearn the vocabulary and IDF weights from every indexed document, e.g. after many additions."""
+        self._fit_documents()
+
+    def _fit_documents(self) -> None:
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        vectorizer = TfidfVectorizer()
+        matrix = vectorizer.fit_transform([document['text'] for document in self.documents])
+        self._set_vocabulary({term: int(column) for term, column in vectorizer.vocabulary_.items()}, vectorizer.idf_)
+        self._matrix = matrix.tocsr()
+        self._blocks = []
+        self._columns = None
+        self._saved_documents = 0
+        self.fitted_documents = len(self.documents)
+
+    def _add_documents(self, jobs: Union[Iterable[JobListing], JobTable],
+                       features: Optional[Dict[str, np.ndarray]] = None) -> List[str]:
+        texts = []
+        # Tokenized text yields the same terms as the text it came from, so documents of both
+        # kinds are transformed and refitted alike
+        tokens = features['tokens'] if features is not None else None
+        for row, fields in enumerate(_iter_fields(jobs)):
+            title, company, location, posted_date, salary, url, experience, description = fields
+            if url in self._urls:
+                continue
+            self._urls.add(url)
+            if tokens is not None and tokens[row] is not None:
+                text = tokens[row]
+            else:
+                text = format_text(title, location, str(salary) if salary else '', experience, description)
+                if tokens is not None:
+                    text = tokenize(text)
+            self.documents.append({
+                'title': title,
+                'company': company,
+                'location': location,
+                'posted_date': posted_date,
+                'salary': salary,
+                'url': url,
+                'text': text
+            })
+            texts.append(text)
+        return texts
+
+    @metrics.timed("similarity_seconds", stage="add")
+    def add(self, jobs: Union[Iterable[JobListing], JobTable], features: Optional[Dict[str, np.ndarray]] = None) -> int:
+        """
+        Index jobs that are not in the index yet, matched by URL.
+
+        The first call on an empty index fits the vocabulary and IDF weights,
+        and so does a call whose jobs need a refit (see needs_refit).
+
+        Args:
+            jobs (Union[Iterable[JobListing], JobTable]): The jobs to add
+            features (Optional[Dict[str, np.ndarray]]): Feature columns aligned with the jobs, as
+                returned by FeatureStore.load; their tokens are indexed instead of re-tokenizing the jobs
+
+        Returns:
+            int: The number of jobs added
+        """
+        if not self.fitted:
+            before = len(self.documents)
+            self._add_documents(jobs, features)
+            if self.documents:
+                self._fit_documents()
+            return len(self.documents) - before
+        texts = self._add_documents(jobs, features)
+        if not texts:
+            return 0
+        if self.needs_refit(texts, tokenized=features is not None):
+            metrics.inc("similarity_refits_total")
+            self._fit_documents()
+        else:
+            self._blocks.append(self.transform(texts, tokenized=features is not None))
+        return len(texts)
+
+    def needs_refit(self, texts: List[str], tokenized: bool = False) -> bool:
+        """
+        Whether newly indexed texts call for relearning the vocabulary and IDF weights.
+
+        Args:
+            texts (List[str]): The texts of the documents just added to self.documents
+            tokenized (bool): Whether the texts were already passed through tokenize
+
+        Returns:
+            bool: True if they bring at least refit_new_terms unknown terms, or if the
+            documents added since the last fit reach refit_fraction of the index
+        """
+        if self.refit_fraction and len(self.documents) - self.fitted_documents >= self.refit_fraction * len(self.documents):
+            return True
+        if not self.refit_new_terms:
+            return False
+        unknown = set()
+        for text in texts:
+            for token in (text.split() if tokenized else TOKEN_PATTERN.findall(text.lower())):
+                if token not in self.vocabulary:
+                    unknown.add(token)
+                    if len(unknown) >= self.refit_new_terms:
+                        return True
+        return False
+
+    def job(self, row: int) -> JobListing:
+        """Return the indexed job at a matrix row, without its details."""
+        document = self.documents[row]
+        return JobListing(
+            document['title'], document['company'], document['location'],
+            document['posted_date'], document['salary'], document['url'], {}
+        )
+
+    def scores(self, reference) -> np.ndarray:
+        """
+        Compute the cosine similarity of a reference job to every indexed job.
+
+        Args:
+            reference: A reference job dict (like REFERENCE_JOB) or a JobListing
+
+        Returns:
+            np.ndarray: One score per indexed job, in matrix row order
+        """
+        query = self.transform([job_text(reference)])
+        if self._columns is None or self._blocks:
+            self._columns = self.matrix.tocsc()
+        # Only the columns of terms present in the query contribute to the dot product
+        return self._columns[:, query.indices] @ query.data
+
+    @metrics.timed("similarity_seconds", stage="top_k")
+    def top_k(self, reference, k: int = 10) -> List[Tuple[JobListing, float]]:
+        """
+        Find the indexed jobs most similar to a reference job.
+
+        Args:
+            reference: A reference job dict (like REFERENCE_JOB) or a JobListing
+            k (int): The number of jobs to return
+
+        Returns:
+            List[Tuple[JobListing, float]]: Jobs and their similarity scores, most similar first
+        """
+        if not self.fitted or not self.documents:
+            return []
+        scores = self.scores(reference)
+        k = min(k, len(scores))
+        if k <= 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind='stable')]
+        return [(self.job(row), float(scores[row])) for row in top]
+
+    @metrics.timed("similarity_seconds", stage="rank_profiles")
+    def rank_profiles(self, profiles: Dict[str, dict], k: int = 10,
+                      chunk_cells: int = SIMILARITY_CHUNK_CELLS,
+                      urls: Optional[Iterable[str]] = None) -> Dict[str, List[Tuple[JobListing, float]]]:
+        """
+        Find the indexed jobs most similar to each of many reference profiles.
+
+        Args:
+            profiles (Dict[str, dict]): Reference profiles by name, laid out like REFERENCE_JOB
+            k (int): The number of jobs to keep per profile
+            chunk_cells (int): Upper bound on the profile x job scores held in memory at once
+            urls (Optional[Iterable[str]]): Only rank the indexed jobs with these URLs,
+                e.g. those of the current run. Defaults to every indexed job.
+
+        Returns:
+            Dict[str, List[Tuple[JobListing, float]]]: Ranked jobs and scores per profile name, most similar first
+        """
+        if not self.fitted or not self.documents:
+            return {name: [] for name in profiles}
+        matrix = self.matrix
+        if urls is not None:
+            wanted = set(urls)
+            selected = np.array([row for row, document in enumerate(self.documents) if document['url'] in wanted],
+                                dtype=np.int64)
+            matrix = matrix[selected]
+        queries = self.transform([job_text(profile) for profile in profiles.values()])
+        return {
+            name: [(self.job(row if urls is None else selected[row]), float(score)) for row, score in zip(rows, scores)]
+            for name, (rows, scores) in zip(profiles, top_k_rows(queries, matrix, k, chunk_cells))
+        }
+
+    @metrics.timed("similarity_seconds", stage="save")
+    def save(self) -> None:
+        """Write the index to its directory; documents added since the last save are appended."""
+        os.makedirs(self.directory, exist_ok=True)
+        mode = 'a' if self._saved_documents else 'w'
+        with open(os.path.join(self.directory, 'documents.jsonl'), mode, encoding='utf-8') as f:
+            for document in self.documents[self._saved_documents:]:
+                f.write(json.dumps(document, ensure_ascii=False) + '\n')
+        self._saved_documents = len(self.documents)
+        sparse.save_npz(os.path.join(self.directory, 'matrix.npz'), self.matrix, compressed=False)
+        with open(os.path.join(self.directory, 'vocabulary.json'), 'w', encoding='utf-8') as f:
+            json.dump({'vocabulary': self.vocabulary, 'idf': self.idf.tolist(), 'documents': self.fitted_documents},
+                      f, ensure_ascii=False)
+
+    def _load(self) -> None:
+        with open(os.path.join(self.directory, 'vocabulary.json'), encoding='utf-8') as f:
+            data = json.load(f)
+        self._set_vocabulary(data['vocabulary'], data['idf'])
+        self._matrix = sparse.load_npz(os.path.join(self.directory, 'matrix.npz')).tocsr()
+        self.fitted_documents = data.get('documents', self._matrix.shape[0])
+        with open(os.path.join(self.directory, 'documents.jsonl'), encoding='utf-8') as f:
+            self.documents = [json.loads(line) for line in f]
+        # Drop documents whose row did not make it into the last saved matrix,
+        # and rewrite the documents file on the next save if there were any
+        saved = len(self.documents) == self._matrix.shape[0]
+        del self.documents[self._matrix.shape[0]:]
+        self._urls = {document['url'] for document in self.documents}
+        self._saved_documents = len(self.documents) if saved else 0
@@ -0,0 +1,239 @@
+"""
+Streaming, mergeable statistics for salary data that does not fit in memory.
+"""
+import math
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+
+from .config import SKETCH_RELATIVE_ACCURACY
+
+
+class QuantileSketch:
+    """
+    Quantile sketch with a relative error guarantee (DDSketch).
+
+    Values are counted in logarithmically sized buckets: a positive value x
+    goes to bucket ceil(log_gamma(x)) with gamma = (1 + alpha) / (1 - alpha).
+    Every value in a bucket is within relative error alpha of the bucket's
+    representative, so the quantile estimate for any rank is within
+    alpha * |x| of the true sample value x at that rank. Bucket counts add up,
+    which makes sketches mergeable and independent of the insertion order.
+    Negative values use a mirrored set of buckets and values whose magnitude
+    is below min_value are counted as zero.
+    """
+
+    def __init__(self, relative_accuracy: float = SKETCH_RELATIVE_ACCURACY, min_value: float = 1e-9) -> None:
+        """
+        Initialize the QuantileSketch.
+
+        Args:
+            relative_accuracy (float): The relative error bound alpha, between 0 and 1.
+            min_value (float): Magnitude below which values count as zero.
+        """
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be between 0 and 1")
+        self.relative_accuracy = relative_accuracy
+        self.min_value = min_value
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.positive: Dict[int, int] = {}
+        self.negative: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+
+    def _add_to(self, store: Dict[int, int], magnitudes: np.ndarray) -> None:
+        keys, counts = np.unique(np.ceil(np.log(magnitudes) / self._log_gamma).astype(np.int64), return_counts=True)
+        for key, count in zip(keys.tolist(), counts.tolist()):
+            store[key] = store.get(key, 0) + count
+
+    def update(self, values: Iterable[float]) -> None:
+        """
+        Add values to the sketch. NaN values are ignored.
+
+        Args:
+            values (Iterable[float]): The values to add.
+        """
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+        self._add_to(self.positive, values[values >= self.min_value])
+        self._add_to(self.negative, -values[values <= -self.min_value])
+        self.zero_count += int(np.count_nonzero(np.abs(values) < self.min_value))
+        self.count += len(values)
+
+    def merge(self, other: "QuantileSketch") -> None:
+        """
+        Add the counts of another sketch with the same relative accuracy.
+
+        Args:
+            other (QuantileSketch): The sketch to merge into this one.
+        """
+        if other.gamma != self.gamma:
+            raise ValueError("cannot merge sketches with different relative accuracy")
+        for store, other_store in ((self.positive, other.positive), (self.negative, other.negative)):
+            for key, count in other_store.items():
+                store[key] = store.get(key, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+
+    def _value(self, key: int) -> float:
+        """Return the representative value of a bucket."""
+        return 2 * self.gamma ** key / (self.gamma + 1)
+
+    def _value_at_rank(self, rank: int) -> float:
+        """Return the estimated value of the sample with the given zero-based rank."""
+        seen = 0
+        for key in sorted(self.negative, reverse=True):
+            seen += self.negative[key]
+            if seen > rank:
+                return -self._value(key)
+        seen += self.zero_count
+        if seen > rank:
+            return 0.0
+        for key in sorted(self.positive):
+            seen += self.positive[key]
+            if seen > rank:
+                return self._value(key)
+        raise IndexError("rank out of range")
+
+    def quantile(self, q: float) -> float:
+        """
+        Estimate a quantile with linear interpolation between ranks, like np.percentile.
+
+        Args:
+            q (float): The quantile, between 0 and 1.
+
+        Returns:
+            float: The estimated quantile, or NaN for an empty sketch.
+        """
+        if self.count == 0:
+            return float("nan")
+        position = q * (self.count - 1)
+        lower = int(math.floor(position))
+        upper = min(lower + 1, self.count - 1)
+        low_value = self._value_at_rank(lower)
+        if position == lower:
+            return low_value
+        return low_value + (position - lower) * (self._value_at_rank(upper) - low_value)
+
+    def to_dict(self) -> dict:
+        """Serialize the sketch to JSON-compatible data."""
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "min_value": self.min_value,
+            "count": self.count,
+            "zero_count": self.zero_count,
+            "positive": {str(key): count for key, count in sorted(self.positive.items())},
+            "negative": {str(key): count for key, count in sorted(self.negative.items())}
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "QuantileSketch":
+        """Restore a sketch serialized with to_dict."""
+        sketch = cls(data["relative_accuracy"], data["min_value"])
+        sketch.count = data["count"]
+        sketch.zero_count = data["zero_count"]
+        sketch.positive = {int(key): count for key, count in data["positive"].items()}
+        sketch.negative = {int(key): count for key, count in data["negative"].items()}
+        return sketch
+
+
+class SalaryAccumulator:
+    """
+    Online salary statistics that can be updated chunk by chunk and merged.
+
+    Mean and variance are combined with the parallel form of Welford's
+    algorithm (Chan et al.), so they match a single pass over all values up to
+    floating point rounding. Median and quartiles come from a QuantileSketch
+    and are within its relative accuracy of np.percentile over the same values.
+    """
+
+    def __init__(self, relative_accuracy: float = SKETCH_RELATIVE_ACCURACY) -> None:
+        """
+        Initialize the SalaryAccumulator.
+
+        Args:
+            relative_accuracy (float): Relative error bound of the median and quartiles.
+        """
+        self.total = 0
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.sketch = QuantileSketch(relative_accuracy)
+
+    def _combine(self, count: int, mean: float, m2: float) -> None:
+        """Fold the moments of another set of values into this accumulator."""
+        if count == 0:
+            return
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self.m2 += m2 + delta * delta * self.count * count / total
+        self.count = total
+
+    def update(self, salaries: Iterable[float]) -> None:
+        """
+        Add a chunk of parsed salaries. NaN entries count towards the total only.
+
+        Args:
+            salaries (Iterable[float]): Parsed salaries, NaN where a job had none.
+        """
+        values = np.asarray(salaries, dtype=float)
+        self.total += len(values)
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return
+        chunk_mean = float(values.mean())
+        self._combine(len(values), chunk_mean, float(((values - chunk_mean) ** 2).sum()))
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        self.sketch.update(values)
+
+    def merge(self, other: "SalaryAccumulator") -> None:
+        """
+        Merge the statistics of another accumulator, e.g. from another worker or shard.
+
+        Args:
+            other (SalaryAccumulator): The accumulator to merge into this one.
+        """
+        self.total += other.total
+        self._combine(other.count, other.mean, other.m2)
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.sketch.merge(other.sketch)
+
+    @property
+    def std(self) -> float:
+        """Population standard deviation, as np.std."""
+        return math.sqrt(self.m2 / self.count) if self.count else 0.0
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate a quantile of the salaries, or None if there are none."""
+        return self.sketch.quantile(q) if self.count else None
+
+    def to_dict(self) -> dict:
+        """Serialize the accumulator to JSON-compatible data."""
+        return {
+            "total": self.total,
+            "count": self.count,
+            "mean": self.mean,
+            "m2": self.m2,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+            "sketch": self.sketch.to_dict()
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "SalaryAccumulator":
+        """Restore an accumulator serialized with to_dict."""
+        accumulator = cls()
+        accumulator.total = data["total"]
+        accumulator.count = data["count"]
+        accumulator.mean = data["mean"]
+        accumulator.m2 = data["m2"]
+        accumulator.min = data["min"] if data["min"] is not None else math.inf
+        accumulator.max = data["max"] if data["max"] is not None else -math.inf
+        accumulator.sketch = QuantileSketch.from_dict(data["sketch"])
+        return accumulator
@@ -1,37 +1,599 @@
 """
 Storage handlers for saving scraped data.
+
+Every handler can save a whole iterable of jobs at once with save(), or be
+used as an incremental writer: open(), append() each job as it arrives and
+close(). Rows are written in batches of batch_size, so memory use does not
+grow with the number of jobs and a crash loses at most the current batch.
 """
+import csv
+import json
+import os
+import sqlite3
+from abc import ABC, abstractmethod
+from datetime import date, datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Union
+import numpy as np
 import pandas as pd
-from typing import List
+from openpyxl import Workbook
 from .models import JobListing
-from .config import OUTPUT_FILENAME
+from .table import CATEGORICAL_FIELDS, TEXT_FIELDS, JobTable
+from .analysis import parse_salary, parse_posted_date
+from .config import OUTPUT_FILENAME, STORAGE_BATCH_SIZE, PARQUET_DIR
+from .metrics import metrics
 
-class Storage:
-    """Base storage class."""
-    def save(self, jobs: List[JobListing], filename: str = None) -> None:
-        """Save jobs to storage."""
-        raise NotImplementedError
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
 
-class ExcelStorage(Storage):
-    """Excel file storage handler."""
-    def __init__(self, filename: str = OUTPUT_FILENAME):
+PYARROW_MISSING = "Parquet datasets require pyarrow (pip install -r requirements-optional.txt)"
+
+# Row keys of the JobListing fields, as produced by JobListing.to_dict
+CORE_FIELDS = {
+    'Pavadinimas': 'title',
+    'Įmonė': 'company',
+    'Vieta': 'location',
+    'Paskelbta': 'posted_date',
+    'Atlyginimas': 'salary',
+    'Nuoroda': 'url'
+}
+
+class Storage(ABC):
+    """Base storage class."""
+    def __init__(self, filename: Optional[str] = None, batch_size: int = STORAGE_BATCH_SIZE):
         self.filename = filename
+        self.batch_size = batch_size
+        self._output_file: Optional[str] = None
+        self._buffer: List[Dict[str, str]] = []
+
+    def save(self, jobs: Union[Iterable[JobListing], JobTable], filename: str = None) -> None:
+        """Save jobs, or the rows of a JobTable, to storage."""
+        self.open(filename)
+        try:
+            if isinstance(jobs, JobTable):
+                for row in jobs.iter_dicts():
+                    self._append_row(row)
+            else:
+                for job in jobs:
+                    self.append(job)
+        finally:
+            self.close()
+
+    def open(self, filename: str = None) -> None:
+        """Start writing jobs to a file."""
+        self._output_file = filename or self.filename
+        self._buffer = []
+        self._open(self._output_file)
+
+    def append(self, job: JobListing) -> None:
+        """Add a job, writing the buffered batch once it is full."""
+        self._append_row(job.to_dict())
+
+    def _append_row(self, row: Dict[str, str]) -> None:
+        self._buffer.append(row)
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write the buffered jobs."""
+        if self._buffer:
+            with metrics.timer("storage_write_seconds", backend=type(self).__name__):
+                self._write_rows(self._buffer)
+            metrics.inc("storage_rows_total", len(self._buffer), backend=type(self).__name__)
+            self._buffer = []
+
+    def close(self) -> None:
+        """Write the remaining jobs and finish the file."""
+        if self._output_file is None:
+            return
+        self.flush()
+        with metrics.timer("storage_close_seconds", backend=type(self).__name__):
+            self._close()
+        print(f"✅ Išsaugota į: {self._output_file}")
+        self._output_file = None
+
+    def __enter__(self) -> 'Storage':
+        if self._output_file is None:
+            self.open()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @abstractmethod
+    def _open(self, output_file: str) -> None:
+        """Start writing to output_file."""
+
+    @abstractmethod
+    def _write_rows(self, rows: List[Dict[str, str]]) -> None:
+        """Write a batch of rows in the JobListing.to_dict layout."""
+
+    @abstractmethod
+    def _close(self) -> None:
+        """Finish the output file."""
+
+class JSONLStorage(Storage):
+    """JSON Lines file storage handler, one job object per line."""
+    def __init__(self, filename: str = "uzt_adds.jsonl", batch_size: int = STORAGE_BATCH_SIZE):
+        super().__init__(filename, batch_size)
+        self._file = None
 
-    def save(self, jobs: List[JobListing], filename: str = None) -> None:
-        """Save jobs to Excel file."""
-        df = pd.DataFrame([job.to_dict() for job in jobs])
-        output_file = filename or self.filename
-        df.to_excel(output_file, index=False)
-        print(f"✅ Išsaugota į: {output_file}")
+    def _open(self, output_file: str) -> None:
+        self._file = open(output_file, 'w', encoding='utf-8')
+
+    def _write_rows(self, rows: List[Dict[str, str]]) -> None:
+        self._file.writelines(json.dumps(row, ensure_ascii=False) + '\n' for row in rows)
+        self._file.flush()
+
+    def _close(self) -> None:
+        self._file.close()
+        self._file = None
+
+    @staticmethod
+    def read(filename: str) -> Iterator[Dict[str, str]]:
+        """Yield the stored rows in the JobListing.to_dict layout."""
+        with open(filename, encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
 
 class CSVStorage(Storage):
     """CSV file storage handler."""
-    def __init__(self, filename: str = "uzt_adds.csv"):
-        self.filename = filename
+    def __init__(self, filename: str = "uzt_adds.csv", batch_size: int = STORAGE_BATCH_SIZE):
+        super().__init__(filename, batch_size)
+        self._file = None
+        self._writer = None
+        self._fieldnames: List[str] = []
+        self._header_complete = True
+
+    def _open(self, output_file: str) -> None:
+        self._file = open(output_file, 'w', newline='', encoding='utf-8')
+        self._writer = csv.writer(self._file)
+        self._fieldnames = []
+        self._header_complete = True
+
+    def _write_rows(self, rows: List[Dict[str, str]]) -> None:
+        known = set(self._fieldnames)
+        new_fields = []
+        for row in rows:
+            for key in row:
+                if key not in known:
+                    known.add(key)
+                    new_fields.append(key)
+        if new_fields:
+            if self._fieldnames:
+                # Detail columns first seen after the header was written; fixed up in _close
+                self._header_complete = False
+            self._fieldnames.extend(new_fields)
+            if self._header_complete:
+                self._writer.writerow(self._fieldnames)
+        self._writer.writerows([row.get(key, '') for key in self._fieldnames] for row in rows)
+        self._file.flush()
+
+    def _close(self) -> None:
+        self._file.close()
+        self._file = None
+        if not self._header_complete:
+            self._rewrite_header()
+
+    @staticmethod
+    def read(filename: str) -> Iterator[Dict[str, str]]:
+        """Yield the stored rows in the JobListing.to_dict layout, without the empty detail cells."""
+        with open(filename, newline='', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                yield {key: value for key, value in row.items() if value or key in CORE_FIELDS}
+
+    def _rewrite_header(self) -> None:
+        """Copy the file once with the full header, padding rows written before new columns appeared."""
+        tmp_file = f"{self._output_file}.tmp"
+        with open(self._output_file, newline='', encoding='utf-8') as src, \
+                open(tmp_file, 'w', newline='', encoding='utf-8') as dst:
+            reader = csv.reader(src)
+            writer = csv.writer(dst)
+            next(reader)
+            writer.writerow(self._fieldnames)
+            width = len(self._fieldnames)
+            writer.writerows(row + [''] * (width - len(row)) for row in reader)
+        os.replace(tmp_file, self._output_file)
+
+class ExcelStorage(Storage):
+    """
+    Excel file storage handler.
+
+    Rows are spooled to a JSON Lines file next to the output while jobs are
+    appended, because the header must hold every detail column before the
+    first row. On close the workbook is written in openpyxl's write-only
+    mode, which streams rows to disk instead of keeping cells in memory.
+    """
+    def __init__(self, filename: str = OUTPUT_FILENAME, batch_size: int = STORAGE_BATCH_SIZE):
+        super().__init__(filename, batch_size)
+        self._spool = JSONLStorage(batch_size=batch_size)
+        self._fieldnames: Dict[str, None] = {}
+
+    @property
+    def _spool_file(self) -> str:
+        return f"{self._output_file}.partial.jsonl"
+
+    def _open(self, output_file: str) -> None:
+        self._fieldnames = {}
+        self._spool._open(self._spool_file)
+
+    def _write_rows(self, rows: List[Dict[str, str]]) -> None:
+        for row in rows:
+            self._fieldnames.update(dict.fromkeys(row))
+        self._spool._write_rows(rows)
+
+    def _close(self) -> None:
+        self._spool._close()
+        workbook = Workbook(write_only=True)
+        sheet = workbook.create_sheet("Sheet1")
+        fieldnames = list(self._fieldnames)
+        if fieldnames:
+            sheet.append(fieldnames)
+        with open(self._spool_file, encoding='utf-8') as f:
+            for line in f:
+                row = json.loads(line)
+                sheet.append([row.get(key) for key in fieldnames])
+        workbook.save(self._output_file)
+        os.remove(self._spool_file)
+
+
+class SQLiteStorage(Storage):
+    """
+    SQLite database storage handler.
+
+    Job listings are upserted by URL, so the database keeps one row per
+    listing across runs with its first and last time seen. Details live in a
+    side table. Each batch is written in a single transaction in WAL mode.
+    """
+    def __init__(self, filename: str = "uzt_adds.sqlite", batch_size: int = STORAGE_BATCH_SIZE):
+        super().__init__(filename, batch_size)
+        self._db: Optional[sqlite3.Connection] = None
+        # Database last opened for writing, read by query and count
+        self._database = filename
+        # Time of the current write, stored as the listings' first or last time seen
+        self._seen: Optional[str] = None
+
+    @staticmethod
+    def _connect(filename: str) -> sqlite3.Connection:
+        db = sqlite3.connect(filename, timeout=30)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        db.executescript("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                url TEXT PRIMARY KEY,
+                title TEXT NOT NULL,
+                company TEXT NOT NULL,
+                location TEXT NOT NULL,
+                posted_date TEXT NOT NULL,
+                posted_on TEXT,
+                salary TEXT NOT NULL,
+                salary_value REAL,
+                first_seen TEXT NOT NULL,
+                last_seen TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS job_details (
+                url TEXT NOT NULL REFERENCES jobs (url) ON DELETE CASCADE,
+                key TEXT NOT NULL,
+                value TEXT NOT NULL,
+                PRIMARY KEY (url, key)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS jobs_location ON jobs (location);
+            CREATE INDEX IF NOT EXISTS jobs_posted_on ON jobs (posted_on);
+            CREATE INDEX IF NOT EXISTS jobs_salary_value ON jobs (salary_value);
+        """)
+        return db
+
+    def _open(self, output_file: str) -> None:
+        self._db = self._connect(output_file)
+        self._database = output_file
+        self._seen = datetime.now().isoformat(timespec='seconds')
+
+    def _write_rows(self, rows: List[Dict[str, str]]) -> None:
+        jobs = []
+        details = []
+        for row in rows:
+            url = row.get('Nuoroda', '')
+            posted_date = row.get('Paskelbta', '–')
+            salary = row.get('Atlyginimas', '–')
+            jobs.append((
+                url, row.get('Pavadinimas', '–'), row.get('Įmonė', '–'), row.get('Vieta', '–'),
+                posted_date, parse_posted_date(posted_date), salary, parse_salary(salary),
+                self._seen, self._seen
+            ))
+            details.extend((url, k, v) for k, v in row.items() if k not in CORE_FIELDS)
+        with self._db:
+            self._db.executemany(
+                "INSERT INTO jobs (url, title, company, location, posted_date, posted_on, salary, "
+                "salary_value, first_seen, last_seen) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(url) DO UPDATE SET title = excluded.title, company = excluded.company, "
+                "location = excluded.location, posted_date = excluded.posted_date, "
+                "posted_on = excluded.posted_on, salary = excluded.salary, "
+                "salary_value = excluded.salary_value, last_seen = excluded.last_seen",
+                jobs
+            )
+            self._db.executemany("DELETE FROM job_details WHERE url = ?", [(job[0],) for job in jobs])
+            self._db.executemany("INSERT OR REPLACE INTO job_details (url, key, value) VALUES (?, ?, ?)", details)
+
+    def _close(self) -> None:
+        self._db.close()
+        self._db = None
+
+    def query(
+        self,
+        location: Optional[str] = None,
+        company: Optional[str] = None,
+        posted_since: Optional[Union[date, str]] = None,
+        posted_until: Optional[Union[date, str]] = None,
+        min_salary: Optional[float] = None,
+        max_salary: Optional[float] = None,
+        limit: Optional[int] = None,
+        newest_first: bool = True
+    ) -> Iterator[JobListing]:
+        """
+        Query stored job listings, newest postings first.
+
+        Jobs are read lazily from a database cursor, so large results are not
+        loaded into memory at once.
+
+        Args:
+            location (Optional[str]): Only jobs in this location.
+            company (Optional[str]): Only jobs from this company.
+            posted_since (Optional[Union[date, str]]): Only jobs posted on or after this date.
+            posted_until (Optional[Union[date, str]]): Only jobs posted on or before this date.
+            min_salary (Optional[float]): Only jobs whose parsed salary is at least this.
+            max_salary (Optional[float]): Only jobs whose parsed salary is at most this.
+            limit (Optional[int]): The maximum number of jobs to return.
+            newest_first (bool): Order by posting date, newest first; otherwise
+                in the order listings were first stored, as in the other formats.
+
+        Yields:
+            JobListing: The matching job listings with their details.
+        """
+        conditions = []
+        params = []
+        for column, operator, value in (
+            ('location', '=', location),
+            ('company', '=', company),
+            ('posted_on', '>=', posted_since),
+            ('posted_on', '<=', posted_until),
+            ('salary_value', '>=', min_salary),
+            ('salary_value', '<=', max_salary)
+        ):
+            if value is not None:
+                conditions.append(f"{column} {operator} ?")
+                params.append(value.isoformat() if isinstance(value, date) else value)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        order = "posted_on DESC, url" if newest_first else "rowid"
+        sql = (
+            "SELECT j.url, j.title, j.company, j.location, j.posted_date, j.salary, d.key, d.value "
+            f"FROM (SELECT rowid, * FROM jobs {where} ORDER BY {order}"
+            f"{' LIMIT ?' if limit is not None else ''}) AS j "
+            "LEFT JOIN job_details AS d ON d.url = j.url "
+            f"ORDER BY j.{order.replace(', ', ', j.')}"
+        )
+        if limit is not None:
+            params.append(limit)
+
+        db = self._connect(self._database)
+        try:
+            job = None
+            for url, title, company_, location_, posted_date, salary, key, value in db.execute(sql, params):
+                if job is None or job.url != url:
+                    if job is not None:
+                        yield job
+                    job = JobListing(title, company_, location_, posted_date, salary, url, {})
+                if key is not None:
+                    job.details[key] = value
+            if job is not None:
+                yield job
+        finally:
+            db.close()
+
+    def count(self) -> int:
+        """Return the number of stored job listings."""
+        db = self._connect(self._database)
+        try:
+            return db.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+        finally:
+            db.close()
+
+class ParquetStorage(Storage):
+    """
+    Parquet dataset storage handler.
+
+    Every scrape run is written as one file in a hive-style partition,
+    <directory>/scrape_date=YYYY-MM-DD/run=<run_id>/part-0.parquet, with one
+    row group per batch. The schema is fixed: the JobListing fields as string
+    columns (company and location dictionary-encoded), the parsed salary as
+    float and the details as a string-to-string map.
+    """
+    def __init__(self, directory: str = PARQUET_DIR, batch_size: int = STORAGE_BATCH_SIZE, run_id: Optional[str] = None):
+        if pa is None:
+            raise ImportError(PYARROW_MISSING)
+        super().__init__(directory, batch_size)
+        self.run_id = run_id
+        self._writer = None
+
+    @staticmethod
+    def schema() -> 'pa.Schema':
+        """Return the schema of the stored job listings."""
+        return pa.schema([
+            ('title', pa.string()),
+            ('company', pa.dictionary(pa.int32(), pa.string())),
+            ('location', pa.dictionary(pa.int32(), pa.string())),
+            ('posted_date', pa.string()),
+            ('salary', pa.string()),
+            ('salary_value', pa.float64()),
+            ('url', pa.string()),
+            ('details', pa.map_(pa.string(), pa.string())),
+            ('scraped_at', pa.timestamp('s'))
+        ])
+
+    def _open(self, output_file: str) -> None:
+        started = datetime.now()
+        run_id = self.run_id or started.strftime('%Y%m%dT%H%M%S')
+        partition = os.path.join(output_file, f"scrape_date={started.date().isoformat()}", f"run={run_id}")
+        os.makedirs(partition, exist_ok=True)
+        self._scraped_at = started.replace(microsecond=0)
+        self._writer = pq.ParquetWriter(
+            os.path.join(partition, 'part-0.parquet'),
+            self.schema(),
+            use_dictionary=['company', 'location']
+        )
+
+    def _write_rows(self, rows: List[Dict[str, str]]) -> None:
+        columns = {name: [row.get(key, '–') for row in rows] for key, name in CORE_FIELDS.items()}
+        columns['url'] = [row.get('Nuoroda', '') for row in rows]
+        columns['salary_value'] = [parse_salary(salary) for salary in columns['salary']]
+        columns['details'] = [[(k, v) for k, v in row.items() if k not in CORE_FIELDS] for row in rows]
+        columns['scraped_at'] = [self._scraped_at] * len(rows)
+        self._writer.write_table(pa.Table.from_pydict(columns, schema=self.schema()))
+
+    def _close(self) -> None:
+        self._writer.close()
+        self._writer = None
+
+    @staticmethod
+    def load(directory: str = PARQUET_DIR, columns: Optional[List[str]] = None) -> 'pa.Table':
+        """
+        Read stored job listings, touching only the requested columns.
+
+        Args:
+            directory (str): The dataset directory.
+            columns (Optional[List[str]]): Columns to read, including the scrape_date
+                and run partition columns. Defaults to all columns.
+
+        Returns:
+            pa.Table: The stored rows of every run.
+        """
+        if pa is None:
+            raise ImportError(PYARROW_MISSING)
+        return ds.dataset(directory, format='parquet', partitioning='hive').to_table(columns=columns)
+
+    @classmethod
+    def load_jobs(cls, directory: str = PARQUET_DIR, columns: Optional[List[str]] = None) -> List[JobListing]:
+        """
+        Read stored job listings as JobListing objects.
+
+        Args:
+            directory (str): The dataset directory.
+            columns (Optional[List[str]]): JobListing fields to read; the others are
+                left at their defaults. Defaults to all fields.
+
+        Returns:
+            List[JobListing]: The stored job listings.
+        """
+        fields = list(CORE_FIELDS.values()) + ['details']
+        columns = [name for name in fields if columns is None or name in columns]
+        data = cls.load(directory, columns).to_pydict()
+        count = len(data[columns[0]]) if columns else 0
+        return [
+            JobListing(
+                title=data['title'][i] if 'title' in data else '–',
+                company=data['company'][i] if 'company' in data else '–',
+                location=data['location'][i] if 'location' in data else '–',
+                posted_date=data['posted_date'][i] if 'posted_date' in data else '–',
+                salary=data['salary'][i] if 'salary' in data else '–',
+                url=data['url'][i] if 'url' in data else '',
+                details=dict(data['details'][i]) if 'details' in data else {}
+            )
+            for i in range(count)
+        ]
+
+    @classmethod
+    def load_table(cls, directory: str = PARQUET_DIR, columns: Optional[List[str]] = None) -> JobTable:
+        """
+        Read stored job listings into a columnar JobTable without creating an object per row.
+
+        Args:
+            directory (str): The dataset directory.
+            columns (Optional[List[str]]): JobListing fields to read; the others are
+                left at their defaults. Defaults to all fields.
+
+        Returns:
+            JobTable: The stored job listings.
+        """
+        fields = list(CORE_FIELDS.values()) + ['details']
+        columns = [name for name in fields if columns is None or name in columns]
+        data = cls.load(directory, columns)
+        count = data.num_rows
+        text = {}
+        for name in TEXT_FIELDS:
+            if name in columns:
+                text[name] = data.column(name).to_numpy(zero_copy_only=False).astype(object)
+            else:
+                text[name] = np.full(count, '' if name == 'url' else '–', dtype=object)
+        codes, categories = {}, {}
+        for name in CATEGORICAL_FIELDS:
+            if name in columns:
+                column_codes, uniques = pd.factorize(data.column(name).to_numpy(zero_copy_only=False))
+                codes[name] = column_codes.astype(np.int32)
+                categories[name] = np.asarray(uniques, dtype=object)
+            else:
+                codes[name] = np.zeros(count, dtype=np.int32)
+                categories[name] = np.array(['–'], dtype=object)
+        if 'details' in columns and count:
+            details = data.column('details').combine_chunks()
+            offsets = details.offsets.to_numpy().astype(np.int64)
+            key_codes, keys = pd.factorize(details.keys.to_numpy(zero_copy_only=False))
+            values = details.items.to_numpy(zero_copy_only=False).astype(object)
+        else:
+            offsets = np.zeros(count + 1, dtype=np.int64)
+            key_codes, keys, values = np.zeros(0, dtype=np.int32), [], np.zeros(0, dtype=object)
+        return JobTable(
+            text=text,
+            codes=codes,
+            categories=categories,
+            detail_keys=[str(key) for key in keys],
+            detail_offsets=offsets - offsets[0],
+            detail_key_codes=key_codes[offsets[0]:offsets[-1]].astype(np.int32),
+            detail_values=values[offsets[0]:offsets[-1]]
+        )
+
+
+def load_table(path: str) -> JobTable:
+    """
+    Read a dataset written by one of the storage handlers into a JobTable.
+
+    Args:
+        path (str): A JSON Lines, CSV or SQLite file, or a Parquet dataset directory.
+
+    Returns:
+        JobTable: The stored job listings.
+
+    Raises:
+        ValueError: If the format cannot be read.
+    """
+    if os.path.isdir(path):
+        return ParquetStorage.load_table(path)
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.jsonl':
+        return JobTable.from_dicts(JSONLStorage.read(path))
+    if extension == '.csv':
+        return JobTable.from_dicts(CSVStorage.read(path))
+    if extension in ('.sqlite', '.db'):
+        return JobTable.from_jobs(SQLiteStorage(path).query(newest_first=False))
+    raise ValueError(f"Unsupported dataset: {path} (expected a .jsonl, .csv or .sqlite file or a Parquet directory)")
+
+
+def storage_for(path: str) -> Storage:
+    """
+    Create the storage handler writing to a path, chosen by its extension.
+
+    Args:
+        path (str): An .xlsx, .csv, .jsonl or .sqlite file, or a directory for a Parquet dataset.
 
-    def save(self, jobs: List[JobListing], filename: str = None) -> None:
-        """Save jobs to CSV file."""
-        df = pd.DataFrame([job.to_dict() for job in jobs])
-        output_file = filename or self.filename
-        df.to_csv(output_file, index=False, encoding='utf-8')
-        print(f"✅ Išsaugota į: {output_file}") 
\ No newline at end of file
+    Returns:
+        Storage: The storage handler.
+    """
+    handlers = {'.xlsx': ExcelStorage, '.csv': CSVStorage, '.jsonl': JSONLStorage, '.sqlite': SQLiteStorage, '.db': SQLiteStorage}
+    extension = os.path.splitext(path)[1].lower()
+    if extension in handlers:
+        return handlers[extension](path)
+    if not extension:
+        return ParquetStorage(path)
+    raise ValueError(f"Unsupported output: {path} (expected .xlsx, .csv, .jsonl, .sqlite or a directory)")
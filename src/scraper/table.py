@@ -0,0 +1,249 @@
+"""
+Columnar container for large numbers of job listings.
+"""
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from .models import JobListing, intern_value
+
+# JobListing fields stored as integer codes into a table of distinct values
+CATEGORICAL_FIELDS = ('company', 'location', 'posted_date', 'salary')
+# JobListing fields stored as one string per row
+TEXT_FIELDS = ('title', 'url')
+FIELDS = ('title', 'company', 'location', 'posted_date', 'salary', 'url')
+# Row keys of FIELDS, as produced by JobListing.to_dict
+ROW_KEYS = ('Pavadinimas', 'Įmonė', 'Vieta', 'Paskelbta', 'Atlyginimas', 'Nuoroda')
+
+
+def _object_array(values: List) -> np.ndarray:
+    """Return a one-dimensional object array holding the values as they are."""
+    result = np.empty(len(values), dtype=object)
+    result[:] = values
+    return result
+
+
+class JobTable:
+    """
+    Job listings stored column by column instead of as one object per listing.
+
+    Categorical fields (company, location, posting date, salary) are kept as
+    int32 codes into a list of distinct values, with -1 for a missing value.
+    Details are stored like a sparse matrix: the keys of all rows share one
+    key dictionary, and row i's entries are detail_key_codes and
+    detail_values[detail_offsets[i]:detail_offsets[i + 1]]. Analyzers read the
+    columns directly; indexing or iterating materializes JobListing objects
+    one row at a time for code that needs them.
+    """
+
+    def __init__(self, text: Dict[str, np.ndarray], codes: Dict[str, np.ndarray],
+                 categories: Dict[str, np.ndarray], detail_keys: List[str],
+                 detail_offsets: np.ndarray, detail_key_codes: np.ndarray,
+                 detail_values: np.ndarray) -> None:
+        """
+        Initialize the JobTable from its columns; use from_jobs or from_dicts to build one.
+
+        Args:
+            text (Dict[str, np.ndarray]): Object arrays of the TEXT_FIELDS
+            codes (Dict[str, np.ndarray]): int32 codes of the CATEGORICAL_FIELDS
+            categories (Dict[str, np.ndarray]): Distinct values of the CATEGORICAL_FIELDS
+            detail_keys (List[str]): The shared detail key dictionary
+            detail_offsets (np.ndarray): Start of each row's details, with one extra end offset
+            detail_key_codes (np.ndarray): Detail key code of every detail entry
+            detail_values (np.ndarray): Value of every detail entry
+        """
+        self.text = text
+        self.codes = codes
+        self.categories = categories
+        self.detail_keys = detail_keys
+        self.detail_offsets = detail_offsets
+        self.detail_key_codes = detail_key_codes
+        self.detail_values = detail_values
+
+    @classmethod
+    def from_jobs(cls, jobs: Iterable[JobListing]) -> 'JobTable':
+        """
+        Build a table from job listings, consuming them one at a time.
+
+        Args:
+            jobs (Iterable[JobListing]): Job listings or any objects with the same attributes
+
+        Returns:
+            JobTable: The listings in columnar form
+        """
+        text = {name: [] for name in TEXT_FIELDS}
+        codes = {name: array('i') for name in CATEGORICAL_FIELDS}
+        lookups: Dict[str, Dict[str, int]] = {name: {} for name in CATEGORICAL_FIELDS}
+        key_lookup: Dict[str, int] = {}
+        offsets = array('q', [0])
+        key_codes = array('i')
+        values = []
+        for job in jobs:
+            for name in TEXT_FIELDS:
+                text[name].append(getattr(job, name))
+            for name in CATEGORICAL_FIELDS:
+                value = getattr(job, name)
+                if value is None:
+                    codes[name].append(-1)
+                    continue
+                lookup = lookups[name]
+                code = lookup.get(value)
+                if code is None:
+                    code = lookup[value] = len(lookup)
+                codes[name].append(code)
+            for key, value in job.details.items():
+                code = key_lookup.get(key)
+                if code is None:
+                    code = key_lookup[key] = len(key_lookup)
+                key_codes.append(code)
+                values.append(intern_value(value))
+            offsets.append(len(key_codes))
+        return cls(
+            text={name: _object_array(column) for name, column in text.items()},
+            codes={name: np.frombuffer(column, dtype=np.int32) if column else np.zeros(0, dtype=np.int32)
+                   for name, column in codes.items()},
+            categories={name: _object_array(list(lookup)) for name, lookup in lookups.items()},
+            detail_keys=list(key_lookup),
+            detail_offsets=np.array(offsets, dtype=np.int64),
+            detail_key_codes=np.array(key_codes, dtype=np.int32),
+            detail_values=_object_array(values)
+        )
+
+    @classmethod
+    def from_dicts(cls, rows: Iterable[dict]) -> 'JobTable':
+        """
+        Build a table from rows in the JobListing.to_dict layout.
+
+        Args:
+            rows (Iterable[dict]): Rows as written by the storage handlers
+
+        Returns:
+            JobTable: The rows in columnar form
+        """
+        return cls.from_jobs(JobListing.from_dict(row) for row in rows)
+
+    def __len__(self) -> int:
+        return len(self.detail_offsets) - 1
+
+    def take(self, rows: np.ndarray) -> 'JobTable':
+        """
+        Select rows, column by column, without creating JobListing objects.
+
+        Args:
+            rows (np.ndarray): Positions of the rows to keep, in the order to keep them
+
+        Returns:
+            JobTable: A table of the selected rows, with categories in their new order of first appearance
+        """
+        rows = np.asarray(rows, dtype=np.int64)
+        codes, categories = {}, {}
+        for name in CATEGORICAL_FIELDS:
+            selected = self.codes[name][rows]
+            used, first, inverse = np.unique(selected, return_index=True, return_inverse=True)
+            present = used >= 0
+            # Renumber the used codes by first appearance, keeping -1 for missing values
+            order = np.argsort(first[present], kind='stable')
+            renumber = np.full(len(used), -1, dtype=np.int32)
+            renumber[np.flatnonzero(present)[order]] = np.arange(len(order), dtype=np.int32)
+            codes[name] = renumber[inverse.ravel()]
+            categories[name] = self.categories[name][used[present][order]]
+        starts, ends = self.detail_offsets[rows], self.detail_offsets[rows + 1]
+        offsets = np.concatenate(([0], np.cumsum(ends - starts))).astype(np.int64)
+        entries = np.repeat(starts - offsets[:-1], ends - starts) + np.arange(offsets[-1], dtype=np.int64)
+        return JobTable(
+            text={name: column[rows] for name, column in self.text.items()},
+            codes=codes,
+            categories=categories,
+            detail_keys=list(self.detail_keys),
+            detail_offsets=offsets,
+            detail_key_codes=self.detail_key_codes[entries],
+            detail_values=self.detail_values[entries]
+        )
+
+    def factorize(self, name: str) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Encode a field as integer codes, like pd.factorize.
+
+        Args:
+            name (str): One of FIELDS
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Codes per row (-1 where missing) and the distinct values
+            in order of first appearance
+        """
+        if name in CATEGORICAL_FIELDS:
+            return self.codes[name], self.categories[name]
+        import pandas as pd
+        return pd.factorize(self.text[name])
+
+    def column(self, name: str) -> np.ndarray:
+        """
+        Return a field's value for every row.
+
+        Args:
+            name (str): One of FIELDS
+
+        Returns:
+            np.ndarray: Object array with one value per row
+        """
+        if name in TEXT_FIELDS:
+            return self.text[name]
+        return np.append(self.categories[name], None)[self.codes[name]]
+
+    def detail_column(self, key: str, default: Optional[str] = '') -> np.ndarray:
+        """
+        Return one detail for every row.
+
+        Args:
+            key (str): The detail key, e.g. 'Darbo aprašymas'
+            default (Optional[str]): Value for rows without this detail
+
+        Returns:
+            np.ndarray: Object array with one value per row
+        """
+        result = np.full(len(self), default, dtype=object)
+        if key not in self.detail_keys:
+            return result
+        entries = np.flatnonzero(self.detail_key_codes == self.detail_keys.index(key))
+        rows = np.searchsorted(self.detail_offsets, entries, side='right') - 1
+        result[rows] = self.detail_values[entries]
+        return result
+
+    def details(self, row: int) -> Dict[str, str]:
+        """Return the details of one row."""
+        start, end = self.detail_offsets[row], self.detail_offsets[row + 1]
+        return {
+            self.detail_keys[code]: value
+            for code, value in zip(self.detail_key_codes[start:end].tolist(), self.detail_values[start:end])
+        }
+
+    def _value(self, name: str, row: int) -> Optional[str]:
+        if name in TEXT_FIELDS:
+            return self.text[name][row]
+        code = self.codes[name][row]
+        return self.categories[name][code] if code >= 0 else None
+
+    def __getitem__(self, row: int) -> JobListing:
+        if row < 0:
+            row += len(self)
+        if not 0 <= row < len(self):
+            raise IndexError("row out of range")
+        return JobListing(**{name: self._value(name, row) for name in FIELDS}, details=self.details(row))
+
+    def __iter__(self) -> Iterator[JobListing]:
+        for row in range(len(self)):
+            yield self[row]
+
+    def iter_dicts(self) -> Iterator[dict]:
+        """
+        Yield every row in the JobListing.to_dict layout, without creating JobListing objects.
+
+        Yields:
+            dict: One row per job listing
+        """
+        columns = [self.column(name).tolist() for name in FIELDS]
+        for row, values in enumerate(zip(*columns)):
+            record = dict(zip(ROW_KEYS, values))
+            record.update(self.details(row))
+            yield record
@@ -0,0 +1,138 @@
+"""
+Rate limiting utilities for the scraper.
+"""
+import threading
+import time
+from typing import Optional
+
+from .config import (
+    LATENCY_TARGET,
+    MAX_REQUESTS_PER_SECOND,
+    MIN_REQUESTS_PER_SECOND,
+    RATE_DECREASE,
+    RATE_INCREASE
+)
+
+
+class TokenBucket:
+    """Thread-safe token bucket rate limiter."""
+
+    def __init__(self, rate: float, capacity: float = 1) -> None:
+        """
+        Initialize the TokenBucket.
+
+        Args:
+            rate (float): Number of tokens added to the bucket per second.
+            capacity (float): Maximum number of tokens the bucket can hold (burst size).
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        """Add the tokens accumulated since the last update."""
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, tokens: float = 1) -> float:
+        """
+        Take tokens from the bucket, blocking until they are available.
+
+        Tokens are reserved under the lock before sleeping, so concurrent
+        callers are served in arrival order without busy waiting.
+
+        Args:
+            tokens (float): Number of tokens to take.
+
+        Returns:
+            float: Number of seconds the caller waited.
+        """
+        with self._lock:
+            self._refill()
+            self._tokens -= tokens
+            wait = max(0.0, -self._tokens / self.rate)
+        if wait:
+            time.sleep(wait)
+        return wait
+
+
+class AdaptiveRateLimiter(TokenBucket):
+    """
+    Token bucket whose rate follows the health of the site (AIMD).
+
+    Every fast, successful response adds `increase` requests per second, up to
+    max_rate. Failures (timeouts, connection errors, 429 and 5xx responses)
+    and an average latency above latency_target multiply the rate by
+    `decrease`, down to min_rate. Decreases are applied at most once per
+    request interval, so one burst of failing concurrent requests only counts
+    once.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float = 1,
+        min_rate: float = MIN_REQUESTS_PER_SECOND,
+        max_rate: float = MAX_REQUESTS_PER_SECOND,
+        increase: float = RATE_INCREASE,
+        decrease: float = RATE_DECREASE,
+        latency_target: float = LATENCY_TARGET
+    ) -> None:
+        """
+        Initialize the AdaptiveRateLimiter.
+
+        Args:
+            rate (float): Initial number of tokens added to the bucket per second.
+            capacity (float): Maximum number of tokens the bucket can hold (burst size).
+            min_rate (float): Lowest rate to back off to; lowered to rate if above it.
+            max_rate (float): Highest rate to speed up to; raised to rate if below it.
+            increase (float): Rate added after each fast, successful response.
+            decrease (float): Rate multiplier after a failure or slow response.
+            latency_target (float): Average latency in seconds above which the rate is lowered.
+        """
+        super().__init__(rate, capacity)
+        self.min_rate = min(min_rate, rate)
+        self.max_rate = max(max_rate, rate)
+        self.increase = increase
+        self.decrease = decrease
+        self.latency_target = latency_target
+        self.latency: Optional[float] = None
+        self._last_decrease = float("-inf")
+
+    def _set_rate(self, rate: float) -> None:
+        """Change the rate, keeping the tokens accumulated at the old one."""
+        self._refill()
+        self.rate = min(self.max_rate, max(self.min_rate, rate))
+
+    def _back_off(self) -> None:
+        now = time.monotonic()
+        if now - self._last_decrease >= 1 / self.rate:
+            self._set_rate(self.rate * self.decrease)
+            self._last_decrease = now
+
+    def record_success(self, latency: float) -> None:
+        """
+        Adjust the rate after a successful response.
+
+        Args:
+            latency (float): Seconds the request took.
+        """
+        with self._lock:
+            # Exponentially weighted moving average of the latency
+            self.latency = latency if self.latency is None else 0.8 * self.latency + 0.2 * latency
+            if self.latency > self.latency_target:
+                self._back_off()
+            else:
+                self._set_rate(self.rate + self.increase)
+
+    def record_failure(self) -> None:
+        """Lower the rate after a failed or rate-limited request."""
+        with self._lock:
+            self._back_off()
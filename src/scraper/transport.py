@@ -0,0 +1,189 @@
+"""
+Transport layer: sized connection pools, compressed responses, optional HTTP/2 and response charsets.
+"""
+import codecs
+import importlib.util
+from datetime import timedelta
+from functools import lru_cache
+from typing import Optional
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+from urllib3.util.request import ACCEPT_ENCODING
+
+from .archive import PageArchive, ReplayAdapter
+from .cache import CachingAdapter, HTTPCache
+from .config import DEFAULT_ENCODING, HTTP2, POOL_BLOCK, POOL_CONNECTIONS
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - optional dependency
+    httpx = None
+
+HTTPX_MISSING = "HTTP/2 requires httpx with h2 (pip install -r requirements-optional.txt)"
+
+# Connection-specific request headers, which HTTP/2 forbids
+HOP_BY_HOP_HEADERS = frozenset({"connection", "keep-alive", "proxy-connection", "transfer-encoding", "upgrade"})
+
+
+@lru_cache(maxsize=64)
+def _charset(content_type: str, default: str) -> str:
+    for parameter in content_type.split(";")[1:]:
+        name, _, value = parameter.partition("=")
+        value = value.strip().strip("\"'")
+        if name.strip().lower() == "charset" and value:
+            try:
+                return codecs.lookup(value).name
+            except LookupError:
+                break
+    return default
+
+
+def content_type_charset(content_type: Optional[str], default: str = DEFAULT_ENCODING) -> str:
+    """
+    Return the charset declared by a Content-Type header value.
+
+    Args:
+        content_type (Optional[str]): The header value, e.g. "text/html; charset=windows-1257".
+        default (str): The charset when none or an unknown one is declared.
+
+    Returns:
+        str: The charset's codec name.
+    """
+    return _charset(content_type, default) if isinstance(content_type, str) else default
+
+
+def response_charset(response: requests.Response, default: str = DEFAULT_ENCODING) -> str:
+    """
+    Return the charset a response body is encoded in, to hand to the parsers with its bytes.
+
+    Unlike response.encoding, a text/html response without a charset
+    parameter is not assumed to be ISO-8859-1.
+
+    Args:
+        response (requests.Response): The response.
+        default (str): The charset when the Content-Type does not declare one or declares an unknown one.
+
+    Returns:
+        str: The charset's codec name.
+    """
+    return content_type_charset(response.headers.get("Content-Type"), default)
+
+
+def wire_bytes(response: requests.Response) -> Optional[int]:
+    """Return the number of body bytes received before decompression, or None if it is not known."""
+    downloaded = getattr(response, "wire_bytes", None)
+    if downloaded is None:
+        # urllib3 counts the bytes read from the connection, before decoding
+        try:
+            downloaded = response.raw.tell()
+        except (AttributeError, OSError):
+            return None
+    return downloaded if isinstance(downloaded, int) else None
+
+
+class HTTPXAdapter(HTTPAdapter):
+    """
+    Transport adapter sending requests over HTTP/2 through an httpx client.
+
+    HTTP/2 multiplexes the concurrent detail requests over one connection per
+    host; servers without HTTP/2 are spoken to over HTTP/1.1. Responses are
+    decompressed by httpx and returned as requests responses, so the cache,
+    archive and HttpClient work unchanged. Session proxies are not applied.
+    """
+
+    def __init__(self, pool_connections: int = POOL_CONNECTIONS, pool_maxsize: int = 10,
+                 pool_block: bool = POOL_BLOCK, **kwargs) -> None:
+        """
+        Initialize the HTTPXAdapter.
+
+        Args:
+            pool_connections (int): Unused, accepted like HTTPAdapter's.
+            pool_maxsize (int): Connections kept alive, across hosts.
+            pool_block (bool): Unused; httpx always waits for a free connection.
+            **kwargs: Passed on to HTTPAdapter.
+        """
+        if httpx is None or importlib.util.find_spec("h2") is None:
+            raise ImportError(HTTPX_MISSING)
+        super().__init__(pool_connections=pool_connections, pool_maxsize=pool_maxsize, pool_block=pool_block, **kwargs)
+        self.client = httpx.Client(
+            http2=True,
+            limits=httpx.Limits(max_connections=pool_maxsize, max_keepalive_connections=pool_maxsize)
+        )
+
+    def send(self, request: requests.PreparedRequest, stream: bool = False, timeout=None,
+             verify=True, cert=None, proxies=None) -> requests.Response:
+        """Send a request through the httpx client."""
+        if isinstance(timeout, tuple):
+            connect, read = timeout
+            timeout = httpx.Timeout(read, connect=connect)
+        headers = {name: value for name, value in request.headers.items() if name.lower() not in HOP_BY_HOP_HEADERS}
+        try:
+            reply = self.client.request(request.method, request.url, headers=headers,
+                                        content=request.body, timeout=timeout)
+        except httpx.TimeoutException as e:
+            raise requests.Timeout(e, request=request)
+        except httpx.TransportError as e:
+            raise requests.ConnectionError(e, request=request)
+        response = requests.Response()
+        response.status_code = reply.status_code
+        response.reason = reply.reason_phrase
+        response.url = str(reply.url)
+        response.request = request
+        response.connection = self
+        response.headers = CaseInsensitiveDict(reply.headers)
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.elapsed = timedelta(seconds=reply.elapsed.total_seconds())
+        response._content = reply.content
+        response.http_version = reply.http_version
+        response.wire_bytes = reply.num_bytes_downloaded
+        return response
+
+    def close(self) -> None:
+        self.client.close()
+        super().close()
+
+
+class CachingHTTPXAdapter(CachingAdapter, HTTPXAdapter):
+    """CachingAdapter whose cache misses and revalidations go over HTTP/2."""
+
+
+def build_session(
+    pool_maxsize: int = 10,
+    cache: Optional[HTTPCache] = None,
+    replay: Optional[PageArchive] = None,
+    http2: bool = HTTP2
+) -> requests.Session:
+    """
+    Create a session for the scraper.
+
+    Connections are kept alive in pools of pool_maxsize per host; with
+    POOL_BLOCK a request waits for a pooled connection rather than opening
+    one that is closed afterwards. Compressed responses are requested with
+    every encoding urllib3 can decode (gzip and deflate, plus br with brotli
+    installed).
+
+    Args:
+        pool_maxsize (int): Connections kept alive per host; at least the number of requests in flight.
+        cache (Optional[HTTPCache]): Cache answering requests before they reach the network.
+        replay (Optional[PageArchive]): Archive answering every request instead of the network.
+        http2 (bool): Send requests over HTTP/2 through httpx.
+
+    Returns:
+        requests.Session: The configured session.
+    """
+    session = requests.Session()
+    session.headers["Accept-Encoding"] = ACCEPT_ENCODING.replace(",", ", ")
+    pool = dict(pool_connections=POOL_CONNECTIONS, pool_maxsize=pool_maxsize, pool_block=POOL_BLOCK)
+    adapter: BaseAdapter
+    if replay is not None:
+        adapter = ReplayAdapter(replay)
+    elif cache is not None:
+        adapter = CachingHTTPXAdapter(cache, **pool) if http2 else CachingAdapter(cache, **pool)
+    else:
+        adapter = HTTPXAdapter(**pool) if http2 else HTTPAdapter(**pool)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
@@ -0,0 +1,283 @@
+"""
+Durable work queue for crawls that survive restarts and run on several processes.
+"""
+import json
+import multiprocessing
+import os
+import sqlite3
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+
+from .config import (
+    MAX_JOBS,
+    METRICS_REPORT_FILE,
+    QUEUE_LEASE_SECONDS,
+    QUEUE_MAX_ATTEMPTS,
+    QUEUE_PATH,
+    QUEUE_WORKERS,
+    REQUESTS_PER_SECOND
+)
+from .metrics import metrics
+from .models import JobListing
+
+# Task kinds: a results page offset, or a job detail URL
+PAGE = "page"
+DETAIL = "detail"
+
+
+@dataclass
+class Task:
+    """A claimed task."""
+    id: int
+    kind: str
+    key: str
+    payload: Optional[dict]
+    attempts: int
+
+
+class WorkQueue:
+    """
+    SQLite-backed queue of page and detail tasks shared by worker processes.
+
+    A task is claimed with a lease: it belongs to the worker until the worker
+    completes or fails it, or until the lease expires, after which any worker
+    can claim it again. A worker restarted under the same id takes back its
+    own leased tasks at once. Every state change is committed immediately, so
+    a crashed or interrupted crawl resumes from the last completed task.
+    Tasks are unique by kind and key, which also makes adding the same
+    detail URL twice a no-op.
+    """
+
+    def __init__(
+        self,
+        path: str = QUEUE_PATH,
+        lease_seconds: float = QUEUE_LEASE_SECONDS,
+        max_attempts: int = QUEUE_MAX_ATTEMPTS
+    ) -> None:
+        """
+        Initialize the WorkQueue.
+
+        Args:
+            path (str): Path to the queue database.
+            lease_seconds (float): How long a claimed task stays with its worker.
+            max_attempts (int): Attempts per task before it is marked as failed.
+        """
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        # Autocommit mode: transactions are opened explicitly where needed
+        self._db = sqlite3.connect(path, timeout=30, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS tasks ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, kind TEXT NOT NULL, key TEXT NOT NULL, "
+            "payload TEXT, status TEXT NOT NULL DEFAULT 'pending', attempts INTEGER NOT NULL DEFAULT 0, "
+            "owner TEXT, lease_expires REAL, result TEXT, error TEXT, "
+            "UNIQUE (kind, key))"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS tasks_status ON tasks (status, kind, id)")
+
+    def add(self, kind: str, key: str, payload: Optional[dict] = None) -> bool:
+        """
+        Add a task unless one with the same kind and key exists.
+
+        Args:
+            kind (str): PAGE or DETAIL.
+            key (str): The page offset or detail URL.
+            payload (Optional[dict]): Data the worker needs, e.g. the job summary.
+
+        Returns:
+            bool: Whether the task was added.
+        """
+        cursor = self._db.execute(
+            "INSERT OR IGNORE INTO tasks (kind, key, payload) VALUES (?, ?, ?)",
+            (kind, key, json.dumps(payload, ensure_ascii=False) if payload is not None else None)
+        )
+        return cursor.rowcount == 1
+
+    def claim(self, worker: str) -> Optional[Task]:
+        """
+        Lease the next available task to a worker.
+
+        Page tasks come first, so paging keeps going while workers fetch details.
+
+        Args:
+            worker (str): The worker's id.
+
+        Returns:
+            Optional[Task]: The claimed task, or None if no task is available right now.
+        """
+        now = time.time()
+        self._db.execute("BEGIN IMMEDIATE")
+        try:
+            row = self._db.execute(
+                "SELECT id, kind, key, payload, attempts FROM tasks "
+                "WHERE status = 'pending' OR (status = 'leased' AND (lease_expires < ? OR owner = ?)) "
+                "ORDER BY kind = ?, id LIMIT 1",
+                (now, worker, DETAIL)
+            ).fetchone()
+            if row is not None:
+                self._db.execute(
+                    "UPDATE tasks SET status = 'leased', owner = ?, lease_expires = ? WHERE id = ?",
+                    (worker, now + self.lease_seconds, row[0])
+                )
+            self._db.execute("COMMIT")
+        except BaseException:
+            self._db.execute("ROLLBACK")
+            raise
+        if row is None:
+            return None
+        return Task(row[0], row[1], row[2], json.loads(row[3]) if row[3] is not None else None, row[4])
+
+    def complete(self, task: Task, result: Optional[dict] = None) -> None:
+        """
+        Mark a task as done and store its result.
+
+        Args:
+            task (Task): The claimed task.
+            result (Optional[dict]): The result, e.g. the scraped job details.
+        """
+        self._db.execute(
+            "UPDATE tasks SET status = 'done', owner = NULL, lease_expires = NULL, result = ?, error = NULL "
+            "WHERE id = ?",
+            (json.dumps(result, ensure_ascii=False) if result is not None else None, task.id)
+        )
+
+    def fail(self, task: Task, error: str) -> None:
+        """
+        Return a task to the queue after an error, or mark it as failed after max_attempts.
+
+        Args:
+            task (Task): The claimed task.
+            error (str): Description of the error.
+        """
+        status = 'failed' if task.attempts + 1 >= self.max_attempts else 'pending'
+        self._db.execute(
+            "UPDATE tasks SET status = ?, attempts = attempts + 1, owner = NULL, lease_expires = NULL, error = ? "
+            "WHERE id = ?",
+            (status, error, task.id)
+        )
+
+    def counts(self, kind: Optional[str] = None) -> Dict[str, int]:
+        """
+        Count the tasks by status.
+
+        Args:
+            kind (Optional[str]): Only count tasks of this kind.
+
+        Returns:
+            Dict[str, int]: Number of tasks per status ('pending', 'leased', 'done', 'failed').
+        """
+        query = "SELECT status, COUNT(*) FROM tasks"
+        params = ()
+        if kind is not None:
+            query += " WHERE kind = ?"
+            params = (kind,)
+        return dict(self._db.execute(query + " GROUP BY status", params).fetchall())
+
+    def total(self, kind: str) -> int:
+        """Count the tasks of one kind, whatever their status."""
+        return self._db.execute("SELECT COUNT(*) FROM tasks WHERE kind = ?", (kind,)).fetchone()[0]
+
+    def finished(self) -> bool:
+        """Whether the queue has tasks and none of them is pending or leased."""
+        counts = self.counts()
+        return bool(counts) and not counts.get('pending') and not counts.get('leased')
+
+    def iter_jobs(self) -> Iterator[JobListing]:
+        """
+        Yield the scraped jobs in the order their listings were found.
+
+        Yields:
+            JobListing: Each completed detail task's job summary with its details.
+        """
+        rows = self._db.execute(
+            "SELECT payload, result FROM tasks WHERE kind = ? AND status = 'done' ORDER BY id", (DETAIL,)
+        )
+        for payload, result in rows:
+            job = JobListing.from_dict(json.loads(payload))
+            job.details.update(json.loads(result) if result else {})
+            yield job
+
+    def reset(self) -> None:
+        """Remove every task, to start a new crawl."""
+        self._db.execute("DELETE FROM tasks")
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._db.close()
+
+
+def _run_worker(path: str, worker: str, max_jobs: int, requests_per_second: float, rate_share: float,
+                report_dir: Optional[str]) -> None:
+    """Entry point of a worker process; its metrics go to a run report of its own."""
+    from .logger import shutdown_logging
+    from .scraper import JobScraper
+    metrics.reset()
+    queue = WorkQueue(path)
+    try:
+        with JobScraper(max_jobs=max_jobs, requests_per_second=requests_per_second, rate_share=rate_share) as scraper:
+            scraper.work(queue, worker)
+    finally:
+        queue.close()
+        if METRICS_REPORT_FILE:
+            report_file = METRICS_REPORT_FILE
+            if report_dir is not None:
+                report_file = os.path.join(report_dir, os.path.basename(report_file))
+            root, ext = os.path.splitext(report_file)
+            metrics.write_json(f"{root}.{worker}{ext}")
+        # Worker processes exit without running atexit handlers, so buffered log records are written here
+        shutdown_logging()
+
+
+def crawl(
+    path: str = QUEUE_PATH,
+    workers: int = QUEUE_WORKERS,
+    max_jobs: int = MAX_JOBS,
+    requests_per_second: float = REQUESTS_PER_SECOND,
+    output_dir: Optional[str] = None
+) -> WorkQueue:
+    """
+    Crawl the site with several worker processes sharing one queue.
+
+    An unfinished crawl in the queue is resumed; a finished one is cleared
+    and a new crawl starts from the first results page. The request rate, and
+    the bounds adaptive throttling keeps it in, are split evenly between the
+    workers.
+
+    Args:
+        path (str): Path to the queue database.
+        workers (int): The number of worker processes.
+        max_jobs (int): The maximum number of jobs to scrape.
+        requests_per_second (float): The rate limit shared by all workers.
+        output_dir (Optional[str]): Directory for the workers' run reports.
+            Defaults to the directory of METRICS_REPORT_FILE.
+
+    Returns:
+        WorkQueue: The queue, whose iter_jobs yields the scraped jobs.
+    """
+    queue = WorkQueue(path)
+    if queue.finished():
+        queue.reset()
+    queue.add(PAGE, "0")
+    processes = [
+        multiprocessing.Process(
+            target=_run_worker,
+            args=(path, f"worker-{i}", max_jobs, requests_per_second, 1 / workers, output_dir),
+            name=f"worker-{i}"
+        )
+        for i in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        for process in processes:
+            process.terminate()
+        raise
+    return queue
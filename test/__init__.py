@@ -0,0 +1,12 @@
+import atexit
+import shutil
+import tempfile
+
+# Tests log to a temporary directory instead of logs/. Registered before the
+# logger module is imported, so it is removed after the log files are closed.
+LOG_DIR = tempfile.mkdtemp(prefix='scraper_test_logs_')
+atexit.register(shutil.rmtree, LOG_DIR, ignore_errors=True)
+
+from src.scraper import logger  # noqa: E402
+
+logger.LOG_DIR = LOG_DIR
@@ -0,0 +1,105 @@
+import json
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from src.scraper.analysis import SalaryAnalyzer, SalaryStats, parse_salaries, parse_salary
+from src.scraper.stats import SalaryAccumulator
+from src.scraper.models import JobListing
+
+
+def make_job(location, salary, company='UAB Įmonė', posted_date='2024-05-12'):
+    return JobListing('Darbas', company, location, posted_date, salary, 'https://uzt.lt/job', {})
+
+
+class TestSalaryAnalyzer(unittest.TestCase):
+    def test_parse_salary_forms(self):
+        self.assertEqual(parse_salary('1000-2000'), 1500.0)
+        self.assertEqual(parse_salary('1 800 – 2 400 € / per mėn.'), 2100.0)
+        self.assertEqual(parse_salary('nuo 1200,50 €'), 1200.5)
+        self.assertEqual(parse_salary('iki 3000 €'), 3000.0)
+        self.assertIsNone(parse_salary('–'))
+
+        low, high, mid = parse_salaries(['nuo 1000 iki 2000', 'iki 900', '–', None, 'nuo 1000 iki 2000'])
+        np.testing.assert_array_equal(low, [1000, np.nan, np.nan, np.nan, 1000])
+        np.testing.assert_array_equal(high, [2000, 900, np.nan, np.nan, 2000])
+        np.testing.assert_array_equal(mid, [1500, 900, np.nan, np.nan, 1500])
+
+    def test_statistics_and_location_means(self):
+        jobs = [
+            make_job('Vilnius', '1000-2000'),
+            make_job('Kaunas', '–'),
+            make_job('Kaunas', '1200 €'),
+            make_job('Vilnius', '2500 €'),
+        ]
+        analyzer = SalaryAnalyzer(jobs)
+        stats = analyzer.get_statistics()
+        self.assertEqual(stats.valid_salaries_count, 3)
+        self.assertEqual(stats.total_jobs, 4)
+        self.assertAlmostEqual(stats.mean, (1500 + 1200 + 2500) / 3)
+        self.assertEqual(analyzer.get_salary_by_location(), {'Vilnius': 2000.0, 'Kaunas': 1200.0})
+
+    def test_group_by_matches_pandas(self):
+        rng = np.random.default_rng(3)
+        locations = ['Vilnius', 'Kaunas', 'Klaipėda', 'Šiauliai']
+        companies = ['UAB A', 'UAB B', 'UAB C']
+        dates = ['2024-05-06', '2024-05-12', '2024-05-13', '2024.05.21', 'vakar']
+        jobs = [
+            make_job(
+                locations[rng.integers(4)],
+                f'{rng.integers(800, 4000)} €' if rng.random() > 0.2 else '–',
+                companies[rng.integers(3)],
+                dates[rng.integers(5)]
+            )
+            for _ in range(500)
+        ]
+        analyzer = SalaryAnalyzer(jobs)
+        result = analyzer.group_by(['location', 'company', 'week'])
+
+        frame = pd.DataFrame({
+            'location': [job.location for job in jobs],
+            'company': [job.company for job in jobs],
+            'week': [{'2024-05-06': '2024-05-06', '2024-05-12': '2024-05-06', '2024-05-13': '2024-05-13',
+                      '2024.05.21': '2024-05-20'}.get(job.posted_date) for job in jobs],
+            'salary': analyzer.get_salary_columns()['mid']
+        }).dropna()
+        grouped = frame.groupby(['location', 'company', 'week'], sort=False)['salary']
+        expected = pd.DataFrame({
+            'count': grouped.count(),
+            'mean': grouped.mean(),
+            'median': grouped.median(),
+            'p90': grouped.quantile(0.9)
+        })
+        self.assertEqual(list(result.index), list(expected.index))
+        np.testing.assert_array_equal(result['count'], expected['count'])
+        np.testing.assert_allclose(result[['mean', 'median', 'p90']], expected[['mean', 'median', 'p90']])
+        self.assertEqual(set(result.index.get_level_values('week')), {'2024-05-06', '2024-05-13', '2024-05-20'})
+
+    def test_streaming_statistics_match_exact(self):
+        rng = np.random.default_rng(7)
+        salaries = np.round(rng.lognormal(7.3, 0.4, 20000))
+        salaries[::50] = np.nan
+
+        shards = []
+        for shard in np.array_split(salaries, 3):
+            accumulator = SalaryAccumulator()
+            for chunk in np.array_split(shard, 7):
+                accumulator.update(chunk)
+            shards.append(SalaryAccumulator.from_dict(json.loads(json.dumps(accumulator.to_dict()))))
+        merged = shards[0]
+        for shard in shards[1:]:
+            merged.merge(shard)
+
+        stats = SalaryStats.from_accumulator(merged)
+        valid = salaries[~np.isnan(salaries)]
+        self.assertEqual(stats.total_jobs, len(salaries))
+        self.assertEqual(stats.valid_salaries_count, len(valid))
+        self.assertAlmostEqual(stats.mean, np.mean(valid), places=6)
+        self.assertAlmostEqual(stats.std, np.std(valid), places=6)
+        self.assertEqual((stats.min, stats.max), (np.min(valid), np.max(valid)))
+        exact = np.percentile(valid, [25, 50, 75])
+        np.testing.assert_array_less(np.abs(stats.quartiles - exact), 0.01 * exact + 1e-9)
+
+if __name__ == '__main__':
+    unittest.main()
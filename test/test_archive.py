@@ -0,0 +1,74 @@
+import tempfile
+import unittest
+
+import requests
+
+from src.scraper.archive import PageArchive, ReplayAdapter
+from src.scraper.scraper import JobScraper
+from test.test_parsers import DETAIL_PAGE, LISTING_PAGE
+
+
+class TestPageArchive(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_append_and_reopen(self):
+        archive = PageArchive(self.directory.name, segment_bytes=600)
+        for i in range(5):
+            archive.append(f'https://uzt.lt/job/{i}', DETAIL_PAGE.replace('2 metai', f'{i} metai').encode('utf-8'))
+        archive.append('https://uzt.lt/job/0', b'<p>Atnaujinta</p>')
+        archive.close()
+
+        archive = PageArchive(self.directory.name, segment_bytes=600)
+        self.assertEqual(len(archive), 5)
+        self.assertEqual(archive.get('https://uzt.lt/job/0').body, b'<p>Atnaujinta</p>')
+        self.assertIn('3 metai', archive.get('https://uzt.lt/job/3').body.decode('utf-8'))
+        self.assertIsNone(archive.get('https://uzt.lt/job/9'))
+        self.assertEqual(
+            [url for url, details in archive.reparse_details() if details.get('Turima patirtis')],
+            [f'https://uzt.lt/job/{i}' for i in range(1, 5)]
+        )
+        archive.close()
+
+    def test_replay_scrape(self):
+        archive = PageArchive(self.directory.name)
+        archive.append('https://uzt.lt/laisvos-darbo-vietos/436/results', LISTING_PAGE.encode('utf-8'))
+        archive.append('https://uzt.lt/laisvos-darbo-vietos/436/job/1001', DETAIL_PAGE.encode('utf-8'))
+
+        scraper = JobScraper(replay=archive)
+        jobs = list(scraper.iter_jobs())
+        archive.close()
+
+        self.assertEqual([job.title for job in jobs], ['Teisininkas (-ė)', 'Vairuotojas'])
+        self.assertEqual(jobs[0].details['Darbo laikas'], 'Pilnas etatas')
+        self.assertIn('Klaida', jobs[1].details)
+
+    def test_redirected_and_non_utf8_pages(self):
+        archive = PageArchive(self.directory.name)
+
+        def response(url, status, body=b'', headers=None):
+            reply = requests.Response()
+            reply.url, reply.status_code, reply._content = url, status, body
+            reply.headers.update(headers or {})
+            return reply
+
+        # The hook sees the redirect first, then the page it leads to
+        archive.record_response(response('https://uzt.lt/job/1', 301, headers={'Location': '/job/1-naujas'}))
+        archive.record_response(response(
+            'https://uzt.lt/job/1-naujas', 200, DETAIL_PAGE.replace('2 metai', 'Sutarčių').encode('cp1257'),
+            {'Content-Type': 'text/html; charset=windows-1257'}
+        ))
+        self.assertIsNone(archive.get('https://uzt.lt/job/1-naujas'))
+        self.assertEqual(archive.get('https://uzt.lt/job/1').final_url, 'https://uzt.lt/job/1-naujas')
+
+        session = requests.Session()
+        session.mount('https://', ReplayAdapter(archive))
+        self.assertEqual(session.get('https://uzt.lt/job/1').url, 'https://uzt.lt/job/1-naujas')
+        self.assertEqual(dict(archive.reparse_details())['https://uzt.lt/job/1']['Turima patirtis'], 'Sutarčių')
+        archive.close()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,27 @@
+import json
+import os
+import tempfile
+import unittest
+
+from benchmarks.run import main
+
+
+class TestBenchmarks(unittest.TestCase):
+    def test_small_run_writes_results(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            output = os.path.join(tmpdir, 'bench.json')
+            main([
+                '--scrape-jobs', '30', '--workers', '1', '4', '--latency', '0', '--error-rate', '0.1',
+                '--parse-pages', '2', '--storage-jobs', '50', '--sizes', '200', '--output', output
+            ])
+            with open(output, encoding='utf-8') as f:
+                results = json.load(f)['results']
+
+        self.assertEqual([run['jobs'] for run in results['scrape']], [30, 30])
+        self.assertEqual(set(results['parse']), {'lxml', 'bs4'})
+        self.assertIn('csv', results['storage'])
+        self.assertEqual(results['analysis'][0]['jobs'], 200)
+        self.assertIn('similarity_compute_seconds', results['analysis'][0])
+
+if __name__ == '__main__':
+    unittest.main()
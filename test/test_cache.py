@@ -0,0 +1,73 @@
+import io
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from src.scraper.cache import HTTPCache, CachingAdapter
+
+
+def make_response(request, status, body=b'', headers=None):
+    response = requests.Response()
+    response.status_code = status
+    response.url = request.url
+    response.request = request
+    response.headers.update(headers or {})
+    response._content = body
+    response.raw = io.BytesIO(body)
+    return response
+
+
+class TestHTTPCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.session = requests.Session()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def mount(self, cache):
+        self.session.mount('https://', CachingAdapter(cache))
+
+    def test_revalidates_expired_entry_with_validators(self):
+        cache = HTTPCache(self.directory, ttl_rules=[], default_ttl=0)
+        self.mount(cache)
+        sent = []
+
+        def fake_send(adapter, request, **kwargs):
+            sent.append(dict(request.headers))
+            if len(sent) == 1:
+                return make_response(request, 200, '<p>Skelbimas</p>'.encode('utf-8'), {'ETag': '"v1"'})
+            return make_response(request, 304)
+
+        with patch.object(HTTPAdapter, 'send', fake_send):
+            first = self.session.get('https://uzt.lt/job1')
+            second = self.session.get('https://uzt.lt/job1')
+
+        self.assertEqual(first.content, second.content)
+        self.assertEqual(second.status_code, 200)
+        self.assertTrue(second.from_cache)
+        self.assertNotIn('If-None-Match', sent[0])
+        self.assertEqual(sent[1]['If-None-Match'], '"v1"')
+
+    def test_fresh_entries_skip_network_and_lru_evicts(self):
+        cache = HTTPCache(self.directory, max_bytes=25, ttl_rules=[(r'/results', 3600)], default_ttl=0)
+        self.mount(cache)
+
+        with patch.object(HTTPAdapter, 'send', lambda adapter, request, **kwargs: make_response(request, 200, b'x' * 10)):
+            self.session.get('https://uzt.lt/results')
+            self.session.get('https://uzt.lt/job1')
+            self.session.get('https://uzt.lt/results')
+            self.session.get('https://uzt.lt/job2')
+
+        self.assertTrue(cache.has_fresh('https://uzt.lt/results'))
+        self.assertFalse(cache.has_fresh('https://uzt.lt/job1'))
+        self.assertIsNone(cache.get('https://uzt.lt/job1'))
+        self.assertIsNotNone(cache.get('https://uzt.lt/job2'))
+        self.assertLessEqual(cache.total_size(), 25)
+
+if __name__ == '__main__':
+    unittest.main()
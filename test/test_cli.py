@@ -0,0 +1,92 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from src.scraper.cli import main
+from src.scraper.models import JobListing
+from src.scraper.storage import JSONLStorage, load_table
+
+from . import LOG_DIR
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def make_jobs():
+    return [
+        JobListing('Teisininkas (-ė)', 'UAB Teisė', 'Vilnius', '2024-05-12', '2000 €', 'https://uzt.lt/job1',
+                   {'Darbo aprašymas': 'Sutarčių rengimas ir konsultacijos'}),
+        JobListing('Vairuotojas', 'UAB Transportas', 'Kaunas', '2024-05-13', 'Nuo 1500 €', 'https://uzt.lt/job2',
+                   {'Darbo aprašymas': 'Krovinių vežimas po Lietuvą'}),
+    ]
+
+
+class TestCli(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.dataset = os.path.join(self.tmpdir.name, 'uzt_adds.jsonl')
+        JSONLStorage(self.dataset).save(make_jobs())
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    @patch('requests.Session.get', side_effect=AssertionError('no network access expected'))
+    def test_commands_on_stored_data(self, mock_get):
+        out = self.tmpdir.name
+        csv_path = os.path.join(out, 'copy.csv')
+        index = os.path.join(out, 'index')
+
+        self.assertEqual(main(['export', self.dataset, csv_path, '--output-dir', out]), 0)
+        self.assertFalse(os.path.exists(os.path.join(out, 'run_report.json')))
+        self.assertEqual([job.url for job in load_table(csv_path)], ['https://uzt.lt/job1', 'https://uzt.lt/job2'])
+        self.assertEqual(main(['analyze', '--output-dir', out]), 0)
+        with open(os.path.join(out, 'salary_analysis.json'), encoding='utf-8') as f:
+            self.assertEqual(json.load(f)['statistics']['total_jobs'], 2)
+        self.assertEqual(main(['rank', '--input', csv_path, '--index', index, '--output-dir', out]), 0)
+        with open(os.path.join(out, 'similarity_rankings.csv'), encoding='utf-8') as f:
+            self.assertIn('Teisininkas (-ė)', f.readlines()[1])
+        self.assertTrue(os.path.exists(os.path.join(out, 'run_report.json')))
+        self.assertEqual(main(['analyze', '--input', os.path.join(out, 'missing.jsonl'), '--output-dir', out]), 1)
+        mock_get.assert_not_called()
+
+        # Ranking on the saved index loads neither scikit-learn nor the scraping stack
+        code = (
+            "import sys; sys.path.insert(0, 'src'); import scraper.logger; "
+            f"scraper.logger.LOG_DIR = {LOG_DIR!r}; from scraper.cli import main; "
+            f"main(['rank', '--index', {index!r}, '--output-dir', {out!r}]); "
+            "print(sorted(m for m in ('sklearn', 'pandas', 'requests', 'bs4') if m in sys.modules))"
+        )
+        result = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, check=True)
+        self.assertEqual(result.stdout.strip().splitlines()[-1], '[]')
+
+    def test_rank_refits_on_later_dataset(self):
+        out = self.tmpdir.name
+        index = os.path.join(out, 'index')
+        second = os.path.join(out, 'second.jsonl')
+        JSONLStorage(second).save([
+            JobListing('Programuotojas (-a)', 'UAB Kodas', 'Vilnius', '2024-05-14', '3000 €', 'https://uzt.lt/job3',
+                       {'Darbo aprašymas': 'Python programavimas ir duomenų bazės'}),
+        ])
+        profiles = os.path.join(out, 'profiles.json')
+        with open(profiles, 'w', encoding='utf-8') as f:
+            json.dump({'programuotojas': {'Darbo pobūdis': 'Programuotojas',
+                                         'Darbo aprašymas': 'Python programavimas, duomenų bazės'}}, f)
+
+        # The second dataset's terms are unknown to the index fitted on the first one; adding it
+        # grows the index past SIMILARITY_REFIT_FRACTION, which refits it
+        for dataset in (self.dataset, second):
+            self.assertEqual(main(['rank', '--input', dataset, '--index', index, '--profiles', profiles,
+                                   '--all-indexed', '--output-dir', out]), 0)
+        with open(os.path.join(out, 'similarity_rankings.csv'), encoding='utf-8') as f:
+            rows = f.readlines()[1:]
+        self.assertEqual(len(rows), 3)
+        title, score = rows[0].split(',')[2], float(rows[0].strip().split(',')[-1])
+        self.assertEqual(title, 'Programuotojas (-a)')
+        self.assertGreater(score, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
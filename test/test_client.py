@@ -0,0 +1,72 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+import requests
+
+from src.scraper.client import HttpClient, parse_retry_after
+from src.scraper.scraper import JobScraper
+from src.scraper.throttle import AdaptiveRateLimiter
+
+
+def status_response(status_code, headers=None):
+    return MagicMock(status_code=status_code, headers=headers or {}, content=b'')
+
+
+class TestHttpClient(unittest.TestCase):
+    @patch('src.scraper.client.random.uniform', return_value=0.5)
+    @patch('src.scraper.client.time.sleep')
+    def test_retries_with_backoff_and_retry_after(self, mock_sleep, mock_uniform):
+        session = MagicMock()
+        session.get.side_effect = [
+            requests.Timeout('timed out'),
+            status_response(503),
+            status_response(429, {'Retry-After': '7'}),
+            status_response(200),
+        ]
+        limiter = AdaptiveRateLimiter(1, min_rate=0.1, max_rate=2)
+        client = HttpClient(session, limiter, max_retries=3, retry_delay=1)
+
+        response = client.get('https://uzt.lt/job1', throttle=False)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([call.args[0] for call in mock_sleep.call_args_list], [1.5, 2.5, 7.0])
+        # One back-off for the burst of failures, then one increase for the fast success
+        self.assertAlmostEqual(limiter.rate, 0.5 + limiter.increase)
+
+        session.get.side_effect = [requests.ConnectionError('refused')] * 4
+        with self.assertRaises(requests.ConnectionError):
+            client.get('https://uzt.lt/job2', throttle=False)
+        self.assertEqual(session.get.call_count, 8)
+
+    def test_adaptive_rate_limits(self):
+        limiter = AdaptiveRateLimiter(1, min_rate=0.25, max_rate=1.2, increase=0.1, latency_target=1)
+        for _ in range(5):
+            limiter.record_success(0.1)
+        self.assertAlmostEqual(limiter.rate, 1.2)
+        limiter.record_success(10)
+        self.assertAlmostEqual(limiter.rate, 0.6)
+        limiter._last_decrease = float('-inf')
+        limiter.record_failure()
+        limiter._last_decrease = float('-inf')
+        limiter.record_failure()
+        self.assertAlmostEqual(limiter.rate, 0.25)
+
+        self.assertEqual(parse_retry_after('120'), 120.0)
+        self.assertEqual(parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT'), 0.0)
+        self.assertIsNone(parse_retry_after(None))
+
+    @patch('src.scraper.client.time.sleep')
+    @patch('src.scraper.scraper.time.sleep')
+    @patch('requests.Session.get')
+    def test_failed_results_page_is_skipped(self, mock_get, mock_page_sleep, mock_retry_sleep):
+        page = MagicMock(status_code=200, content='<div class="list"><a href="/job1">Job 1</a></div>'.encode('utf-8'))
+        mock_get.side_effect = [requests.ConnectionError('refused')] * 4 + [page]
+        scraper = JobScraper(max_jobs=1)
+
+        scraper.get_listing_links()
+
+        self.assertEqual([job.url for job in scraper.jobs], ['https://uzt.lt/job1'])
+        self.assertTrue(mock_get.call_args_list[-1].args[0].endswith('/results/p20'))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+import unittest
+
+import numpy as np
+
+from src.scraper.dedup import DuplicateDetector, deduplicate, duplicate_mask
+from src.scraper.models import JobListing
+from src.scraper.table import JobTable
+
+DESCRIPTION = (
+    'Ieškome atsakingo teisininko, kuris konsultuotų klientus civilinės teisės klausimais, '
+    'rengtų sutartis, procesinius dokumentus ir atstovautų įmonei teismuose bei kitose institucijose'
+)
+
+
+def make_job(i, title, company, description):
+    return JobListing(title, company, 'Vilnius', '2024-05-12', '2000 €', f'https://uzt.lt/job{i}', {'Darbo aprašymas': description})
+
+
+class TestDeduplicate(unittest.TestCase):
+    def test_reposts_are_clustered(self):
+        jobs = [
+            make_job(0, 'Teisininkas (-ė)', 'UAB Teisė', DESCRIPTION),
+            make_job(1, 'Vairuotojas', 'UAB Transportas', 'Vairuoti krovininį automobilį po Lietuvą ir Europą'),
+            # Reposted under a new URL with a small edit
+            make_job(2, 'Teisininkas (-ė)', 'UAB Teisė', DESCRIPTION + '.'),
+            make_job(3, 'Teisininkas (-ė)', 'UAB Teisė', DESCRIPTION.replace('civilinės', 'darbo')),
+            make_job(4, 'Teisininkas (-ė)', 'UAB Kita', 'Darbas su įmonės dokumentais ir sutartimis'),
+            make_job(5, '', '', ''),
+            make_job(6, '', '', ''),
+        ]
+        detector = DuplicateDetector()
+        unique = list(deduplicate(jobs, detector))
+
+        self.assertEqual([job.url for job in unique], [jobs[i].url for i in (0, 1, 3, 4, 5, 6)])
+        self.assertEqual(detector.clusters(), [[0, 2]])
+        # The same listings read from a table's columns
+        np.testing.assert_array_equal(np.flatnonzero(duplicate_mask(JobTable.from_jobs(jobs))), [2])
+
+        # A lower threshold also catches the edited description
+        detector = DuplicateDetector(threshold=0.6)
+        self.assertEqual([detector.add(job) for job in jobs[:4]], [None, None, 0, 0])
+        self.assertEqual(detector.clusters(), [[0, 2, 3]])
+
+    def test_same_role_in_other_cities_is_kept(self):
+        jobs = [make_job(i, 'Teisininkas (-ė)', 'UAB Teisė', DESCRIPTION) for i in range(3)]
+        jobs[1].location = 'Kaunas'
+        jobs[2].location = 'Vilniaus m.'
+        detector = DuplicateDetector()
+        self.assertEqual([job.url for job in deduplicate(jobs, detector)], [jobs[0].url, jobs[1].url])
+        self.assertEqual(detector.clusters(), [[0, 2]])
+
+if __name__ == '__main__':
+    unittest.main()
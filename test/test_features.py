@@ -0,0 +1,93 @@
+import os
+import tempfile
+import unittest
+from datetime import date
+from unittest import mock
+
+import numpy as np
+
+from src.scraper import features
+from src.scraper.analysis import SalaryAnalyzer, normalize_location
+from src.scraper.features import FeatureStore
+from src.scraper.models import JobListing
+from src.scraper.table import JobTable
+
+
+def make_job(i, location, salary, posted='2024-05-13'):
+    return JobListing(f'Darbas {i}', f'UAB Įmonė {i % 2}', location, posted, salary, f'https://uzt.lt/job{i}',
+                      {'Darbo aprašymas': 'tvarkyti dokumentus'})
+
+
+JOBS = [
+    make_job(0, 'Vilniaus m.', '1 500 - 2 000 €'),
+    make_job(1, 'Vilnius', 'Nuo 1800 €', '2024-05-20'),
+    make_job(2, 'Kauno r. sav.', '1200 €'),
+    make_job(3, 'Kaunas', 'Sutartinis'),
+]
+
+
+class TestFeatures(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'features.sqlite')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_normalize_location(self):
+        self.assertEqual(normalize_location('Vilniaus m.'), 'Vilnius')
+        self.assertEqual(normalize_location('Vilniaus m. sav.'), 'Vilnius')
+        self.assertEqual(normalize_location('Kauno r. sav.'), 'Kauno r.')
+        self.assertEqual(normalize_location('  Kaunas '), 'Kaunas')
+
+    def test_only_changed_listings_are_recomputed(self):
+        FeatureStore(self.path).save(JOBS)
+        changed = JOBS[:3] + [make_job(3, 'Kaunas', '2500 €')]
+        store = FeatureStore(self.path)
+        store.save(changed)
+        self.assertEqual((store.computed, store.reused), (1, 3))
+
+        loaded = store.load(job.url for job in changed)
+        self.assertEqual(list(loaded['location']), ['Vilnius', 'Vilnius', 'Kauno r.', 'Kaunas'])
+        np.testing.assert_array_equal(loaded['salary_mid'], [1750, 1800, 1200, 2500])
+        self.assertEqual(loaded['posted_on'][0], date(2024, 5, 13))
+
+        # A new parser or feature version recomputes every listing
+        with mock.patch.object(features, 'VERSION', '2.1'):
+            store = FeatureStore(self.path)
+            store.save(changed)
+        self.assertEqual((store.computed, store.reused), (4, 0))
+
+    def test_analyzer_results_match_raw_fields(self):
+        table = JobTable.from_jobs(JOBS)
+        store = FeatureStore(self.path)
+        store.save(table)
+        with_features = SalaryAnalyzer(table, store.load(table.column('url')))
+        without = SalaryAnalyzer(table)
+
+        self.assertEqual(with_features.get_salary_by_location(), without.get_salary_by_location())
+        self.assertEqual(set(without.get_salary_by_location()), {'Vilnius', 'Kauno r.'})
+        self.assertTrue(with_features.group_by(['week']).equals(without.group_by(['week'])))
+
+    def test_duplicates_are_flagged_at_ingest(self):
+        repost = make_job(4, 'Vilnius', '1 500 - 2 000 €')
+        repost.title, repost.company = JOBS[0].title, JOBS[0].company
+        jobs = JOBS + [repost]
+        table = JobTable.from_jobs(jobs)
+        store = FeatureStore(self.path)
+        self.assertTrue(store.stale(table))
+        store.save(jobs)
+        self.assertFalse(store.stale(table))
+        urls = [job.url for job in jobs]
+        self.assertEqual(list(store.load(urls)['duplicate']), [False] * 4 + [True])
+        # Without its original, a repost is kept; a URL listed twice is a duplicate of its first row
+        self.assertEqual(list(store.load(urls[1:])['duplicate']), [False] * 4)
+        self.assertEqual(list(store.load(urls[:2] + urls[:1])['duplicate']), [False, False, True])
+
+        # A changed listing makes the table stale
+        changed = JobTable.from_jobs(JOBS[:3] + [make_job(3, 'Kaunas', '2500 €')])
+        self.assertTrue(store.stale(changed))
+
+
+if __name__ == '__main__':
+    unittest.main()
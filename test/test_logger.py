@@ -0,0 +1,48 @@
+import json
+import logging
+import os
+import tempfile
+import unittest
+
+from src.scraper.logger import StageFilter, event, setup_logger, shutdown_logging
+
+
+def make_record(stage=None, level=logging.INFO):
+    record = logging.LogRecord("test", level, __file__, 0, "message", None, None)
+    if stage is not None:
+        record.stage = stage
+    return record
+
+
+class TestLogger(unittest.TestCase):
+    def test_setup_is_idempotent_and_writes_text_and_json_logs(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            logger = setup_logger("test_logger", tmpdir)
+            self.assertIs(setup_logger("test_logger", tmpdir), logger)
+            self.assertEqual(len(logger.handlers), 1)
+            logger.info("Surinkta: Teisininkas (-ė)", extra=event("results", url="https://uzt.lt/job1"))
+            shutdown_logging("test_logger")
+
+            files = sorted(os.listdir(tmpdir))
+            self.assertEqual([os.path.splitext(f)[1] for f in files], [".jsonl", ".log"])
+            with open(os.path.join(tmpdir, files[1]), encoding="utf-8") as f:
+                self.assertEqual(f.read().count("Surinkta: Teisininkas (-ė)"), 1)
+            with open(os.path.join(tmpdir, files[0]), encoding="utf-8") as f:
+                record = json.loads(f.readline())
+            self.assertEqual(record["stage"], "results")
+            self.assertEqual(record["url"], "https://uzt.lt/job1")
+            self.assertEqual(record["message"], "Surinkta: Teisininkas (-ė)")
+
+    def test_stage_sampling_and_rate_limit(self):
+        sampler = StageFilter(sample_every={"job": 10})
+        passed = [record for record in (make_record("job") for _ in range(25)) if sampler.filter(record)]
+        self.assertEqual(len(passed), 3)
+        self.assertEqual(passed[1].suppressed, 9)
+        self.assertTrue(sampler.filter(make_record("job", logging.ERROR)))
+        self.assertTrue(sampler.filter(make_record()))
+
+        limiter = StageFilter(rate_limits={"results": 2.0})
+        self.assertEqual(sum(limiter.filter(make_record("results")) for _ in range(100)), 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+from src.scraper.metrics import Histogram, Metrics, metrics
+from src.scraper.scraper import JobScraper
+
+
+class TestMetrics(unittest.TestCase):
+    def test_report_and_prometheus(self):
+        registry = Metrics(enabled=True)
+        histogram = Histogram(buckets=(1, 2, 5))
+        for value in (0.5, 1.5, 1.5, 4, 10):
+            histogram.observe(value)
+        self.assertEqual(histogram.counts, [1, 2, 1, 1])
+        self.assertAlmostEqual(histogram.quantile(0.5), 1.75)
+        self.assertEqual(histogram.quantile(1), 10)
+
+        registry.inc('pages_total', kind='results')
+        registry.inc('pages_total', 2, kind='detail')
+        with registry.timer('parse_seconds', page='detail'):
+            pass
+        report = registry.report()
+        self.assertEqual(report['counters'], {'pages_total{kind="detail"}': 2, 'pages_total{kind="results"}': 1})
+        self.assertEqual(report['histograms']['parse_seconds{page="detail"}']['count'], 1)
+        self.assertGreater(report['pages_per_second'], 0)
+
+        text = registry.to_prometheus()
+        self.assertIn('# TYPE uzt_scraper_pages_total counter', text)
+        self.assertIn('uzt_scraper_parse_seconds_bucket{page="detail",le="+Inf"} 1', text)
+        self.assertIn('uzt_scraper_parse_seconds_count{page="detail"} 1', text)
+
+        disabled = Metrics(enabled=False)
+        disabled.inc('pages_total')
+        self.assertEqual(disabled.report()['counters'], {})
+
+    @patch('requests.Session.get')
+    def test_scraper_is_instrumented(self, mock_get):
+        page = '<div class="list"><a href="/job1">Job 1</a></div>'.encode('utf-8')
+        mock_get.side_effect = [
+            MagicMock(status_code=200, content=page),
+            MagicMock(status_code=200, content=b'<div class="content"><p>Darbas</p></div>'),
+        ]
+        metrics.reset()
+        list(JobScraper(max_jobs=1, requests_per_second=1000).iter_jobs())
+
+        self.assertEqual(metrics.counter('pages_total', kind='results'), 1)
+        self.assertEqual(metrics.counter('pages_total', kind='detail'), 1)
+        self.assertEqual(metrics.counter('http_response_bytes_total'), len(page) + 40)
+        self.assertEqual(metrics.histogram('http_request_seconds').count, 2)
+        self.assertEqual(metrics.histogram('parse_seconds', page='detail').count, 1)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'run_report.json')
+            metrics.write_json(path)
+            with open(path, encoding='utf-8') as f:
+                report = json.load(f)
+        self.assertEqual(report['bytes_downloaded'], len(page) + 40)
+        self.assertGreater(report['peak_rss_bytes'], 0)
+
+if __name__ == '__main__':
+    unittest.main()
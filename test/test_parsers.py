@@ -0,0 +1,82 @@
+import unittest
+
+from src.scraper.parallel import ParsePool
+from src.scraper.parsers import LxmlParser, SoupParser, get_parser
+
+LISTING_PAGE = """<!DOCTYPE html>
+<html lang="lt"><head><meta charset="utf-8"><title>Laisvos darbo vietos</title></head>
+<body><main>
+<div class="list">
+  <a href="/laisvos-darbo-vietos/436/job/1001" class="item">
+    <div class="title"><strong> Teisininkas (-ė) </strong><span>Nauja</span></div>
+    <div class="company">UAB &quot;Žalgiris&quot;</div>
+    <div class="location">Vilnius</div>
+    <div class="created-date">Įkelta: 2024-05-12</div>
+    <div class="salary">1 800 - 2 400 €</div>
+  </a>
+  <a href="/laisvos-darbo-vietos/436/job/1002" class="item">
+    <div class="title large"><strong>Vairuotojas&nbsp;</strong></div>
+    <div class="location">Kauno m.</div>
+  </a>
+</div>
+<div class="pagination"><a href="/laisvos-darbo-vietos/436/results/p20">2</a></div>
+</main></body></html>
+"""
+
+DETAIL_PAGE = """<!DOCTYPE html>
+<html lang="lt"><head><meta charset="utf-8"></head>
+<body><main><div class="job meta__list">
+  <div>
+    <h4><strong>Darbo aprašymas:</strong></h4>
+    <p>Dokumentų rengimas;</p>
+    <ul><li>Sutarčių peržiūra</li><li> Konsultacijos </li></ul>
+    <h4><strong>Turima patirtis:</strong></h4>
+    <p>2 metai</p>
+    <h4></h4>
+  </div>
+  <div>
+    <h4><strong>Darbo laikas</strong></h4>
+    <p>Pilnas etatas</p>
+  </div>
+</div></main></body></html>
+"""
+
+
+class TestParsers(unittest.TestCase):
+    def test_lxml_listing_matches_soup(self):
+        content = LISTING_PAGE.encode('utf-8')
+        expected = SoupParser().parse_listing_page(content)
+        self.assertEqual(LxmlParser().parse_listing_page(content), expected)
+        self.assertEqual(expected[0], {
+            'Pavadinimas': 'Teisininkas (-ė)',
+            'Įmonė': 'UAB "Žalgiris"',
+            'Vieta': 'Vilnius',
+            'Paskelbta': '2024-05-12',
+            'Atlyginimas': '1 800 - 2 400 €',
+            'Nuoroda': 'https://uzt.lt/laisvos-darbo-vietos/436/job/1001'
+        })
+        self.assertEqual(expected[1]['Įmonė'], '–')
+        self.assertEqual(len(LxmlParser().parse_listing_page(content, limit=1)), 1)
+
+    def test_lxml_detail_matches_soup(self):
+        content = DETAIL_PAGE.encode('utf-8')
+        expected = SoupParser().parse_detail_page(content)
+        self.assertEqual(get_parser('lxml').parse_detail_page(content), expected)
+        self.assertEqual(expected['Darbo aprašymas'], 'Dokumentų rengimas;; Sutarčių peržiūra; Konsultacijos')
+        self.assertEqual(expected['Skyrius 3'], '–')
+        self.assertEqual(expected['Darbo laikas'], 'Pilnas etatas')
+
+    def test_empty_page(self):
+        self.assertEqual(LxmlParser().parse_listing_page(b''), [])
+        self.assertEqual(LxmlParser().parse_detail_page(b''), {})
+
+    def test_parse_pool_keeps_order(self):
+        pages = [DETAIL_PAGE.replace('2 metai', f'{i} metai').encode('utf-8') for i in range(10)]
+        with ParsePool(workers=2, batch_size=3) as pool:
+            details = list(pool.parse_details(pages))
+            single = pool.parse_detail(pages[4])
+        self.assertEqual([d['Turima patirtis'] for d in details], [f'{i} metai' for i in range(10)])
+        self.assertEqual(single, details[4])
+
+if __name__ == '__main__':
+    unittest.main()
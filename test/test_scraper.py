@@ -1,7 +1,20 @@
 import unittest
 from unittest.mock import patch, MagicMock
 from bs4 import BeautifulSoup
+import os
+import random
+import tempfile
+import time
 from src.scraper.scraper import JobScraper
+from src.scraper.models import JobListing
+from src.scraper.index import SeenIndex
+from src.scraper.parallel import ParsePool
+from test.test_parsers import DETAIL_PAGE
+
+
+def page_response(text):
+    return MagicMock(text=text, content=text.encode('utf-8'))
+
 
 class TestJobScraper(unittest.TestCase):
     def setUp(self):
@@ -17,7 +30,7 @@ class TestJobScraper(unittest.TestCase):
             '<div class="list"><a href="/job7">Job 7</a><a href="/job8">Job 8</a></div>',
             '<div class="list"><a href="/job9">Job 9</a><a href="/job10">Job 10</a></div>'
         ]
-        mock_get.side_effect = [MagicMock(text=response) for response in mock_responses]
+        mock_get.side_effect = [page_response(response) for response in mock_responses]
 
         # Call the method
         self.scraper.get_listing_links()
@@ -35,5 +48,114 @@ class TestJobScraper(unittest.TestCase):
         self.assertEqual(self.scraper.jobs[8].url, 'https://uzt.lt/job9')
         self.assertEqual(self.scraper.jobs[9].url, 'https://uzt.lt/job10')
 
+    def test_enrich_job_details_concurrent_keeps_order(self):
+        scraper = JobScraper(max_concurrent_requests=4, requests_per_second=1000)
+        scraper.jobs = [
+            JobListing(f'Job {i}', '–', '–', '–', '–', f'https://uzt.lt/job{i}', {})
+            for i in range(12)
+        ]
+
+        def fake_details(url):
+            time.sleep(random.uniform(0, 0.02))
+            return {'Darbo aprašymas': url}
+
+        with patch.object(scraper, 'scrape_job_details', side_effect=fake_details) as mock_details:
+            scraper.enrich_job_details()
+
+        self.assertEqual(mock_details.call_count, 12)
+        for job in scraper.jobs:
+            self.assertEqual(job.details['Darbo aprašymas'], job.url)
+
+    @patch('src.scraper.scraper.time.sleep')
+    @patch('requests.Session.get')
+    def test_iter_jobs_streams_before_paging_finishes(self, mock_get, mock_sleep):
+        mock_responses = [
+            '<div class="list"><a href="/job1">Job 1</a><a href="/job2">Job 2</a></div>',
+            '<div class="list"><a href="/job3">Job 3</a></div>',
+            '<div class="list"></div>'
+        ]
+        mock_get.side_effect = [page_response(response) for response in mock_responses]
+
+        with patch.object(self.scraper, 'scrape_job_details', side_effect=lambda url: {'Url': url}):
+            jobs = self.scraper.iter_jobs()
+            first = next(jobs)
+            self.assertEqual(mock_get.call_count, 1)
+            rest = list(jobs)
+
+        self.assertEqual(first.url, 'https://uzt.lt/job1')
+        self.assertEqual(first.details, {'Url': 'https://uzt.lt/job1'})
+        self.assertEqual([job.url for job in rest], ['https://uzt.lt/job2', 'https://uzt.lt/job3'])
+        self.assertEqual(self.scraper.jobs, [])
+
+    @patch('src.scraper.scraper.time.sleep')
+    @patch('requests.Session.get')
+    def test_incremental_run_skips_known_listings(self, mock_get, mock_sleep):
+        pages = [
+            '<div class="list">' + ''.join(f'<a href="/job{i}"><span class="salary">{i}00 €</span></a>' for i in range(start, start + 3)) + '</div>'
+            for start in (1, 4, 7)
+        ]
+        with tempfile.TemporaryDirectory() as directory:
+            index = SeenIndex(os.path.join(directory, 'seen.sqlite'))
+            scraper = JobScraper(seen_index=index, incremental_stop_after=3)
+            mock_get.side_effect = [page_response(page) for page in pages[1:]] + [page_response('')]
+            with patch.object(scraper, 'scrape_job_details', side_effect=lambda url: {'Url': url}):
+                list(scraper.iter_jobs())
+            self.assertEqual(len(index), 6)
+
+            # The newest listings appear in front; job5 changed its salary since the last run
+            pages[1] = pages[1].replace('500 €', '550 €')
+            scraper = JobScraper(seen_index=index, incremental_stop_after=3)
+            mock_get.side_effect = [page_response(page) for page in pages]
+            with patch.object(scraper, 'scrape_job_details', side_effect=lambda url: {'Url': url}) as mock_details:
+                jobs = list(scraper.iter_jobs())
+            index.close()
+
+        fetched = [call.args[0] for call in mock_details.call_args_list]
+        self.assertEqual(fetched, ['https://uzt.lt/job1', 'https://uzt.lt/job2', 'https://uzt.lt/job3', 'https://uzt.lt/job5'])
+        self.assertEqual([job.url for job in jobs], [f'https://uzt.lt/job{i}' for i in range(1, 9)])
+        self.assertEqual(jobs[7].details, {'Url': 'https://uzt.lt/job8'})
+        self.assertEqual(mock_get.call_count, 6)
+
+    @patch('src.scraper.scraper.time.sleep')
+    @patch('requests.Session.get')
+    def test_repeated_urls_are_skipped_before_details(self, mock_get, mock_sleep):
+        # A new listing pushed job2 onto the second page while paging
+        mock_responses = [
+            '<div class="list"><a href="/job1">Job 1</a><a href="/job2">Job 2</a></div>',
+            '<div class="list"><a href="/job2">Job 2</a><a href="/job3">Job 3</a></div>',
+            '<div class="list"><a href="/job3">Job 3</a></div>'
+        ]
+        mock_get.side_effect = [page_response(response) for response in mock_responses]
+
+        with patch.object(self.scraper, 'scrape_job_details', side_effect=lambda url: {'Url': url}) as mock_details:
+            jobs = list(self.scraper.iter_jobs())
+
+        self.assertEqual([job.url for job in jobs], ['https://uzt.lt/job1', 'https://uzt.lt/job2', 'https://uzt.lt/job3'])
+        self.assertEqual(mock_details.call_count, 3)
+        # The last page had nothing new, so paging stopped there
+        self.assertEqual(mock_get.call_count, 3)
+
+    def test_parse_pool_parses_fetched_pages_in_batches(self):
+        pool = ParsePool(workers=2, batch_size=3)
+        jobs = [JobListing(f'Job {i}', '–', '–', '–', '–', f'https://uzt.lt/job{i}', {}) for i in range(8)]
+
+        def fake_page(url):
+            if url.endswith('job5'):
+                raise ValueError('timeout')
+            return DETAIL_PAGE.replace('2 metai', url).encode('utf-8'), 'utf-8'
+
+        with JobScraper(max_concurrent_requests=4, parse_pool=pool) as scraper, \
+                patch.object(pool, 'submit_details', wraps=pool.submit_details) as mock_submit, \
+                patch.object(scraper, '_get_detail_page', side_effect=fake_page):
+            results = list(scraper.fetch_job_details(jobs))
+
+        self.assertEqual([job.url for job, _ in results], [job.url for job in jobs])
+        self.assertEqual(results[0][1]['Turima patirtis'], 'https://uzt.lt/job0')
+        self.assertEqual(results[5][1], {'Klaida': 'timeout'})
+        self.assertEqual([len(call.args[0]) for call in mock_submit.call_args_list], [3, 2, 2])
+        # The pool was passed in, so the scraper leaves it running
+        self.assertEqual(list(pool.parse_details([DETAIL_PAGE.encode('utf-8')]))[0]['Turima patirtis'], '2 metai')
+        pool.close()
+
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
@@ -0,0 +1,112 @@
+import csv
+import os
+import tempfile
+import unittest
+
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from src.scraper.config import REFERENCE_JOB
+from src.scraper.models import JobListing
+from src.scraper.similarity import SimilarityAnalyzer, SimilarityIndex, save_rankings
+
+
+def make_job(i, title, description):
+    return JobListing(title, 'UAB Įmonė', 'Vilnius', '2024-05-12', '1500 €', f'https://uzt.lt/job{i}', {'Darbo aprašymas': description})
+
+
+JOBS = [
+    make_job(0, 'Vairuotojas', 'vairuoti krovininį automobilį'),
+    make_job(1, 'Teisininkas', 'tvarkyti dokumentus, atsakingas'),
+    make_job(2, 'Buhalteris', 'tvarkyti apskaitos dokumentus'),
+    make_job(3, 'Teisininko padėjėjas', 'kruopštus, gebu tvarkyti dokumentus'),
+    make_job(4, 'Virėjas', 'gaminti maistą'),
+]
+
+
+class TestSimilarityIndex(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_top_k_matches_tfidf_and_survives_reload(self):
+        index = SimilarityIndex(self.directory.name, refit_new_terms=0, refit_fraction=0)
+        self.assertEqual(index.add(JOBS[:3]), 3)
+        self.assertEqual(index.add(JOBS[2:]), 2)
+        index.save()
+
+        # Later jobs are transformed with the vocabulary fitted on the first ones
+        analyzer = SimilarityAnalyzer()
+        vectorizer = TfidfVectorizer().fit([analyzer.vectorize_job(job) for job in JOBS[:3]])
+        matrix = vectorizer.transform([analyzer.vectorize_job(job) for job in JOBS])
+        expected = (matrix @ vectorizer.transform([analyzer.vectorize_job(REFERENCE_JOB)]).T).toarray().ravel()
+
+        reloaded = SimilarityIndex(self.directory.name)
+        self.assertEqual(len(reloaded), 5)
+        top = reloaded.top_k(REFERENCE_JOB, 2)
+        self.assertEqual([job.url for job, _ in top], [JOBS[i].url for i in np.argsort(-expected)[:2]])
+        np.testing.assert_allclose(reloaded.scores(REFERENCE_JOB), expected)
+
+        reloaded.add([make_job(5, 'Teisininkas', 'atsakingas')])
+        reloaded.save()
+        self.assertEqual(SimilarityIndex(self.directory.name).top_k(JOBS[1], 1)[0][0].url, JOBS[1].url)
+        self.assertEqual(len(SimilarityIndex(self.directory.name)), 6)
+
+    def test_unknown_terms_wait_for_refit(self):
+        reference = make_job(6, REFERENCE_JOB['Darbo pobūdis'], REFERENCE_JOB['Darbo aprašymas'])
+        index = SimilarityIndex(None, refit_fraction=0)
+        index.add(JOBS[:3])
+        # By default, terms missing from the vocabulary are ignored until a refit
+        index.add([make_job(5, 'Buhalteris', 'tvarkyti dokumentus'), reference])
+        self.assertEqual(index.fitted_documents, 3)
+
+        # refit() relearns them, so the job matches like a fresh fit on every job
+        index.refit()
+        self.assertEqual(index.fitted_documents, 5)
+        top = index.top_k(REFERENCE_JOB, 1)[0]
+        self.assertEqual(top[0].url, 'https://uzt.lt/job6')
+        self.assertGreater(top[1], 0.5)
+
+        # With refit_new_terms, add() refits once added jobs bring that many unknown terms
+        eager = SimilarityIndex(None, refit_new_terms=1, refit_fraction=0)
+        eager.add(JOBS[:3])
+        eager.add([make_job(5, 'Buhalteris', 'tvarkyti dokumentus')])
+        self.assertEqual(eager.fitted_documents, 3)
+        eager.add([reference])
+        self.assertEqual(eager.fitted_documents, 5)
+        # Ranking can be limited to some of the indexed jobs
+        ranked = index.rank_profiles({'r': REFERENCE_JOB}, k=5, urls=[JOBS[0].url, JOBS[2].url])['r']
+        self.assertEqual(sorted(job.url for job, _ in ranked), [JOBS[0].url, JOBS[2].url])
+
+    def test_rank_profiles_in_chunks(self):
+        profiles = {
+            'teisininkas': REFERENCE_JOB,
+            'vairuotojas': {'Darbo pobūdis': 'Vairuotojas', 'Darbo aprašymas': 'vairuoti automobilį'},
+            'virėjas': {'Darbo pobūdis': 'Virėjas'},
+        }
+        index = SimilarityIndex(None)
+        index.add(JOBS)
+        # Five jobs and eleven cells per chunk: two profiles in the first chunk, one in the second
+        rankings = index.rank_profiles(profiles, k=3, chunk_cells=11)
+        for name, profile in profiles.items():
+            self.assertEqual(
+                [(job.url, round(score, 12)) for job, score in rankings[name]],
+                [(job.url, round(score, 12)) for job, score in index.top_k(profile, 3)]
+            )
+        self.assertEqual(rankings['vairuotojas'][0][0].url, JOBS[0].url)
+
+        by_analyzer = SimilarityAnalyzer().rank_profiles(profiles, JOBS, k=1)
+        self.assertEqual({name: ranked[0][0].title for name, ranked in by_analyzer.items()},
+                         {'teisininkas': 'Teisininkas', 'vairuotojas': 'Vairuotojas', 'virėjas': 'Virėjas'})
+
+        path = os.path.join(self.directory.name, 'rankings.csv')
+        save_rankings(path, rankings)
+        with open(path, newline='', encoding='utf-8') as f:
+            rows = list(csv.DictReader(f))
+        self.assertEqual(len(rows), 9)
+        self.assertEqual((rows[3]['Profile'], rows[3]['Rank'], rows[3]['Title']), ('vairuotojas', '1', 'Vairuotojas'))
+
+if __name__ == '__main__':
+    unittest.main()
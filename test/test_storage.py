@@ -0,0 +1,124 @@
+import csv
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from openpyxl import load_workbook
+
+from src.scraper.analysis import SalaryAnalyzer
+from src.scraper.models import JobListing
+from src.scraper.similarity import SimilarityAnalyzer
+from src.scraper.storage import CSVStorage, ExcelStorage, JSONLStorage, ParquetStorage, SQLiteStorage, load_table
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+
+def make_jobs(count):
+    jobs = []
+    for i in range(count):
+        details = {'Darbo aprašymas': f'Aprašymas {i}'}
+        if i >= 3:
+            details['Turima patirtis'] = f'{i} metai'
+        jobs.append(JobListing(f'Darbas {i}', 'UAB Įmonė', 'Vilnius', '2024-05-12', f'{1000 + i} €', f'https://uzt.lt/job{i}', details))
+    return jobs
+
+
+class TestStorage(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def path(self, name):
+        return os.path.join(self.directory.name, name)
+
+    def test_csv_adds_late_columns_to_header(self):
+        path = self.path('jobs.csv')
+        storage = CSVStorage(path, batch_size=2)
+        storage.open()
+        for job in make_jobs(5):
+            storage.append(job)
+        with open(path, newline='', encoding='utf-8') as f:
+            self.assertEqual(len(list(csv.reader(f))), 5)
+        storage.close()
+
+        with open(path, newline='', encoding='utf-8') as f:
+            rows = list(csv.DictReader(f))
+        self.assertEqual(len(rows), 5)
+        self.assertEqual(rows[0]['Turima patirtis'], '')
+        self.assertEqual(rows[4]['Turima patirtis'], '4 metai')
+        self.assertEqual(rows[4]['Nuoroda'], 'https://uzt.lt/job4')
+
+    def test_jsonl_and_excel_round_trip(self):
+        jobs = make_jobs(5)
+        JSONLStorage(self.path('jobs.jsonl'), batch_size=2).save(iter(jobs))
+        with open(self.path('jobs.jsonl'), encoding='utf-8') as f:
+            self.assertEqual([JobListing.from_dict(json.loads(line)) for line in f], jobs)
+
+        with ExcelStorage(self.path('jobs.xlsx'), batch_size=2) as storage:
+            for job in jobs:
+                storage.append(job)
+        rows = list(load_workbook(self.path('jobs.xlsx')).active.values)
+        self.assertEqual(rows[0][-1], 'Turima patirtis')
+        self.assertEqual(rows[1][-1], None)
+        self.assertEqual(rows[5][0], 'Darbas 4')
+        self.assertFalse(os.path.exists(self.path('jobs.xlsx.partial.jsonl')))
+
+    def test_sqlite_upserts_and_queries(self):
+        path = self.path('jobs.sqlite')
+        jobs = make_jobs(5)
+        jobs[1].location = 'Kaunas'
+        jobs[4].posted_date = '2024-04-30'
+        SQLiteStorage(path, batch_size=2).save(jobs)
+
+        jobs[0].salary = '3000 €'
+        jobs[0].details = {'Darbo laikas': 'Pilnas etatas'}
+        SQLiteStorage(path).save(jobs[:1])
+
+        storage = SQLiteStorage(path)
+        self.assertEqual(storage.count(), 5)
+        found = list(storage.query(location='Vilnius', posted_since='2024-05-06', min_salary=1002))
+        self.assertEqual([job.url for job in found], ['https://uzt.lt/job0', 'https://uzt.lt/job2', 'https://uzt.lt/job3'])
+        self.assertEqual(found[0], jobs[0])
+        self.assertEqual(found[2].details, jobs[3].details)
+        self.assertEqual(len(list(storage.query(limit=2))), 2)
+
+        # Listings come back in the order they were first stored, like the other formats
+        self.assertEqual([job.url for job in load_table(path)], [job.url for job in jobs])
+        # Queries read the database the handler wrote to
+        other = SQLiteStorage(self.path('unused.sqlite'))
+        other.save(jobs[:2], self.path('other.sqlite'))
+        self.assertEqual(other.count(), 2)
+
+    @unittest.skipUnless(pyarrow, 'pyarrow is not installed')
+    def test_parquet_round_trip(self):
+        jobs = make_jobs(5)
+        jobs[2].salary = '–'
+        ParquetStorage(self.path('parquet'), batch_size=2, run_id='a').save(jobs[:3])
+        ParquetStorage(self.path('parquet'), batch_size=2, run_id='b').save(jobs[3:])
+
+        table = ParquetStorage.load(self.path('parquet'), ['location', 'salary_value', 'run'])
+        self.assertEqual(table.num_rows, 5)
+        self.assertEqual(str(table.schema.field('location').type), 'dictionary<values=string, indices=int32, ordered=0>')
+        self.assertEqual(sorted(ParquetStorage.load_jobs(self.path('parquet')), key=lambda job: job.url), jobs)
+        self.assertEqual(sorted(ParquetStorage.load_table(self.path('parquet')), key=lambda job: job.url), jobs)
+
+        expected = SalaryAnalyzer(jobs).get_statistics()
+        stats = SalaryAnalyzer.from_parquet(self.path('parquet')).get_statistics()
+        self.assertEqual((stats.mean, stats.valid_salaries_count), (expected.mean, expected.valid_salaries_count))
+        loaded = SimilarityAnalyzer.load_jobs(self.path('parquet'))
+        self.assertEqual(sorted(job.details['Darbo aprašymas'] for job in loaded), [f'Aprašymas {i}' for i in range(5)])
+
+    def test_parquet_without_pyarrow(self):
+        with mock.patch('src.scraper.storage.pa', None):
+            with self.assertRaisesRegex(ImportError, 'requirements-optional.txt'):
+                ParquetStorage(self.path('parquet'))
+
+if __name__ == '__main__':
+    unittest.main()
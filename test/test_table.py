@@ -0,0 +1,69 @@
+import json
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from src.scraper.analysis import SalaryAnalyzer
+from src.scraper.models import CompactJobListing, JobListing
+from src.scraper.similarity import SimilarityIndex
+from src.scraper.storage import JSONLStorage
+from src.scraper.table import JobTable
+
+
+def make_jobs():
+    return [
+        JobListing('Teisininkas', 'UAB Teisė', 'Vilnius', '2024-05-12', '1000-2000', 'https://uzt.lt/job0',
+                   {'Darbo aprašymas': 'Rengti sutartis', 'Turima patirtis': '2 metai'}),
+        JobListing('Vairuotojas', 'UAB Transportas', 'Kaunas', '2024-05-13', '–', 'https://uzt.lt/job1', {}),
+        JobListing('Buhalteris', 'UAB Teisė', None, '2024-05-20', '1800 €', 'https://uzt.lt/job2',
+                   {'Turima patirtis': '5 metai'}),
+    ]
+
+
+class TestJobTable(unittest.TestCase):
+    def test_round_trip_and_columns(self):
+        jobs = make_jobs()
+        compact = [CompactJobListing.from_dict(job.to_dict()) for job in jobs]
+        self.assertFalse(hasattr(compact[0], '__dict__'))
+        self.assertEqual([job.to_listing() for job in compact], jobs)
+        self.assertIs(compact[0].company, CompactJobListing.from_listing(jobs[2]).company)
+
+        table = JobTable.from_jobs(compact)
+        self.assertEqual(len(table), 3)
+        self.assertEqual(list(table), jobs)
+        self.assertEqual(list(table.iter_dicts()), [job.to_dict() for job in jobs])
+        self.assertEqual(JobTable.from_dicts(job.to_dict() for job in jobs)[-1], jobs[2])
+        self.assertEqual(table.detail_keys, ['Darbo aprašymas', 'Turima patirtis'])
+        self.assertEqual(list(table.detail_column('Turima patirtis')), ['2 metai', '', '5 metai'])
+        np.testing.assert_array_equal(table.codes['company'], [0, 1, 0])
+        self.assertEqual(list(table.column('location')), ['Vilnius', 'Kaunas', None])
+
+        # Selected rows keep their fields, with categories renumbered by first appearance
+        taken = table.take(np.array([2, 1]))
+        self.assertEqual(list(taken), [jobs[2], jobs[1]])
+        self.assertEqual(list(taken.categories['company']), ['UAB Teisė', 'UAB Transportas'])
+        np.testing.assert_array_equal(taken.codes['location'], [-1, 0])
+
+    def test_consumers_read_columns(self):
+        jobs = make_jobs()
+        table = JobTable.from_jobs(jobs)
+
+        from_table, from_list = SalaryAnalyzer(table), SalaryAnalyzer(jobs)
+        self.assertEqual(from_table.get_statistics().mean, from_list.get_statistics().mean)
+        self.assertTrue(from_table.group_by(['company', 'week']).equals(from_list.group_by(['company', 'week'])))
+
+        from_table, from_list = SimilarityIndex(None), SimilarityIndex(None)
+        from_table.add(table)
+        from_list.add(jobs)
+        self.assertEqual(from_table.documents, from_list.documents)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'jobs.jsonl')
+            JSONLStorage(path, batch_size=2).save(table)
+            with open(path, encoding='utf-8') as f:
+                self.assertEqual([JobListing.from_dict(json.loads(line)) for line in f], jobs)
+
+if __name__ == '__main__':
+    unittest.main()
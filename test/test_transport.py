@@ -0,0 +1,63 @@
+import importlib.util
+import unittest
+from unittest.mock import patch
+
+import requests
+
+from benchmarks.server import ReplayServer
+from benchmarks.synthetic import JOB_PATH, detail_page
+from src.scraper.metrics import metrics
+from src.scraper.scraper import JobScraper
+from src.scraper.transport import HTTPXAdapter, build_session, response_charset
+
+
+def make_response(body, content_type):
+    response = requests.Response()
+    response.status_code = 200
+    response.headers['Content-Type'] = content_type
+    response._content = body
+    return response
+
+
+class TestTransport(unittest.TestCase):
+    def test_pages_are_parsed_in_the_declared_charset(self):
+        self.assertEqual(response_charset(make_response(b'', 'text/html; charset="windows-1257"')), 'cp1257')
+        self.assertEqual(response_charset(make_response(b'', 'text/html')), 'utf-8')
+        self.assertEqual(response_charset(make_response(b'', 'text/html; charset=unknown')), 'utf-8')
+
+        page = detail_page(0).decode('utf-8').replace('<meta charset="utf-8">', '').replace('</p>', ' Sutarčių</p>', 1)
+        response = make_response(page.encode('cp1257'), 'text/html; charset=windows-1257')
+        scraper = JobScraper(requests_per_second=1000)
+        with patch.object(scraper.session, 'get', return_value=response):
+            details = scraper.scrape_job_details('https://uzt.lt/laisvos-darbo-vietos/436/job/0')
+        self.assertIn('kompiuteris Sutarčių;', details['Darbo aprašymas'])
+
+    def test_compressed_pages_over_pooled_connections(self):
+        scraper = JobScraper(max_concurrent_requests=16, requests_per_second=1000)
+        adapter = scraper.session.get_adapter('https://uzt.lt')
+        self.assertEqual(adapter._pool_maxsize, 17)
+        self.assertIn('gzip', scraper.session.headers['Accept-Encoding'])
+
+        metrics.reset()
+        with ReplayServer(total_jobs=1, compress=True) as server:
+            details = JobScraper(base_url=server.url).scrape_job_details(server.url + JOB_PATH.format(id=0))
+        self.assertIn('Darbo aprašymas', details)
+        self.assertLess(metrics.counter('http_wire_bytes_total'), metrics.counter('http_response_bytes_total') / 3)
+
+    @unittest.skipUnless(importlib.util.find_spec('httpx') and importlib.util.find_spec('h2'), 'httpx[http2] not installed')
+    def test_http2_session_falls_back_to_http1(self):
+        session = build_session(http2=True)
+        self.assertIsInstance(session.get_adapter('https://uzt.lt'), HTTPXAdapter)
+        with ReplayServer(total_jobs=1) as server:
+            response = session.get(server.url + JOB_PATH.format(id=0), timeout=(5, 5))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.http_version, 'HTTP/1.1')
+        self.assertIn(b'Darbo apra', response.content)
+
+    def test_http2_without_httpx(self):
+        with patch('src.scraper.transport.httpx', None):
+            with self.assertRaisesRegex(ImportError, 'requirements-optional.txt'):
+                build_session(http2=True)
+
+if __name__ == '__main__':
+    unittest.main()
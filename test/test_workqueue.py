@@ -0,0 +1,96 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+from src.scraper.scraper import JobScraper
+from src.scraper.config import MAX_REQUESTS_PER_SECOND
+from src.scraper.workqueue import DETAIL, PAGE, WorkQueue, _run_worker
+
+
+def page_response(text):
+    return MagicMock(status_code=200, text=text, content=text.encode('utf-8'))
+
+
+class TestWorkQueue(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, 'queue.sqlite')
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_leases(self):
+        queue = WorkQueue(self.path, lease_seconds=60, max_attempts=2)
+        self.assertTrue(queue.add(DETAIL, 'https://uzt.lt/job1', {'Nuoroda': 'https://uzt.lt/job1'}))
+        self.assertFalse(queue.add(DETAIL, 'https://uzt.lt/job1'))
+        queue.add(PAGE, '0')
+
+        # Pages first; a leased task is not handed to another worker
+        page = queue.claim('a')
+        self.assertEqual(page.kind, PAGE)
+        detail = queue.claim('b')
+        self.assertEqual(detail.payload, {'Nuoroda': 'https://uzt.lt/job1'})
+        self.assertIsNone(queue.claim('c'))
+        # A restarted worker takes back its own task
+        self.assertEqual(queue.claim('b').id, detail.id)
+
+        queue.fail(detail, 'timeout')
+        self.assertEqual(queue.claim('c').attempts, 1)
+        queue.fail(queue.claim('c'), 'timeout')
+        self.assertEqual(queue.counts(DETAIL), {'failed': 1})
+        queue.complete(page)
+        self.assertTrue(queue.finished())
+
+        # An expired lease is handed to another worker
+        other = WorkQueue(self.path, lease_seconds=-1)
+        other.add(PAGE, '20')
+        other.claim('a')
+        self.assertEqual(other.claim('b').key, '20')
+        other.close()
+        queue.close()
+
+    @patch('requests.Session.get')
+    def test_interrupted_crawl_resumes(self, mock_get):
+        requested = []
+
+        def fake_get(url, **kwargs):
+            requested.append(url)
+            if url.endswith('/job3') and requested.count(url) == 1:
+                raise KeyboardInterrupt
+            if '/results' in url:
+                start = int(url.rsplit('/p', 1)[1]) if '/p' in url else 0
+                links = ''.join(f'<a href="/job{i}">Job {i}</a>' for i in range(start // 10, start // 10 + 2))
+                return page_response(f'<div class="list">{links}</div>')
+            return page_response('<div class="content"><p>Aprašymas</p></div>')
+
+        mock_get.side_effect = fake_get
+        queue = WorkQueue(self.path)
+        queue.add(PAGE, '0')
+        with self.assertRaises(KeyboardInterrupt):
+            JobScraper(max_jobs=5, requests_per_second=1000).work(queue, 'worker-0')
+        done = queue.counts(DETAIL).get('done', 0)
+        self.assertGreater(done, 0)
+
+        JobScraper(max_jobs=5, requests_per_second=1000).work(WorkQueue(self.path), 'worker-0')
+
+        self.assertTrue(queue.finished())
+        self.assertEqual([job.url for job in queue.iter_jobs()], [f'https://uzt.lt/job{i}' for i in range(5)])
+        # Only the interrupted request is repeated
+        self.assertEqual(len(requested), len(set(requested)) + 1)
+        queue.close()
+
+    @patch('src.scraper.logger.shutdown_logging')
+    def test_workers_share_the_rate_bounds(self, mock_shutdown):
+        with JobScraper(requests_per_second=1, rate_share=0.25) as scraper:
+            self.assertEqual(scraper.rate_limiter.rate, 0.25)
+            self.assertLessEqual(getattr(scraper.rate_limiter, 'max_rate', 0.25), MAX_REQUESTS_PER_SECOND * 0.25)
+
+        # The worker's run report goes to the output directory it is given
+        WorkQueue(self.path).close()
+        _run_worker(self.path, 'worker-0', 5, 1, 0.5, self.tmpdir.name)
+        self.assertTrue(os.path.exists(os.path.join(self.tmpdir.name, 'run_report.worker-0.json')))
+
+
+if __name__ == '__main__':
+    unittest.main()